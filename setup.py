@@ -3,6 +3,10 @@ from setuptools import find_packages, setup
 setup(
     name='src',
     packages=find_packages(),
+    #----Template dos relatórios em HTML (geraRelatorios); MANIFEST.in leva o
+    #    mesmo arquivo ao sdist
+    package_data={'src.pylattesLXML': ['templates/*.html']},
+    include_package_data=True,
     version='0.1.0',
     description='Parsing the curriculos lattes em formato XML para gestão de conhecimento.',
     author='Luciano Barosi/CP/PRPG/UFCG',
@@ -24,4 +28,16 @@ setup(
     'Funding': 'http://prpg.ufcg.edu.br',
     },
     python_requires='>=3.6',
+    install_requires=[
+        'lxml',
+        'numpy',
+        'pandas',
+        'python-stdnum',
+        'Unidecode',
+        'openpyxl',
+        'requests',
+    ],
+    extras_require={
+        'relatorios': ['jinja2'],
+    },
 )
@@ -3,9 +3,18 @@
 Este módulo fornece funcionalidades para ler um conjunto de arquivos de currículos Lattes em XML e efetuar o parsing de informações, produzindo relatórios individuais por pesquisador e produzindo relatórios consoldados baseados em filtros custom-made
 
 Exemplo:
-    Funcionamento como módulo e exemplo podem ser encontrados nos Jupyter Notebboks disponíveis. Para o uso do modulo standalone utilize::
+    Funcionamento como módulo e exemplo podem ser encontrados nos Jupyter
+    Notebboks disponíveis. Para pontuar uma pasta de currículos pela linha de
+    comando utilize::
 
-        $ python -m pylattesLXML.py
+        $ python -m pylattesLXML ../../data/raw/CVs --periodo 2016-2020 \\
+              --workers 4 --formato xlsx
+
+    Com --relatorios também são gerados os relatórios individuais em HTML, sem
+    papermill (ver geraRelatorios)::
+
+        $ python -m pylattesLXML ../../data/raw/CVs --periodo 2016-2020 \\
+              --relatorios
 
 Esta documentação ainda tem que incluir a descrição das funções, variáveis e classes
 
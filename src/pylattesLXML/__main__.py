@@ -0,0 +1,5 @@
+import sys
+
+from .pylattesLXML import main
+
+sys.exit(main())
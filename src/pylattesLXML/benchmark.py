@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# UNIVERSIDADE FEDERAL DE CAMPINA GRANDE
+# PRÓ-REITORIA DE PÓS-GRADUAÇÃO
+# COORDENAÇÃO GERAL DE PESQUISA
+# PYLATTES - Medidas de desempenho com currículos sintéticos.
+# Cada etapa roda em um processo novo. A memória informada é o pico da etapa
+# acima da memória do processo antes dela, descontados a importação e o
+# preparo.
+# Uso, da pasta do módulo e com a raiz do repositório no PYTHONPATH:
+#     $ PYTHONPATH=../.. python -m src.pylattesLXML.benchmark --tamanhos 10 100
+#     --saida ../../reports/benchmark.csv
+# ---------------------------------------------------------------------------
+#----------------------------------------------------------------------------
+# INICIALIZAÇÃO
+#----------------------------------------------------------------------------
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from . import pylattesLXML as pl
+from .sinteticos import geraCorpus, TAMANHO
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+
+#----------------------------------------------------------------------------
+#----Etapas
+#----------------------------------------------------------------------------
+GETTERS = ['getProducaoBibliografica', 'getProducaoTecnica',
+           'getApresentacoes', 'getProducaoOutra', 'getDadosComplementares']
+ETAPAS = ['makeDBnomes', 'getDadosBasicos',
+          'getSecoes'] + GETTERS + ['dfTidy', 'doSumarioUFCG']
+
+def _pesquisadores(files, periodo, kwargs, secoes=False):
+    pesquisadores = []
+    for file in files:
+        pesquisador = pl.Pesquisador(file=file, periodo=periodo, **kwargs)
+        pesquisador.getDadosBasicos()
+        if secoes:
+            pesquisador.getSecoes()
+        pesquisadores.append(pesquisador)
+    return pesquisadores
+
+def _brutos(pesquisadores):
+    #----Dataframes de cada seção antes de dfTidy, como os getters os montam
+    brutos = []
+    for pesquisador in pesquisadores:
+        secoes = pesquisador.getSecoes()
+        for tag in pl.SECOES_PRODUCAO:
+            dados, detalhe = secoes[tag]
+            brutos.append((tag,
+                           pd.concat([dados.dataframe(), detalhe.dataframe()],
+                                     ignore_index=True)))
+        brutos.append(('FORMACAO-ACADEMICA-TITULACAO',
+                       secoes['FORMACAO-ACADEMICA-TITULACAO'].dataframe()))
+    return [(tag, df) for tag, df in brutos if not df.empty]
+
+def _statusMB(chave):
+    #----VmRSS e VmHWM de /proc/self/status, em kB; None fora do Linux
+    try:
+        with open('/proc/self/status') as status:
+            for linha in status:
+                if linha.startswith(chave + ':'):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def _ruMaxrssMB():
+    if resource is None:
+        return None
+    #----ru_maxrss em KB no Linux e em bytes no macOS
+    unidade = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unidade
+
+def marcaMemoria():
+    """Marca o início da parte medida de uma etapa. No Linux o pico do processo
+    (VmHWM) é zerado e a referência é a memória residente atual; nos demais
+    sistemas a referência é o pico até agora (ru_maxrss).
+
+    Returns:
+        type: Tupla (referência em MB ou None, True se o pico foi zerado).
+
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear:
+            clear.write('5')
+    except OSError:
+        return _ruMaxrssMB(), False
+    return _statusMB('VmRSS'), True
+
+def memoriaEtapa(marca):
+    """Quanto a memória residente subiu, no pico, desde marcaMemoria. Sem zerar
+    o pico só aparece o que passar do pico anterior, que inclui a importação
+    dos módulos.
+
+    Args:
+        marca (type): Retorno de marcaMemoria `marca`.
+
+    Returns:
+        type: MB ou None.
+
+    """
+    referencia, zerado = marca
+    pico = _statusMB('VmHWM') if zerado else _ruMaxrssMB()
+    if referencia is None or pico is None:
+        return None
+    return max(pico - referencia, 0.0)
+
+def executaEtapa(etapa, PATH, files, periodo, kwargs):
+    """Prepara e cronometra uma etapa. O preparo (por exemplo getDadosBasicos
+    antes dos getters) fica fora do tempo e da memória.
+
+    Args:
+        etapa (type): Nome em ETAPAS `etapa`.
+        PATH (type): Pasta do corpus `PATH`.
+        files (type): Currículos `files`.
+        periodo (type): Período `periodo`.
+        kwargs (type): kwargs do Pesquisador `kwargs`.
+
+    Returns:
+        type: Tupla (segundos, memória da etapa em MB ou None, memória antes da
+            etapa em MB ou None), ver marcaMemoria e memoriaEtapa. A memória
+            antes inclui a importação e o preparo.
+
+    """
+    if etapa in GETTERS:
+        pesquisadores = _pesquisadores(files, periodo, kwargs, secoes=True)
+        marca = marcaMemoria()
+        inicio = time.perf_counter()
+        for pesquisador in pesquisadores:
+            getattr(pesquisador, etapa)()
+    elif etapa == 'getSecoes':
+        pesquisadores = _pesquisadores(files, periodo, kwargs)
+        marca = marcaMemoria()
+        inicio = time.perf_counter()
+        for pesquisador in pesquisadores:
+            pesquisador.getSecoes()
+    elif etapa == 'dfTidy':
+        pesquisadores = _pesquisadores(files, periodo, kwargs)
+        brutos = _brutos(pesquisadores)
+        marca = marcaMemoria()
+        inicio = time.perf_counter()
+        for tag, df in brutos:
+            pesquisadores[0].dfTidy(df, **pl.ESQUEMAS[tag])
+    elif etapa == 'getDadosBasicos':
+        marca = marcaMemoria()
+        inicio = time.perf_counter()
+        _pesquisadores(files, periodo, kwargs)
+    elif etapa == 'doSumarioUFCG':
+        marca = marcaMemoria()
+        inicio = time.perf_counter()
+        for file in files:
+            pl.Pesquisador(file=file, periodo=periodo,
+                           **kwargs).doSumarioUFCG()
+    elif etapa == 'makeDBnomes':
+        marca = marcaMemoria()
+        inicio = time.perf_counter()
+        pl.makeDBnomes(PATH)
+    else:
+        raise ValueError("Etapa desconhecida: {}".format(etapa))
+    segundos = time.perf_counter() - inicio
+    return segundos, memoriaEtapa(marca), marca[0]
+
+def benchmark(tamanhos=(10, 50), etapas=ETAPAS, periodo=None, PATH=None,
+              repeticoes=1, **kwargs):
+    """Gera um corpus sintético para cada tamanho e mede cada etapa em um
+    processo novo.
+
+    Args:
+        tamanhos (type): Números de currículos `tamanhos`. Defaults to (10,
+            50).
+        etapas (type): Etapas medidas, ver ETAPAS `etapas`. Defaults to ETAPAS.
+        periodo (type): Período; None usa os últimos cinco anos dos currículos
+            sintéticos `periodo`. Defaults to None.
+        PATH (type): Pasta para os corpora; None usa uma pasta temporária
+            removida no final `PATH`. Defaults to None.
+        repeticoes (type): Repetições de cada etapa; vale a mais rápida
+            `repeticoes`. Defaults to 1.
+        **kwargs (type): Tamanhos de geraCV (ver TAMANHO) e kwargs do
+            Pesquisador, por exemplo motor `**kwargs`.
+
+    Returns:
+        type: Dataframe TAMANHO, ETAPA, SEGUNDOS, CVS_POR_SEGUNDO, MEMORIA_MB,
+            BASE_MB. MEMORIA_MB é o pico de memória da etapa acima de BASE_MB,
+            a memória do processo antes dela, ver executaEtapa.
+
+    """
+    tamanho = {chave: kwargs.pop(chave)
+               for chave in list(kwargs) if chave in TAMANHO}
+    periodo = periodo or [str(ano) for ano in range(2016, 2021)]
+    temporaria = tempfile.TemporaryDirectory() if PATH is None else None
+    PATH = temporaria.name if temporaria is not None else PATH
+    #----Processos novos para cada etapa: a memória não herda a das etapas
+    #    anteriores
+    contexto = multiprocessing.get_context('spawn')
+    linhas = []
+    try:
+        for n in tamanhos:
+            pasta = os.path.join(PATH, 'corpus{}'.format(n))
+            files = geraCorpus(pasta, n, **tamanho)
+            kw = {'pathPontos': os.path.join(AQUI, '..', 'data',
+                                             'pontuacao.xlsx'),
+                  'pathUFCG': os.path.join(pasta, 'SERVIDORES_UFCG.xlsx'),
+                  'pathSAAP': os.path.join(pasta, 'SAAP_UFCG.xlsx'),
+                  **kwargs}
+            for etapa in etapas:
+                medidas = []
+                for _ in range(repeticoes):
+                    with contexto.Pool(1) as pool:
+                        medidas.append(pool.apply(executaEtapa,
+                                                  (etapa, pasta, files,
+                                                   periodo, kw)))
+                segundos = min(medida[0] for medida in medidas)
+                memoria = max((medida[1] for medida in medidas
+                               if medida[1] is not None), default=None)
+                base = max((medida[2] for medida in medidas
+                            if medida[2] is not None), default=None)
+                linhas.append([n, etapa, segundos,
+                               n / segundos if segundos > 0 else float('inf'),
+                               memoria, base])
+                mb = lambda valor: '-' if valor is None else '%.1f' % valor
+                print('{:>6} {:<26} {:9.3f} s {:10.1f} CVs/s {:>10} MB '
+                      '{:>10} MB base'.format(n, etapa, segundos,
+                                              linhas[-1][3], mb(memoria),
+                                              mb(base)), flush=True)
+    finally:
+        if temporaria is not None:
+            temporaria.cleanup()
+    return pd.DataFrame(linhas,
+                        columns=['TAMANHO', 'ETAPA', 'SEGUNDOS',
+                                 'CVS_POR_SEGUNDO', 'MEMORIA_MB', 'BASE_MB'])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Mede o desempenho do pylattesLXML com currículos '
+                    'sintéticos.')
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[10, 50],
+                        help='números de currículos por corpus')
+    parser.add_argument('--etapas', nargs='+', default=ETAPAS, choices=ETAPAS)
+    parser.add_argument('--repeticoes', type=int, default=1)
+    parser.add_argument('--motor', default=None, choices=['eventos'],
+                        help="motor de extração do Pesquisador")
+    parser.add_argument('--PATH', default=None,
+                        help='pasta para os corpora; padrão é uma pasta '
+                             'temporária')
+    parser.add_argument('--saida', default=None, help='CSV com os resultados')
+    for chave, valor in TAMANHO.items():
+        parser.add_argument('--' + chave, type=int, default=valor)
+    args = vars(parser.parse_args(argv))
+    saida = args.pop('saida')
+    if args['motor'] is None:
+        args.pop('motor')
+    df = benchmark(**args)
+    if saida:
+        os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+        df.to_csv(saida, index=False)
+    return df
+
+if __name__ == "__main__":
+    main()
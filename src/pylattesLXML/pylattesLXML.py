@@ -28,16 +28,41 @@
 import os
 import sys
 import traceback
-from sys import exit
 from glob import glob
+from fnmatch import fnmatch
 #----Utilidades
-from itertools import compress
 from itertools import repeat
 from datetime import datetime as dt
 from os.path import join
 from os import access, R_OK
-from os.path import isfile
-from collections import OrderedDict
+from os.path import isfile, isdir
+from collections import Counter, OrderedDict, namedtuple
+from functools import wraps, lru_cache
+from difflib import SequenceMatcher
+#----Cache em disco
+import json
+import base64
+import getpass
+import platform
+import argparse
+import shutil
+import hashlib
+import pickle
+import warnings
+#----Currículos compactados
+import gzip
+import zipfile
+#----Processamento paralelo
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+#----Resolução de DOI
+import asyncio
+import random
+import threading
+import sqlite3
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
 #----Pacotes básicos
 import numpy as np
 import pandas as pd
@@ -51,6 +76,30 @@ from stdnum import isbn
 from stdnum import issn
 #----Normalizar strings para comparação sem acentos
 from unidecode import unidecode
+#----Parquet é opcional, sem pyarrow o cache e o acervo usam pickle
+try:
+    import pyarrow
+    import pyarrow.dataset
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+#----requests é usado na resolução de DOI, com urllib como alternativa
+try:
+    import requests
+    import requests.adapters
+except ImportError:
+    requests = None
+#----zstandard é opcional, só para .xml.zst
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+#----Jinja2 é opcional, só para os relatórios individuais em HTML
+try:
+    import jinja2
+    import markupsafe
+except ImportError:
+    jinja2 = None
 #from crossref.restful import Works
 #from crossref.restful import CrossrefAPIError
 #----------------------------------------------------------------------------
@@ -90,98 +139,2849 @@ def pathHandler(PATH=""):
 #----------------------------------------------------------------------------
 
 #----------------------------------------------------------------------------
-def readFolder(PATH="../../data/raw/CVs"):
-    """Le todos os arquivos XML que estiverem no caminho indicado e em subpastas.
+#----Instrumentação: tempos por etapa, desligada por padrão
+#----------------------------------------------------------------------------
+class _Medida:
+    """Contexto devolvido por Cronometro.etapa. Desligado, é um único objeto
+    que não faz nada."""
+    __slots__ = ('cronometro', 'nome', 'inicio', 'registros')
+
+    def __init__(self, cronometro=None, nome=None):
+        self.cronometro = cronometro
+        self.nome = nome
+        self.registros = None
+
+    def __enter__(self):
+        if self.cronometro is not None:
+            self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *erro):
+        if self.cronometro is not None:
+            self.cronometro.registra(self.nome,
+                                     time.perf_counter() - self.inicio,
+                                     self.registros)
+        return False
+
+_MEDIDA_NULA = _Medida()
+
+def contaRegistros(resultado):
+    """Número de registros de um resultado de etapa: linhas de dataframe ou
+    itens de lista. Listas de dataframes, como a de doSumarioUFCG, não têm
+    contagem.
+
+    Args:
+        resultado (type): Valor devolvido pela etapa `resultado`.
+
+    Returns:
+        type: int ou None.
+
+    """
+    if isinstance(resultado, (pd.DataFrame, pd.Series)):
+        return len(resultado)
+    if isinstance(resultado,
+                  (list, tuple)) and not any(isinstance(item, pd.DataFrame)
+                                             for item in resultado):
+        return len(resultado)
+    return None
+
+class Cronometro:
+    """Acumula duração e número de registros de cada etapa (parsing, getters,
+    dfTidy, planilhas, pontuação) ao longo de um lote. Desligado, cada etapa
+    custa apenas o teste de `ativo`. Liga com ativa() ou com a variável de
+    ambiente PYLATTES_CRONOMETRO, que também vale para os processos do pool.
+
+    Args:
+        ativo (type): Começa ligado `ativo`. Defaults to False.
+
+    Attributes:
+        amostras (type): Dicionário etapa -> ([durações], [registros])
+            `amostras`.
+
+    """
+    def __init__(self, ativo=False):
+        self.ativo = ativo
+        self.amostras = {}
+
+    def ativa(self):
+        self.ativo = True
+        return self
+
+    def desativa(self):
+        self.ativo = False
+        return self
+
+    def limpa(self):
+        self.amostras = {}
+        return self
+
+    def etapa(self, nome):
+        """Contexto que mede um trecho. O número de registros pode ser
+        informado em `medida.registros` dentro do bloco.
+
+        Args:
+            nome (type): Nome da etapa `nome`.
+
+        Returns:
+            type: Contexto _Medida.
+
+        """
+        if not self.ativo:
+            return _MEDIDA_NULA
+        return _Medida(self, nome)
+
+    def registra(self, nome, duracao, registros=None):
+        duracoes, contagens = self.amostras.setdefault(nome, ([], []))
+        duracoes.append(duracao)
+        contagens.append(registros)
+
+    def extrai(self):
+        """Devolve as amostras e começa de novo; usado para trazer as medidas
+        dos processos do pool.
+
+        Returns:
+            type: Dicionário de amostras.
+
+        """
+        amostras, self.amostras = self.amostras, {}
+        return amostras
+
+    def junta(self, amostras):
+        """Acrescenta amostras de outro Cronometro, por exemplo de extrai() em
+        um processo do pool.
+
+        Args:
+            amostras (type): Dicionário de amostras `amostras`.
+
+        Returns:
+            type: self.
+
+        """
+        for nome, (duracoes, contagens) in (amostras or {}).items():
+            destino = self.amostras.setdefault(nome, ([], []))
+            destino[0].extend(duracoes)
+            destino[1].extend(contagens)
+        return self
+
+    def tabela(self):
+        """Resumo por etapa, da mais demorada para a mais rápida. Os tempos
+        incluem as etapas internas: um getter inclui o seu dfTidy.
+
+        Returns:
+            type: Dataframe ETAPA, N, TOTAL, MEDIA, P95, MAX (segundos) e
+                REGISTROS.
+
+        """
+        linhas = []
+        for nome, (duracoes, contagens) in self.amostras.items():
+            duracoes = np.asarray(duracoes)
+            contagens = [contagem
+                         for contagem in contagens if contagem is not None]
+            linhas.append([nome, len(duracoes), duracoes.sum(),
+                           duracoes.mean(), np.percentile(duracoes, 95),
+                           duracoes.max(),
+                           sum(contagens) if contagens else np.nan])
+        df = pd.DataFrame(linhas,
+                          columns=['ETAPA', 'N', 'TOTAL', 'MEDIA', 'P95',
+                                   'MAX', 'REGISTROS'])
+        return df.sort_values('TOTAL', ascending=False, ignore_index=True)
+
+    def json(self, PATH=None):
+        """Resumo de tabela() em JSON.
+
+        Args:
+            PATH (type): Arquivo de saída; None devolve o texto `PATH`.
+                Defaults to None.
+
+        Returns:
+            type: Texto JSON ou None.
+
+        """
+        return self.tabela().to_json(pathHandler(PATH) if PATH else None,
+                                     orient='records', force_ascii=False)
+
+CRONOMETRO = Cronometro(ativo=bool(os.environ.get('PYLATTES_CRONOMETRO')))
+
+def cronometrado(nome=None):
+    """Decorador que mede cada chamada no CRONOMETRO do módulo. Desligado,
+    chama a função diretamente.
+
+    Args:
+        nome (type): Nome da etapa; None usa o nome da função `nome`. Defaults
+            to None.
+
+    Returns:
+        type: Decorador.
+
+    """
+    def decorador(funcao):
+        etapa = nome or funcao.__name__
+        @wraps(funcao)
+        def medida(*args, **kwargs):
+            if not CRONOMETRO.ativo:
+                return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            resultado = None
+            try:
+                resultado = funcao(*args, **kwargs)
+                return resultado
+            finally:
+                CRONOMETRO.registra(etapa, time.perf_counter() - inicio,
+                                    contaRegistros(resultado))
+        return medida
+    return decorador
+
+#----------------------------------------------------------------------------
+#----Membro de um arquivo .zip: "pasta/arquivo.zip::membro.xml"
+SEPARADOR_ZIP = '::'
+#----Número de arquivos .zip mantidos abertos por processo
+MAX_ZIPS = 16
+_ZIPS = OrderedDict()
+
+def _abreZip(arquivo):
+    """ZipFile aberto do arquivo, reaproveitado entre leituras para não reler o
+    diretório central a cada membro. A chave inclui o pid, então processos
+    filhos não compartilham o descritor do pai.
+
+    Args:
+        arquivo (type): Caminho do .zip `arquivo`.
+
+    Returns:
+        type: zipfile.ZipFile.
+
+    """
+    chave = (arquivo, os.getpid(), os.stat(arquivo).st_mtime_ns)
+    zf = _ZIPS.pop(chave, None)
+    if zf is None:
+        zf = zipfile.ZipFile(arquivo)
+        while len(_ZIPS) >= MAX_ZIPS:
+            antigo = _ZIPS.popitem(last=False)[1]
+            antigo.close()
+    _ZIPS[chave] = zf
+    return zf
+
+def abreXML(file):
+    """Abre um currículo para leitura binária sem extrair para o disco: XML
+    simples, .xml.gz, .xml.zst ou membro de .zip na forma
+    "arquivo.zip::membro.xml".
+
+    Args:
+        file (type): Caminho do XML `file`.
+
+    Returns:
+        type: Objeto arquivo binário.
+
+    """
+    if SEPARADOR_ZIP in file:
+        arquivo, membro = file.split(SEPARADOR_ZIP, 1)
+        return _abreZip(arquivo).open(membro)
+    if file.endswith('.gz'):
+        return gzip.open(file, 'rb')
+    if file.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError(
+                "zstandard é necessário para ler {}".format(file))
+        return zstandard.ZstdDecompressor().stream_reader(open(file, 'rb'),
+                                                          closefd=True)
+    return open(file, 'rb')
+
+def compactado(file):
+    """Indica se o currículo precisa ser lido por abreXML.
+
+    Args:
+        file (type): Caminho do XML `file`.
+
+    Returns:
+        type: bool.
+
+    """
+    return SEPARADOR_ZIP in file or file.endswith(('.gz', '.zst'))
+
+def parseXML(file):
+    """etree.parse para qualquer forma aceita por abreXML. XML simples continua
+    sendo lido diretamente pelo libxml2.
+
+    Args:
+        file (type): Caminho do XML `file`.
+
+    Returns:
+        type: ElementTree.
+
+    """
+    if not compactado(file):
+        return etree.parse(file)
+    with abreXML(file) as arquivo:
+        return etree.parse(arquivo)
+
+def assinaturaXML(file):
+    """Tamanho e mtime usados para saber se um currículo mudou. Membros de .zip
+    usam os do arquivo .zip.
+
+    Args:
+        file (type): Caminho do XML `file`.
+
+    Returns:
+        type: Tupla (tamanho, mtime em ns).
+
+    """
+    stat = os.stat(file.split(SEPARADOR_ZIP, 1)[0])
+    return stat.st_size, stat.st_mtime_ns
+
+def caminhoLogico(file):
+    """Caminho que o currículo teria descompactado, usado para tirar EDITAL,
+    CPF e projeto do nome. Um .zip funciona como pasta; o curriculo.xml único
+    dos downloads do CNPq fica com o nome do .zip.
+
+    Args:
+        file (type): Caminho do XML `file`.
+
+    Returns:
+        type: str.
+
+    """
+    if SEPARADOR_ZIP in file:
+        arquivo, membro = file.split(SEPARADOR_ZIP, 1)
+        raiz = arquivo[:-4] if arquivo.lower().endswith('.zip') else arquivo
+        if os.path.basename(membro).lower() == 'curriculo.xml':
+            return raiz + '.xml'
+        return raiz + '/' + membro
+    for extensao in ('.gz', '.zst'):
+        if file.endswith(extensao):
+            return file[:-len(extensao)]
+    return file
+
+#----Padrões de iteraArquivos
+INCLUI_CVS = ('*.xml', '*.xml.gz', '*.xml.zst', '*.zip')
+EXCLUI_CVS = ('.*', '__MACOSX')
+
+ArquivoCV = namedtuple('ArquivoCV', ['file', 'tamanho', 'mtime'])
+
+def _entradasCV(path, nome, stat, excluir):
+    #----Um arquivo aceito por iteraArquivos; .zip gera um ArquivoCV por XML
+    #    interno
+    if not nome.lower().endswith('.zip'):
+        yield ArquivoCV(path, stat.st_size, stat.st_mtime_ns)
+        return
+    try:
+        membros = _abreZip(path).namelist()
+    except zipfile.BadZipFile:
+        #LOG.error("zip inválido: %s", path)
+        return
+    for membro in membros:
+        if (membro.lower().endswith('.xml')
+            and not any(fnmatch(os.path.basename(membro), padrao)
+                        for padrao in excluir)):
+            yield ArquivoCV(path + SEPARADOR_ZIP + membro,
+                            stat.st_size, stat.st_mtime_ns)
+
+def iteraArquivos(PATH="../../data/raw/CVs", incluir=INCLUI_CVS,
+                  excluir=EXCLUI_CVS, recursivo=True):
+    """Gerador que percorre a pasta e as subpastas com os.scandir, sem montar a
+    lista inteira. Os XML dentro de .zip saem como "arquivo.zip::membro.xml".
+    PATH pode ser um padrão glob, como "CVs/EDITAL*": as pastas encontradas são
+    percorridas e os arquivos encontrados entram se forem aceitos por
+    `incluir`.
+
+    Args:
+        PATH (type): Pasta inicial ou padrão glob `PATH`. Defaults to
+            "../../data/raw/CVs".
+        incluir (type): Padrões fnmatch dos nomes de arquivo aceitos `incluir`.
+            Defaults to INCLUI_CVS.
+        excluir (type): Padrões fnmatch de arquivos e pastas ignorados
+            `excluir`. Defaults to EXCLUI_CVS.
+        recursivo (type): Entra nas subpastas `recursivo`. Defaults to True.
+
+    Returns:
+        type: Gera ArquivoCV (file, tamanho, mtime em ns). Membros de .zip têm
+            o tamanho e mtime do .zip.
+
+    """
+    path = pathHandler(PATH)
+    if any(char in path for char in '*?['):
+        encontrados = sorted(glob(path))
+    else:
+        encontrados = [path]
+    #----Arquivos do padrão primeiro, depois as pastas, como dentro de cada
+    #    pasta
+    for encontrado in encontrados:
+        nome = os.path.basename(encontrado)
+        if (isfile(encontrado)
+            and any(fnmatch(nome, padrao) for padrao in incluir)
+            and not any(fnmatch(nome, padrao) for padrao in excluir)):
+            yield from _entradasCV(encontrado, nome, os.stat(encontrado),
+                                   excluir)
+    pilha = [pasta for pasta in reversed(encontrados) if isdir(pasta)]
+    while pilha:
+        pasta = pilha.pop()
+        try:
+            with os.scandir(pasta) as entradas:
+                entradas = sorted(entradas, key=lambda entrada: entrada.name)
+        except OSError as error:
+            #LOG.error("iteraArquivos: %s", error)
+            continue
+        subpastas = []
+        for entrada in entradas:
+            nome = entrada.name
+            if any(fnmatch(nome, padrao) for padrao in excluir):
+                continue
+            if entrada.is_dir():
+                if recursivo:
+                    subpastas.append(entrada.path)
+                continue
+            if not any(fnmatch(nome, padrao) for padrao in incluir):
+                continue
+            yield from _entradasCV(entrada.path, nome, entrada.stat(), excluir)
+        #----Subpastas em ordem alfabética, depois dos arquivos da pasta
+        pilha.extend(reversed(subpastas))
+
+def readFolder(PATH="../../data/raw/CVs", incluir=INCLUI_CVS,
+               excluir=EXCLUI_CVS):
+    """Le todos os arquivos XML que estiverem no caminho indicado e em
+    subpastas. PATH pode ser um padrão glob, ver iteraArquivos. Inclui .xml.gz,
+    .xml.zst e os XML dentro de arquivos .zip, como "arquivo.zip::membro.xml".
+
+    Args:
+        PATH (type): Caminho para arquivos XML de Curriculos Lattes `PATH`. Defaults to "../../data/raw/CVs".
+        incluir (type): Padrões fnmatch dos nomes de arquivo aceitos `incluir`.
+            Defaults to INCLUI_CVS.
+        excluir (type): Padrões fnmatch de arquivos e pastas ignorados
+            `excluir`. Defaults to EXCLUI_CVS.
+
+    Returns:
+        type: Lista com o nome dos arquivos em path absoluto.
+
+    """
+    files = [arquivo.file for arquivo in iteraArquivos(PATH, incluir, excluir)]
+    n = len(files)
+    #LOG.info("readFolder: %s Arquivos XML lidos", n)
+    return files
+
+def leCabecalho(file):
+    """Lê apenas o início do XML, até a abertura de DADOS-GERAIS, sem construir
+    a árvore do currículo inteiro. Os atributos estão disponíveis já no evento
+    de abertura dos elementos.
+
+    Args:
+        file (type): Caminho do XML `file`.
+
+    Returns:
+        type: Tupla (atributos da raiz, atributos de DADOS-GERAIS ou None).
+
+    """
+    raiz = None
+    gerais = None
+    with abreXML(file) as arquivo:
+        for evento, elemento in etree.iterparse(arquivo, events=('start',)):
+            if raiz is None:
+                raiz = dict(elemento.attrib)
+            elif elemento.tag == 'DADOS-GERAIS':
+                gerais = dict(elemento.attrib)
+                break
+    return raiz, gerais
+
+def _leNome(file, cabecalho=False):
+    """Extrai ID, CPF e NOME de um XML para makeDBnomes.
+
+    Args:
+        file (type): Caminho do XML `file`.
+        cabecalho (type): Lê apenas o cabeçalho com leCabecalho `cabecalho`.
+            Defaults to False.
+
+    Returns:
+        type: Tupla (linha ou None, problema ou None), ambas na forma [FILE,
+            ID, CPF, NOME].
+
+    """
+    NOME = []
+    CPF = []
+    ID = []
+    try:
+        #----XML funciona?
+        if cabecalho:
+            atributos, gerais = leCabecalho(file)
+        else:
+            root = parseXML(file).getroot()
+            atributos = root.attrib
+            gerais = root.find('DADOS-GERAIS')
+            gerais = gerais.attrib if gerais is not None else None
+    except etree.XMLSyntaxError:
+        #LOG.error("XML inválido: %s", file)
+        return None, [file, ID, CPF, NOME]
+    except (ParserError, ParseError) as error:
+        #LOG.error("XML inválido: %s", file)
+        return None, [file, ID, CPF, NOME]
+    except (OSError, KeyError, zipfile.BadZipFile, EOFError) as error:
+        #LOG.error("Arquivo compactado inválido: %s", file)
+        return None, [file, ID, CPF, NOME]
+    problema = None
+    try:
+        CPF = gerais['CPF']
+    except (KeyError, TypeError) as error:
+        CPF = np.nan
+    try:
+        NOME = gerais['NOME-COMPLETO']
+    except (KeyError, TypeError) as error:
+        NOME = np.nan
+    try:
+        ID = atributos['NUMERO-IDENTIFICADOR']
+    except (KeyError, AttributeError) as error:
+        #LOG.error("XML inválido: %s", file)
+        problema = [file, ID, CPF, NOME]
+        ID = np.nan
+    return [file, ID, CPF, NOME], problema
+
+def atualizaManifestoNomes(files, manifesto, cabecalho=False):
+    """Atualiza o manifesto de makeDBnomes (FILE, TAMANHO, MTIME, ESTADO, ID,
+    CPF, NOME): relê apenas arquivos novos ou com tamanho/mtime diferentes e
+    descarta os que não existem mais. É o único manifesto de arquivos do
+    pacote; etapas seguintes podem usar TAMANHO e MTIME para pular arquivos
+    iguais.
+
+    Args:
+        files (type): XML atuais, caminhos ou ArquivoCV de iteraArquivos, que
+            já trazem tamanho e mtime sem outro stat `files`.
+        manifesto (type): Dataframe do manifesto anterior, pode ser vazio
+            `manifesto`.
+        cabecalho (type): Lê apenas o cabeçalho com leCabecalho `cabecalho`.
+            Defaults to False.
+
+    Returns:
+        type: Tupla (manifesto atualizado, número de arquivos relidos).
+
+    """
+    anteriores = {}
+    if not manifesto.empty:
+        anteriores = {linha['FILE']: linha
+                      for linha in manifesto.to_dict('records')}
+    linhas = []
+    relidos = 0
+    for arquivo in files:
+        if isinstance(arquivo, ArquivoCV):
+            file, tamanho, mtime = arquivo
+        else:
+            file = arquivo
+            tamanho, mtime = assinaturaXML(file)
+        anterior = anteriores.get(file)
+        if anterior is not None and (anterior['TAMANHO'],
+                                     anterior['MTIME']) == (tamanho, mtime):
+            linhas.append(anterior)
+            continue
+        relidos += 1
+        nome, problema = _leNome(file, cabecalho)
+        if nome is None:
+            ESTADO, ID, CPF, NOME = 'INVALIDO', np.nan, np.nan, np.nan
+        else:
+            ESTADO = 'OK' if problema is None else 'SEM-ID'
+            ID, CPF, NOME = nome[1:]
+        linhas.append({'FILE': file, 'TAMANHO': tamanho, 'MTIME': mtime,
+                       'ESTADO': ESTADO, 'ID': ID, 'CPF': CPF, 'NOME': NOME})
+    colunas = ['FILE', 'TAMANHO', 'MTIME', 'ESTADO', 'ID', 'CPF', 'NOME']
+    return pd.DataFrame(linhas, columns=colunas), relidos
+
+def manifestoNomes(PATH):
+    """Caminho padrão do manifesto de makeDBnomes para PATH: um manifesto por
+    pasta ou padrão glob, para uma execução incremental em outra pasta não
+    reaproveitar entradas.
+
+    Args:
+        PATH (type): Caminho (pode usar glob) `PATH`.
+
+    Returns:
+        type: Caminho do manifesto CSV em data/external.
+
+    """
+    origem = hashlib.sha1(pathHandler(PATH).encode()).hexdigest()[:12]
+    return '../../data/external/DBnomes_manifesto_{}.csv'.format(origem)
+
+def makeDBnomes(PATH, save_to_disk=False, cabecalho=False, incremental=False,
+                manifesto=None):
+    """Lê todos os XML indicados no caminho e extrai informações mínimas. Nome do Arquivo, CPF, ID_CNself e NOME. Se arquivo não tiver informações corretas, produz outro dataframe.
+
+    Args:
+        PATH (type): caminho (pode usar glob) `PATH`.
+        save_to_disk (type): Grava ou não o resultado na pasta /data/external/ `save_to_disk`. Defaults to False.
+        cabecalho (type): Lê apenas o cabeçalho de cada XML com leCabecalho,
+            muito mais rápido. Não verifica se o restante do arquivo é XML
+            válido `cabecalho`. Defaults to False.
+        incremental (type): Usa o manifesto de arquivos já vistos (caminho,
+            tamanho, mtime, ID) e relê apenas os arquivos novos ou alterados
+            `incremental`. Defaults to False.
+        manifesto (type): Caminho do manifesto CSV usado no modo incremental;
+            None usa manifestoNomes(PATH). O manifesto guarda PATH e é
+            descartado se foi gerado para outro caminho `manifesto`. Defaults
+            to None.
+
+    Returns:
+        type:Um dataframe com sucessos e um dataframe com fracassos.
+
+    """
+    nomes = []
+    problemas = []
+
+    if incremental:
+        if manifesto is None:
+            manifesto = manifestoNomes(PATH)
+        pathManifesto = pathHandler(manifesto)
+        origem = pathHandler(PATH)
+        try:
+            dfManifesto = pd.read_csv(pathManifesto,
+                                      dtype={'ID': str, 'CPF': str,
+                                             'NOME': str, 'ORIGEM': str})
+        except (OSError, pd.errors.EmptyDataError) as error:
+            dfManifesto = pd.DataFrame()
+        #----Manifesto de outro caminho, ou anterior à coluna ORIGEM: lê tudo
+        #    de novo
+        if not dfManifesto.empty and (
+                'ORIGEM' not in dfManifesto
+                or (dfManifesto['ORIGEM'] != origem).any()):
+            #LOG.warning("makeDBnomes: manifesto de outro caminho")
+            dfManifesto = pd.DataFrame()
+        #----Tamanho e mtime vêm do percurso de iteraArquivos, sem listar a
+        #    pasta antes
+        dfManifesto, relidos = atualizaManifestoNomes(iteraArquivos(PATH),
+                                                      dfManifesto, cabecalho)
+        #LOG.info("makeDBnomes: %s arquivos relidos", relidos)
+        os.makedirs(os.path.dirname(pathManifesto), exist_ok=True)
+        dfManifesto.assign(ORIGEM=origem).to_csv(pathManifesto, index=False)
+        #----Reconstrói as listas como seriam produzidas lendo todos os
+        #    arquivos
+        for linha in dfManifesto.itertuples(index=False):
+            if linha.ESTADO == 'INVALIDO':
+                problemas.append([linha.FILE, [], [], []])
+            elif linha.ESTADO == 'SEM-ID':
+                problemas.append([linha.FILE, [], linha.CPF, linha.NOME])
+                nomes.append([linha.FILE, np.nan, linha.CPF, linha.NOME])
+            else:
+                nomes.append([linha.FILE, linha.ID, linha.CPF, linha.NOME])
+    else:
+        #----Le todas as pastas e subpastas indicadas para busca de XML
+        for file in readFolder(PATH):
+            nome, problema = _leNome(file, cabecalho)
+            if problema is not None:
+                problemas.append(problema)
+            if nome is not None:
+                nomes.append(nome)
+
+    dfProblema = pd.DataFrame(problemas, columns = ['FILE','ID', 'CPF','NOME'])
+    df = pd.DataFrame()
+    dfRuim = dfProblema
+    if len(nomes) != 0:
+        df = pd.DataFrame(nomes)
+        df.columns = ['FILE','ID', 'CPF','NOME']
+        #----Apenas nome do arquivo dentro do pacote
+        df['FILE']= df['FILE'].apply( lambda val: '../../' + '/'.join(val.split('/')[-5:]))
+        #----Nome completo, tudo em maíusculas e sem acentos, normalizado para comparações.
+        dfRuim = df[ ( (df['NOME'].isna()) | (df['CPF'].isna()) | (df['ID'].isna()) )]
+        dfRuim = pd.concat([dfRuim, dfProblema], axis = 0)
+        df = df.dropna()
+        #----No modo incremental a deduplicação roda sobre o manifesto em
+        #    memória, sem reler os XML
+        df = df.groupby(['NOME']).first().reset_index()
+        df['NOME']=df['NOME'].apply(lambda val: unidecode(val.upper()))
+        #----Salva arquivo XLSX
+        if save_to_disk:
+            PATH = pathHandler('../../data/external/DBnomes.xlsx')
+            PATHRuim = pathHandler('../../data/external/XMLruim.xlsx')
+            df.to_excel(PATH, index=False)
+            dfRuim.to_excel(PATHRuim, index=False)
+
+    return df, dfRuim
+
+#----------------------------------------------------------------------------
+#----Registro de dados de referência compartilhado no processo
+#----------------------------------------------------------------------------
+#----Planilhas e índices carregados uma única vez. A chave inclui o mtime do
+#    arquivo para recarregar se a planilha for alterada.
+_REFERENCIAS = {}
+
+def normalizaCPF(valor):
+    """Coloca o CPF na forma canônica: apenas dígitos, com 11 posições.
+    Planilhas costumam guardar CPF como número e perdem os zeros à esquerda.
+
+    Args:
+        valor (type): CPF como texto ou número `valor`.
+
+    Returns:
+        type: str com 11 dígitos ou "" se não houver CPF.
+
+    """
+    if valor is None:
+        return ''
+    if isinstance(valor, (float, np.floating)):
+        if np.isnan(valor):
+            return ''
+        valor = int(valor)
+    digitos = ''.join(char for char in str(valor) if char.isdigit())
+    return digitos.zfill(11) if digitos else ''
+
+@cronometrado()
+def carregaTabela(PATH):
+    """Lê uma planilha de referência apenas uma vez por processo e devolve
+    sempre o mesmo dataframe. O dataframe é compartilhado e não deve ser
+    alterado.
+
+    Args:
+        PATH (type): Caminho da planilha `PATH`.
+
+    Returns:
+        type: Dataframe.
+
+    """
+    path = pathHandler(PATH)
+    chave = ('tabela', path, os.path.getmtime(path))
+    if chave not in _REFERENCIAS:
+        _REFERENCIAS[chave] = pd.read_excel(path)
+    return _REFERENCIAS[chave]
+
+def indiceCPF(PATH, coluna='CPF'):
+    """Índice hash do CPF normalizado para as posições das linhas da planilha,
+    construído uma única vez por processo.
+
+    Args:
+        PATH (type): Caminho da planilha `PATH`.
+        coluna (type): Coluna com o CPF `coluna`. Defaults to 'CPF'.
+
+    Returns:
+        type: Dicionário {CPF: [posições]}.
+
+    """
+    path = pathHandler(PATH)
+    chave = ('indice', path, os.path.getmtime(path), coluna)
+    if chave not in _REFERENCIAS:
+        indice = {}
+        for posicao, valor in enumerate(carregaTabela(path)[coluna].tolist()):
+            indice.setdefault(normalizaCPF(valor), []).append(posicao)
+        indice.pop('', None)
+        _REFERENCIAS[chave] = indice
+    return _REFERENCIAS[chave]
+
+def limpaReferencias():
+    """Esvazia o registro de planilhas de referência do processo e fecha os
+    .zip abertos.
+
+    Returns:
+        type: None.
+
+    """
+    _REFERENCIAS.clear()
+    while _ZIPS:
+        _ZIPS.popitem()[1].close()
+    return
+
+def normalizaNome(nome):
+    """Forma canônica de nomes para comparação: maiúsculas, sem acentos e com
+    espaços simples.
+
+    Args:
+        nome (type): Nome `nome`.
+
+    Returns:
+        type: str.
+
+    """
+    return ' '.join(unidecode(str(nome)).upper().split())
+
+class IndiceNomes:
+    """Índice em memória de DBnomes: nome normalizado, CPF e ID Lattes
+    apontando para o arquivo XML. Use IndiceNomes.carrega para obter o índice
+    compartilhado do processo.
+
+    Args:
+        df (type): Dataframe no formato de makeDBnomes, com colunas FILE, ID,
+            CPF e NOME `df`.
+
+    Attributes:
+        porNome (type): Dicionário nome normalizado -> arquivo `porNome`.
+        porCPF (type): Dicionário CPF normalizado -> arquivo `porCPF`.
+        porID (type): Dicionário ID Lattes -> arquivo `porID`.
+
+    """
+    def __init__(self, df):
+        self.porNome = {}
+        self.porCPF = {}
+        self.porID = {}
+        #----Em caso de repetição vale a primeira linha, como no
+        #    df.loc[...].values[0] original
+        for FILE, ID, CPF, NOME in df[['FILE', 'ID', 'CPF',
+                                       'NOME']].itertuples(index=False):
+            self.porNome.setdefault(normalizaNome(NOME), FILE)
+            self.porCPF.setdefault(normalizaCPF(CPF), FILE)
+            self.porID.setdefault(self.normalizaID(ID), FILE)
+        self.porCPF.pop('', None)
+        self.porID.pop('', None)
+        self.__trigramas = None
+
+    @staticmethod
+    def normalizaID(ID):
+        """ID Lattes com 16 dígitos. Planilhas guardam o ID como número e
+        perdem os zeros à esquerda.
+
+        Args:
+            ID (type): ID Lattes `ID`.
+
+        Returns:
+            type: str.
+
+        """
+        if isinstance(ID, (float, np.floating)):
+            if np.isnan(ID):
+                return ''
+            ID = int(ID)
+        digitos = ''.join(char for char in str(ID) if char.isdigit())
+        return digitos.zfill(16) if digitos else ''
+
+    @classmethod
+    def carrega(cls, PATH="../../data/external/DBnomes.xlsx"):
+        """Índice construído uma única vez por processo a partir de
+        DBnomes.xlsx, refeito se o arquivo mudar.
+
+        Args:
+            PATH (type): Caminho de DBnomes `PATH`. Defaults to
+                "../../data/external/DBnomes.xlsx".
+
+        Returns:
+            type: IndiceNomes.
+
+        """
+        path = pathHandler(PATH)
+        chave = ('nomes', path, os.path.getmtime(path))
+        if chave not in _REFERENCIAS:
+            _REFERENCIAS[chave] = cls(carregaTabela(path))
+        return _REFERENCIAS[chave]
+
+    def arquivo(self, nome):
+        return self.porNome.get(normalizaNome(nome))
+
+    def arquivoCPF(self, CPF):
+        return self.porCPF.get(normalizaCPF(CPF))
+
+    def arquivoID(self, ID):
+        return self.porID.get(self.normalizaID(ID))
+
+    @staticmethod
+    def trigramas(nome):
+        nome = '  ' + nome + ' '
+        return {nome[i:i+3] for i in range(len(nome) - 2)}
+
+    def aproximado(self, nome, limite=0.85, n=1):
+        """Busca aproximada de nomes. Os candidatos são todos os nomes que
+        compartilham ao menos um trigrama com a busca. Antes do SequenceMatcher
+        cada candidato recebe um limite superior exato de ratio (as letras em
+        comum, como quick_ratio): só são descartados candidatos que não
+        alcançariam `limite` ou os n melhores, então o resultado é o mesmo de
+        comparar com todos os candidatos.
+
+        Args:
+            nome (type): Nome procurado `nome`.
+            limite (type): Similaridade mínima entre 0 e 1 `limite`. Defaults
+                to 0.85.
+            n (type): Número máximo de resultados `n`. Defaults to 1.
+
+        Returns:
+            type: Lista de tuplas (nome, similaridade, arquivo), da mais
+                parecida para a menos.
+
+        """
+        if self.__trigramas is None:
+            self.__trigramas = {}
+            for chave in self.porNome:
+                for trigrama in self.trigramas(chave):
+                    self.__trigramas.setdefault(trigrama, []).append(chave)
+        nome = normalizaNome(nome)
+        candidatos = set()
+        for trigrama in self.trigramas(nome):
+            candidatos.update(self.__trigramas.get(trigrama, ()))
+        #----Limite superior de ratio pelas letras em comum, como quick_ratio,
+        #    calculado sem montar um SequenceMatcher por candidato
+        letras = Counter(nome)
+        limites = []
+        for candidato in candidatos:
+            comuns = sum((letras & Counter(candidato)).values())
+            teto = 2.0 * comuns / (len(nome) + len(candidato))
+            if teto >= limite:
+                limites.append((teto, candidato))
+        #----Do maior limite para o menor: para quando nenhum candidato
+        #    restante pode entrar nos n melhores
+        limites.sort(key=lambda val: (-val[0], val[1]))
+        resultado = []
+        for teto, candidato in limites:
+            if len(resultado) >= n and teto < resultado[n-1][1]:
+                break
+            razao = SequenceMatcher(None, nome, candidato).ratio()
+            if razao >= limite:
+                resultado.append((candidato, razao, self.porNome[candidato]))
+                #----Empates na ordem alfabética, independente da ordem do
+                #    conjunto
+                resultado.sort(key=lambda val: (-val[1], val[0]))
+        return resultado[:n]
+
+#----------------------------------------------------------------------------
+#----Cache em disco das seções extraídas de cada currículo
+#----------------------------------------------------------------------------
+#----Erros de leitura de uma entrada do cache ou do cabeçalho do XML que a
+#    valida: a entrada é ignorada
+ERROS_CACHE = (OSError, ValueError, EOFError, pickle.UnpicklingError,
+               etree.XMLSyntaxError, zipfile.BadZipFile)
+
+class CacheCV:
+    """Cache em disco das tabelas extraídas de cada currículo, uma pasta por
+    NUMERO-IDENTIFICADOR e um arquivo por seção. Uma entrada é válida se o XML
+    tem o mesmo tamanho e mtime, ou o mesmo hash de conteúdo, a mesma
+    DATA-ATUALIZACAO e a mesma versão (ver versao); a validação lê só o
+    cabeçalho do XML. Quando o tamanho total passa de `max_bytes` as entradas
+    acessadas há mais tempo são removidas.
+
+    Args:
+        PATH (type): Pasta do cache `PATH`. Defaults to
+            "../../data/interim/cacheCV".
+        max_bytes (type): Tamanho máximo do cache em bytes `max_bytes`.
+            Defaults to 2 GB.
+        formato (type): "pickle" ou "parquet". As seções são pequenas e a
+            leitura de um Parquet custa mais que o parsing da seção, por isso o
+            padrão é pickle `formato`. Defaults to 'pickle'.
+
+    Attributes:
+        path (type): Caminho absoluto da pasta do cache `path`.
+        formato (type): "parquet" ou "pickle" `formato`.
+
+    """
+    MANIFESTO = 'manifesto.json'
+    #----Aumentar quando a extração ou a arrumação das tabelas mudar sem mudar
+    #    ESQUEMAS
+    VERSAO = 2
+
+    def __init__(self, PATH="../../data/interim/cacheCV", max_bytes=2*1024**3,
+                 formato='pickle'):
+        self.path = pathHandler(PATH)
+        self.max_bytes = max_bytes
+        self.formato = formato if pyarrow is not None else 'pickle'
+        #----Validações já feitas neste processo: file -> (tamanho, mtime, ID,
+        #    DATA-ATUALIZACAO)
+        self.__validos = {}
+        #----Manifestos lidos ou gravados neste processo: ID -> manifesto
+        self.__manifestos = {}
+        self.__total = None
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def hashArquivo(file):
+        """Hash sha1 do conteúdo do arquivo, descompactado se for o caso.
+
+        Args:
+            file (type): Caminho do arquivo `file`.
+
+        Returns:
+            type: str hexadecimal.
+
+        """
+        sha1 = hashlib.sha1()
+        with abreXML(file) as arquivo:
+            for bloco in iter(lambda: arquivo.read(1024*1024), b''):
+                sha1.update(bloco)
+        return sha1.hexdigest()
+
+    @classmethod
+    def versao(cls):
+        """Versão das tabelas gravadas: VERSAO junto com um hash de ESQUEMAS e
+        da versão do pandas, que lê os pickles. Entradas gravadas com outra
+        versão são descartadas.
+
+        Returns:
+            type: str.
+
+        """
+        esquemas = json.dumps(ESQUEMAS, sort_keys=True) + pd.__version__
+        return '%d.%s' % (cls.VERSAO,
+                          hashlib.sha1(esquemas.encode()).hexdigest()[:8])
+
+    @classmethod
+    def chaveSecao(cls, secao, periodo):
+        """Nome da seção no cache, com a versão. As tabelas já vêm filtradas
+        pelo período, que entra na chave.
+
+        Args:
+            secao (type): Nome da seção `secao`.
+            periodo (type): Período de avaliação `periodo`.
+
+        Returns:
+            type: str.
+
+        """
+        chave = secao + '_v' + cls.versao()
+        if periodo is None:
+            return chave
+        periodo = repr(sorted(map(str, periodo))).encode()
+        periodo = hashlib.sha1(periodo).hexdigest()[:12]
+        return chave + '_' + periodo
+
+    def _pasta(self, ID):
+        return join(self.path, ID)
+
+    def _leManifesto(self, ID):
+        try:
+            with open(join(self._pasta(ID), self.MANIFESTO)) as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError) as error:
+            return None
+
+    def _gravaManifesto(self, ID, manifesto):
+        destino = join(self._pasta(ID), self.MANIFESTO)
+        temporario = destino + '.%d.tmp' % os.getpid()
+        with open(temporario, 'w') as arquivo:
+            json.dump(manifesto, arquivo)
+        os.replace(temporario, destino)
+        self.__manifestos[ID] = manifesto
+
+    def entrada(self, file):
+        """Localiza a entrada válida do arquivo, lendo só o cabeçalho do XML.
+
+        Args:
+            file (type): Caminho do XML `file`.
+
+        Returns:
+            type: Tupla (ID, manifesto). manifesto é None se não houver entrada
+                válida.
+
+        """
+        assinatura = assinaturaXML(file)
+        memo = self.__validos.get(file)
+        if memo is not None and memo[:2] == assinatura:
+            ID = memo[2]
+            manifesto = self.__manifestos.get(ID)
+        else:
+            raiz, gerais = leCabecalho(file)
+            ID = raiz.get('NUMERO-IDENTIFICADOR')
+            if ID is None:
+                return None, None
+            self.__validos[file] = (*assinatura, ID,
+                                    raiz.get('DATA-ATUALIZACAO'))
+            manifesto = None
+        ID, atualiza = self.__validos[file][2:]
+        if manifesto is None:
+            manifesto = self._leManifesto(ID)
+            if manifesto is not None:
+                #----Registra o acesso para a política de remoção, uma vez por
+                #    processo
+                os.utime(join(self._pasta(ID), self.MANIFESTO))
+                self.__manifestos[ID] = manifesto
+        if (manifesto is None or manifesto.get('atualiza') != atualiza
+                or manifesto.get('versao') != self.versao()):
+            return ID, None
+        if (manifesto['tamanho'], manifesto['mtime']) != tuple(assinatura):
+            #----Arquivo tocado ou copiado: vale se o conteúdo for o mesmo
+            if manifesto['sha1'] != self.hashArquivo(file):
+                return ID, None
+            manifesto['tamanho'], manifesto['mtime'] = assinatura
+            self._gravaManifesto(ID, manifesto)
+        return ID, manifesto
+
+    def carrega(self, file, secao):
+        """Busca uma seção no cache.
+
+        Args:
+            file (type): Caminho do XML `file`.
+            secao (type): Chave da seção, ver chaveSecao `secao`.
+
+        Returns:
+            type: Tupla (encontrado, dataframe ou None).
+
+        """
+        ID, manifesto = self.entrada(file)
+        if manifesto is None or secao not in manifesto['secoes']:
+            return False, None
+        nome = manifesto['secoes'][secao]
+        if nome is None:
+            return True, None
+        try:
+            if nome.endswith('.parquet'):
+                df = pd.read_parquet(join(self._pasta(ID), nome))
+            else:
+                df = pd.read_pickle(join(self._pasta(ID), nome))
+        except (OSError, ValueError, EOFError,
+                pickle.UnpicklingError) as error:
+            #----Arquivo da seção removido ou corrompido: a seção é refeita e
+            #    regravada
+            warnings.warn("CacheCV: seção {} de {} ilegível ({!r})".format(
+                secao, file, error), RuntimeWarning)
+            return False, None
+        return True, df
+
+    def grava(self, file, secao, df):
+        """Grava uma seção no cache. None também é gravado, para não refazer o
+        parsing de seções vazias. Uma entrada inválida ou de outra versão é
+        descartada inteira.
+
+        Args:
+            file (type): Caminho do XML `file`.
+            secao (type): Chave da seção, ver chaveSecao `secao`.
+            df (type): Dataframe ou None `df`.
+
+        Returns:
+            type: None.
+
+        """
+        ID, manifesto = self.entrada(file)
+        if ID is None:
+            return
+        pasta = self._pasta(ID)
+        if manifesto is None:
+            #----Entrada nova ou inválida: descarta as seções antigas
+            shutil.rmtree(pasta, ignore_errors=True)
+            os.makedirs(pasta, exist_ok=True)
+            tamanho, mtime, ID, atualiza = self.__validos[file]
+            manifesto = {'file': file, 'tamanho': tamanho, 'mtime': mtime,
+                         'atualiza': atualiza,
+                         'sha1': self.hashArquivo(file),
+                         'versao': self.versao(), 'secoes': {}}
+        nome = None
+        if df is not None:
+            nome = secao + ('.parquet' if self.formato == 'parquet'
+                            else '.pkl')
+            destino = join(pasta, nome)
+            temporario = destino + '.%d.tmp' % os.getpid()
+            if self.formato == 'parquet':
+                df.to_parquet(temporario)
+            else:
+                df.to_pickle(temporario)
+            os.replace(temporario, destino)
+            if self.__total is not None:
+                self.__total += os.path.getsize(destino)
+        manifesto['secoes'][secao] = nome
+        self._gravaManifesto(ID, manifesto)
+        self.limita()
+        return
+
+    def tamanho(self):
+        """Tamanho total do cache em bytes.
+
+        Returns:
+            type: int.
+
+        """
+        total = 0
+        for pasta, subpastas, arquivos in os.walk(self.path):
+            total += sum(os.path.getsize(join(pasta, arquivo))
+                         for arquivo in arquivos)
+        self.__total = total
+        return total
+
+    def limita(self):
+        """Remove as entradas acessadas há mais tempo até o cache caber em
+        max_bytes.
+
+        Returns:
+            type: Número de entradas removidas.
+
+        """
+        if self.__total is None:
+            self.tamanho()
+        if self.__total <= self.max_bytes:
+            return 0
+        #----A estimativa é por processo, confirma no disco antes de remover
+        if self.tamanho() <= self.max_bytes:
+            return 0
+        entradas = []
+        for item in os.scandir(self.path):
+            if item.is_dir():
+                manifesto = join(item.path, self.MANIFESTO)
+                acesso = (os.path.getmtime(manifesto) if isfile(manifesto)
+                          else 0)
+                tamanho = sum(os.path.getsize(join(item.path, nome))
+                              for nome in os.listdir(item.path))
+                entradas.append((acesso, tamanho, item.path))
+        removidas = 0
+        for acesso, tamanho, pasta in sorted(entradas):
+            if self.__total <= self.max_bytes:
+                break
+            shutil.rmtree(pasta, ignore_errors=True)
+            self.__manifestos.pop(os.path.basename(pasta), None)
+            self.__total -= tamanho
+            removidas += 1
+        return removidas
+
+    def limpa(self):
+        """Remove todo o conteúdo do cache.
+
+        Returns:
+            type: None.
+
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
+        self.__validos.clear()
+        self.__manifestos.clear()
+        self.__total = 0
+        return
+
+def _emCache(secao, porPeriodo=True, opcoes=(), lista=False):
+    """Decorador dos getters de seção: usa o CacheCV do Pesquisador, se houver,
+    antes de percorrer o XML.
+
+    Args:
+        secao (type): Nome da seção no cache `secao`.
+        porPeriodo (type): A seção é filtrada pelo período e ele faz parte da
+            chave `porPeriodo`. Defaults to True.
+        opcoes (type): kwargs do Pesquisador que mudam o resultado e entram na
+            chave quando ativos `opcoes`. Defaults to ().
+        lista (type): O getter devolve uma lista, gravada como uma coluna VALOR
+            `lista`. Defaults to False.
+
+    Returns:
+        type: Decorador.
+
+    """
+    def decorador(metodo):
+        @wraps(metodo)
+        def getter(self):
+            cache = self.cache
+            if cache is None or self.file is None:
+                return metodo(self)
+            nome = secao + ''.join('+' + opcao for opcao in opcoes
+                                   if self.kwargs.get(opcao))
+            chave = cache.chaveSecao(nome,
+                                     self.periodo if porPeriodo else None)
+            encontrado, df = cache.carrega(self.file, chave)
+            if encontrado:
+                return df['VALOR'].tolist() if lista and df is not None else df
+            valor = metodo(self)
+            if lista and valor is not None:
+                serie = pd.Series(valor, dtype=object)
+                cache.grava(self.file, chave, pd.DataFrame({'VALOR': serie}))
+            else:
+                cache.grava(self.file, chave, valor)
+            return valor
+        return getter
+    return decorador
+
+class _SecaoPreguicosa:
+    """Atributo do Pesquisador calculado na primeira leitura pelo getter
+    indicado e guardado em Pesquisador.memo. É descartado quando `file` muda e,
+    se depende do período, quando `periodo` muda.
+
+    Args:
+        getter (type): Nome do método que calcula o valor `getter`.
+        porPeriodo (type): O valor depende do período `porPeriodo`. Defaults to
+            True.
+
+    """
+    def __init__(self, getter, porPeriodo=True):
+        self.getter = getter
+        self.porPeriodo = porPeriodo
+        self.nome = getter
+
+    def __set_name__(self, owner, nome):
+        self.nome = nome
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return self
+        memo = obj.memo
+        if self.nome not in memo:
+            #----Sem XML válido as seções são None, como nos getters
+            memo[self.nome] = getattr(obj,
+                                      self.getter)() if obj.valido else None
+        return memo[self.nome]
+
+#----------------------------------------------------------------------------
+#----Extração das seções do XML em uma única passagem
+#----------------------------------------------------------------------------
+#----Tipos de produção técnica no terceiro nível de PRODUCAO-TECNICA
+TIPOS_PRODUCAO_TECNICA = [
+    'DADOS-BASICOS-DO-SOFTWARE', 'DADOS-BASICOS-DA-PATENTE',
+    'APRESENTACAO-DE-TRABALHO', 'ORGANIZACAO-DE-EVENTO',
+    'DADOS-BASICOS-DO-TRABALHO-TECNICO', 'CURSO-DE-CURTA-DURACAO-MINISTRADO',
+    'PROGRAMA-DE-RADIO-OU-TV', 'RELATORIO-DE-PESQUISA',
+    'OUTRA-PRODUCAO-TECNICA', 'EDITORACAO',
+    'DADOS-BASICOS-DO-PROCESSOS-OU-TECNICAS',
+    'DADOS-BASICOS-DO-PRODUTO-TECNOLOGICO',
+    'DESENVOLVIMENTO-DE-MATERIAL-DIDATICO-OU-INSTRUCIONAL',
+    'MIDIA-SOCIAL-WEBSITE-BLOG', 'DADOS-BASICOS-DA-MARCA',
+    'CARTA-MAPA-OU-SIMILAR', 'MAQUETE']
+#----Seções de produção com blocos DADOS/DETALHAMENTO no quarto nível
+SECOES_PRODUCAO = ['PRODUCAO-BIBLIOGRAFICA', 'PRODUCAO-TECNICA',
+                   'OUTRA-PRODUCAO', 'DADOS-COMPLEMENTARES']
+
+#----Especificação de dfTidy para cada seção. As chaves são as mesmas de
+#    extraiSecoes.
+#--------cols_merge: colunas com múltiplas equivalências.
+#--------cols_equiv: colunas que tem que mudar de nome
+#--------cols_keep: juntando todos os dados básicos e complementares.
+#--------cols_out: jogue fora toda coluna com estes termos
+#--------cols_final: colunas para tentar manter, incluindo substrings
+ESQUEMAS = {
+    'FORMACAO-ACADEMICA-TITULACAO': {
+        'cols_merge': ['TIPO', 'NOME-INSTITUICAO'],
+        'cols_equiv': {},
+        'cols_keep': [],
+        'cols_out': ['INGLES', 'CODIGO', 'FLAG', 'ORIENTADOR', 'OUTRA',
+                     'TITULO'],
+        'cols_final': []},
+    'PRODUCAO-BIBLIOGRAFICA': {
+        'cols_merge': ['ANO', 'TITULO','PAIS', 'REVISTA', 'MEIO', 'ISSN-ISBN'],
+        'cols_equiv': {'TITULO-DO-PERIODICO-OU-REVISTA':'REVISTA',
+                       'TITULO-DOS-ANAIS-OU-PROCEEDINGS':'REVISTA-PROC',
+                       'TITULO-DO-JORNAL-OU-REVISTA':'REVISTA-JORNAL',
+                       'ISBN':'ISSN-ISBN-1', 'ISSN':'ISSN-ISBN-2'},
+        #--------Dados básicos seguidos dos dados complementares.
+        'cols_keep': ['PRODUCAO', 'TIPO', 'NATUREZA','TITULO', 'ANO', 'PAIS',
+                      'MEIO', 'DOI', 'REVISTA', 'CLASSIFICACAO', 'NOME',
+                      'EDITORA', 'ISSN-ISBN', 'ISSN', 'ISBN'],
+        'cols_out': ['INGLES', 'CODIGO', 'FLAG', 'HOME', 'CIDADE','PAGINA'],
+        'cols_final': ['SEQUENCIA-PRODUCAO', 'PRODUCAO', 'NATUREZA',
+                       'CLASSIFICACAO', 'TIPO', 'TITULO', 'ANO', 'PAIS',
+                       'REVISTA','DOI', 'ISBN' ,'NOME']},
+    'TIPOS-PRODUCAO-TECNICA': {
+        'cols_merge': ['ANO', 'TITULO','PAIS'],
+        'cols_equiv': {'INSTITUICAO-FINANCIADORA':'FOMENTO'},
+        'cols_keep': ['ANO','PRODUCAO', 'SEQUENCIA-PRODUCAO', 'TIPO-PRODUCAO',
+                      'NATUREZA', 'PAIS', 'IDIOMA', 'DOI', 'FINALIDADE',
+                      'INSTITUICAO-FINANCIADORA','TITULO',
+                      'NOME-COMPLETO-DO-AUTOR', 'CATEGORIA', 'TIPO-PRODUTO'],
+        'cols_out': ['INGLES', 'CODIGO', 'FLAG', 'HOME', 'CIDADE','PAGINA'],
+        'cols_final': ['ANO','PRODUCAO', 'SEQUENCIA-PRODUCAO', 'TIPO-PRODUCAO',
+                       'NATUREZA', 'PAIS', 'IDIOMA', 'DOI', 'FINALIDADE',
+                       'INSTITUICAO-FINANCIADORA','TITULO',
+                       'NOME-COMPLETO-DO-AUTOR', 'CATEGORIA', 'TIPO-PRODUTO']},
+    'PRODUCAO-TECNICA': {
+        'cols_merge': ['ANO', 'TITULO','PAIS'],
+        'cols_equiv': {},
+        'cols_keep': ['PRODUCAO', 'SEQUENCIA-PRODUCAO', 'NATUREZA', 'TITULO',
+                      'ANO', 'PAIS', 'IDIOMA', 'DOI','PRODUCAO',
+                      'SEQUENCIA-PRODUCAO', 'TIPO-DE-ORIENTACAO',
+                      'NOME-DO-ORIENTANDO', 'NOME-DA-AGENCIA'],
+        'cols_out': ['INGLES', 'CODIGO', 'FLAG', 'HOME', 'CIDADE','PAGINA'],
+        'cols_final': ['SEQUENCIA-PRODUCAO', 'PRODUCAO', 'TIPO','NATUREZA',
+                       'TITULO','ANO', 'PAIS', 'IDIOMA', 'DOI']},
+    'OUTRA-PRODUCAO': {
+        'cols_merge': ['ANO', 'TITULO','PAIS'],
+        'cols_equiv': {},
+        'cols_keep': ['PRODUCAO', 'SEQUENCIA-PRODUCAO', 'NATUREZA', 'TITULO',
+                      'ANO', 'PAIS', 'IDIOMA', 'DOI','PRODUCAO',
+                      'SEQUENCIA-PRODUCAO', 'TIPO-DE-ORIENTACAO',
+                      'NOME-DO-ORIENTANDO', 'NOME-DA-AGENCIA'],
+        'cols_out': ['INGLES', 'CODIGO', 'FLAG', 'HOME', 'CIDADE','PAGINA'],
+        'cols_final': ['SEQUENCIA-PRODUCAO', 'PRODUCAO', 'TIPO','NATUREZA',
+                       'TITULO','ANO', 'PAIS', 'IDIOMA', 'DOI']},
+    'DADOS-COMPLEMENTARES': {
+        'cols_merge': ['ANO', 'TITULO','PAIS'],
+        'cols_equiv': {},
+        'cols_keep': ['PRODUCAO', 'SEQUENCIA-PRODUCAO', 'NATUREZA', 'TITULO',
+                      'ANO', 'PAIS', 'IDIOMA', 'TIPO-PARTICIPACAO'],
+        'cols_out': ['INGLES', 'CODIGO', 'FLAG', 'HOME', 'CIDADE','PAGINA'],
+        'cols_final': ['SEQUENCIA-PRODUCAO', 'PRODUCAO', 'TIPO','NATUREZA',
+                       'TITULO','ANO', 'PAIS', 'IDIOMA', 'DOI']},
+}
+
+def filtroAtributos(esquema):
+    """Constrói a função que decide se um atributo do XML pode chegar ao
+    resultado de dfTidy com o esquema dado. Atributos descartados não afetam o
+    resultado: não escapam de cols_out, não são renomeados, não entram em
+    nenhuma junção de cols_merge e não são mantidos por cols_final.
+
+    Args:
+        esquema (type): Um item de ESQUEMAS `esquema`.
+
+    Returns:
+        type: Função nome -> bool.
+
+    """
+    cols_out = esquema['cols_out']
+    cols_equiv = esquema['cols_equiv']
+    #----cols_final vazio mantém todas as colunas
+    termos = [*esquema['cols_merge'],
+              *esquema['cols_final']] if esquema['cols_final'] else None
+    def aceita(nome):
+        if any(out in nome for out in cols_out):
+            return False
+        if termos is None or nome in cols_equiv:
+            return True
+        nome = cols_equiv.get(nome, nome)
+        return any(termo in nome for termo in termos)
+    return aceita
+
+#----Valor da linha que representa os registros descartados pelo filtro de
+#    período
+def chaveAno(esquema, termo='ANO'):
+    """Constrói a função que ordena os atributos de ano de um registro como a
+    junção de cols_merge em dfTidy: o ano do registro é o primeiro atributo
+    presente, em ordem alfabética do nome já renomeado, que contém `termo`
+    (ANO, ANO-DO-ARTIGO, ANO-DO-TRABALHO...).
+
+    Args:
+        esquema (type): Um item de ESQUEMAS `esquema`.
+        termo (type): Coluna usada no filtro de período `termo`. Defaults to
+            'ANO'.
+
+    Returns:
+        type: Função nome -> chave de ordem ou None, ou None quando o ano não
+            pode ser calculado durante a extração.
+
+    """
+    cols_equiv = esquema['cols_equiv']
+    #----Colunas criadas vazias por dfTidy entrariam na junção do ano
+    if any(termo in col for col in cols_equiv.values()):
+        return None
+    if not esquema['cols_out'] and any(termo in col
+                                       for col in esquema['cols_keep']):
+        return None
+    junta = termo in esquema['cols_merge']
+    def chave(nome):
+        nome = cols_equiv.get(nome, nome)
+        if nome == termo or (junta and termo in nome):
+            return nome
+        return None
+    return chave
+
+class AcumuladorColunas:
+    """Acumula registros de uma seção diretamente em listas por coluna,
+    guardando apenas os atributos aceitos pelo filtro do esquema. O dataframe é
+    criado uma única vez no final. Colunas ausentes em um registro ficam com
+    NaN, como em um dataframe construído a partir de lista de dicionários.
+
+    Com `periodo` e `chaveAno` os registros fora do período são descartados
+    antes de guardar qualquer valor e não aparecem no dataframe. As colunas
+    desses registros continuam existindo, vazias, e ficam em `descartadas`:
+    dfTidy as trata como não vazias nas junções, como se os registros ainda
+    estivessem lá.
+
+    Args:
+        filtro (type): Função nome -> bool, ver filtroAtributos. None aceita
+            tudo `filtro`. Defaults to None.
+        periodo (type): Anos aceitos. None guarda todos os registros `periodo`.
+            Defaults to None.
+        chaveAno (type): Função nome -> chave de ordem do ano, ver chaveAno
+            `chaveAno`. Defaults to None.
+
+    Attributes:
+        colunas (type): Dicionário nome -> lista de valores, na ordem de
+            aparecimento `colunas`.
+        n (type): Número de registros `n`.
+
+    """
+    def __init__(self, filtro=None, periodo=None, chaveAno=None):
+        self.colunas = {}
+        self.n = 0
+        self.__filtro = filtro
+        self.__aceitos = {}
+        #----Filtro de período durante a extração, só com as duas informações
+        if periodo is None or chaveAno is None:
+            periodo = None
+        self.__periodo = None if periodo is None else set(periodo)
+        self.__chaveAno = chaveAno
+        self.__chaves = {}
+        self.__descartadas = set()
+
+    def adiciona(self, *blocos):
+        """Adiciona um registro formado pela sequência de blocos de pares
+        (nome, valor), por exemplo el.items(). Em nomes repetidos vale o último
+        valor, como em {**a, **b}. Os blocos podem ser percorridos duas vezes,
+        então não use geradores.
+
+        Args:
+            *blocos (type): Iteráveis de pares (nome, valor) `*blocos`.
+
+        Returns:
+            type: None.
+
+        """
+        n = self.n
+        aceitos = self.__aceitos
+        colunas = self.colunas
+        periodo = self.__periodo
+        if periodo is not None and self.__ano(blocos) not in periodo:
+            #----Registro fora do período: apenas registra as colunas
+            for bloco in blocos:
+                for nome, valor in bloco:
+                    aceito = aceitos.get(nome)
+                    if aceito is None:
+                        aceito = self.__filtro is None or self.__filtro(nome)
+                        aceitos[nome] = aceito
+                    if aceito:
+                        if nome not in colunas:
+                            colunas[nome] = [np.nan] * n
+                        self.__descartadas.add(nome)
+            return
+        for bloco in blocos:
+            for nome, valor in bloco:
+                aceito = aceitos.get(nome)
+                if aceito is None:
+                    aceito = self.__filtro is None or self.__filtro(nome)
+                    aceitos[nome] = aceito
+                if not aceito:
+                    continue
+                coluna = colunas.get(nome)
+                if coluna is None:
+                    coluna = colunas[nome] = [np.nan] * n
+                elif len(coluna) < n:
+                    coluna.extend([np.nan] * (n - len(coluna)))
+                if len(coluna) > n:
+                    coluna[n] = valor
+                else:
+                    coluna.append(valor)
+        self.n = n + 1
+        return
+
+    def __ano(self, blocos):
+        """Ano do registro como dfTidy o calcularia: o valor do primeiro
+        atributo de ano na ordem de chaveAno.
+
+        Args:
+            blocos (type): Blocos do registro `blocos`.
+
+        Returns:
+            type: Ano ou None.
+
+        """
+        chaves = self.__chaves
+        melhor = None
+        ano = None
+        for bloco in blocos:
+            for nome, valor in bloco:
+                chave = chaves.get(nome, False)
+                if chave is False:
+                    aceito = self.__filtro is None or self.__filtro(nome)
+                    chave = self.__chaveAno(nome) if aceito else None
+                    chaves[nome] = chave
+                #----Em nomes repetidos vale o último valor
+                if chave is not None and (melhor is None or chave <= melhor):
+                    melhor = chave
+                    ano = valor
+        return ano
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def descartadas(self):
+        """Colunas com valores em registros descartados pelo período.
+
+        Returns:
+            type: frozenset.
+
+        """
+        return frozenset(self.__descartadas)
+
+    def dataframe(self):
+        """Cria o dataframe com colunas fixas e dtype object, só com os
+        registros guardados.
+
+        Returns:
+            type: Dataframe.
+
+        """
+        for coluna in self.colunas.values():
+            if len(coluna) < self.n:
+                coluna.extend([np.nan] * (self.n - len(coluna)))
+        return pd.DataFrame(self.colunas, columns=list(self.colunas),
+                            index=pd.RangeIndex(self.n), dtype=object)
+
+def juntaAcumuladores(*acumuladores):
+    """Dataframe de uma seção a partir dos seus AcumuladorColunas, por exemplo
+    [dados, detalhe] de extraiSecoes, e as colunas que só tiveram valores fora
+    do período.
+
+    Args:
+        *acumuladores (type): AcumuladorColunas, na ordem das linhas
+            `*acumuladores`.
+
+    Returns:
+        type: Tupla (dataframe, conjunto descartadas), ver AcumuladorColunas.
+
+    """
+    if len(acumuladores) == 1:
+        df = acumuladores[0].dataframe()
+    else:
+        df = pd.concat([acumulador.dataframe() for acumulador in acumuladores],
+                       ignore_index=True)
+    return df, frozenset().union(*(acumulador.descartadas
+                                   for acumulador in acumuladores))
+
+class PlanoTidy:
+    """Especificação de dfTidy compilada uma única vez. Para cada conjunto de
+    colunas de entrada o plano resolve, e guarda, quais colunas saem, quais são
+    renomeadas, quais são juntadas e quais ficam no final. Aplicar o plano é
+    uma única seleção com junções vetorizadas, sem cópias intermediárias do
+    dataframe, e reproduz o resultado de dfTidy.
+
+    Args:
+        cols_keep (type): Ver dfTidy `cols_keep`.
+        cols_merge (type): Ver dfTidy `cols_merge`.
+        cols_equiv (type): Ver dfTidy `cols_equiv`.
+        cols_out (type): Ver dfTidy `cols_out`.
+        cols_final (type): Ver dfTidy `cols_final`.
+
+    """
+    #----Número máximo de conjuntos de colunas resolvidos guardados por plano
+    MAX_RESOLUCOES = 1024
+
+    def __init__(self, cols_keep, cols_merge, cols_equiv, cols_out,
+                 cols_final):
+        self.cols_keep = list(cols_keep)
+        self.cols_merge = sorted(cols_merge)
+        self.cols_equiv = dict(cols_equiv)
+        self.cols_out = list(cols_out)
+        self.cols_final = list(cols_final)
+        self.__resolucoes = {}
+
+    @classmethod
+    def compila(cls, cols_keep=(), cols_merge=(), cols_equiv=None, cols_out=(),
+                cols_final=()):
+        """Plano compartilhado para a especificação, compilado na primeira
+        chamada.
+
+        Returns:
+            type: PlanoTidy.
+
+        """
+        cols_equiv = cols_equiv or {}
+        chave = ('plano', tuple(cols_keep), tuple(cols_merge),
+                 tuple(cols_equiv.items()), tuple(cols_out), tuple(cols_final))
+        if chave not in _REFERENCIAS:
+            _REFERENCIAS[chave] = cls(cols_keep, cols_merge, cols_equiv,
+                                      cols_out, cols_final)
+        return _REFERENCIAS[chave]
+
+    def resolve(self, colunas):
+        """Resolve o plano para as colunas de entrada.
+
+        Args:
+            colunas (type): Tupla com as colunas do dataframe `colunas`.
+
+        Returns:
+            type: Tupla (origens, grupos). origens é a lista (nome, coluna de
+                entrada ou constante) antes das junções; grupos é a lista
+                (destino, fontes) das junções.
+
+        """
+        resolucao = self.__resolucoes.get(colunas)
+        if resolucao is not None:
+            return resolucao
+        #----Colunas que escapam de cols_out. Sem cols_out as colunas de
+        #    cols_keep ausentes entram vazias.
+        if self.cols_out:
+            origens = [(col, ('coluna', col)) for col in colunas
+                       if not any(out in col for out in self.cols_out)]
+        else:
+            origens = [(col, ('coluna', col)) for col in colunas]
+            origens += [(col, ('constante', ""))
+                        for col in OrderedDict.fromkeys(self.cols_keep)
+                        if col not in colunas]
+        #----Renomeando, colunas de cols_equiv ausentes entram vazias
+        presentes = {nome for nome, origem in origens}
+        origens += [(col, ('constante', ""))
+                    for col in self.cols_equiv if col not in presentes]
+        origens = [(self.cols_equiv.get(nome, nome), origem)
+                   for nome, origem in origens]
+        #----Junções. Como em dfTidy, a lista de colunas não é atualizada entre
+        #    os grupos.
+        existentes = sorted(nome for nome, origem in origens)
+        grupos = []
+        for agregado in self.cols_merge:
+            colmerge = [col for col in existentes if agregado in col]
+            colmerge = list(OrderedDict.fromkeys(sorted(colmerge
+                                                        + [agregado])))
+            faltantes = [col for col in colmerge if col not in existentes]
+            grupos.append((colmerge[0], colmerge[1:], faltantes))
+        resolucao = (origens, grupos)
+        if len(self.__resolucoes) >= self.MAX_RESOLUCOES:
+            self.__resolucoes.clear()
+        self.__resolucoes[colunas] = resolucao
+        return resolucao
+
+    def aceita(self, nome):
+        """Indica se a coluna final é mantida por cols_final.
+
+        Args:
+            nome (type): Nome da coluna `nome`.
+
+        Returns:
+            type: bool.
+
+        """
+        return not self.cols_final or any(final in nome
+                                          for final in self.cols_final)
+
+    def aplica(self, df, naoNulas=()):
+        """Aplica o plano a um dataframe.
+
+        Args:
+            df (type): Dataframe de uma seção `df`.
+            naoNulas (type): Colunas de entrada tratadas como não vazias nas
+                junções, ver AcumuladorColunas.descartadas `naoNulas`. Defaults
+                to ().
+
+        Returns:
+            type: Dataframe arrumado, com o mesmo índice.
+
+        """
+        origens, grupos = self.resolve(tuple(df.columns))
+        index = df.index
+        series = OrderedDict()
+        #----Nomes já renomeados das colunas com valores em registros
+        #    descartados
+        cheias = set()
+        for nome, (tipo, valor) in origens:
+            series[nome] = df[valor] if tipo == 'coluna' else valor
+            if tipo == 'coluna' and valor in naoNulas:
+                cheias.add(nome)
+        for destino, fontes, faltantes in grupos:
+            for col in faltantes:
+                #----float64 como a coluna criada com np.nan em dfTidy
+                series[col] = pd.Series(np.nan, index=index)
+            for col in fontes:
+                if col not in series:
+                    continue
+                fonte = series[col]
+                if np.isscalar(fonte):
+                    nula = pd.isnull(fonte)
+                else:
+                    nula = col not in cheias and fonte.isnull().all()
+                if not nula:
+                    alvo = series[destino]
+                    if np.isscalar(alvo):
+                        #----object como nas colunas de entrada, mesmo que a
+                        #    fonte só tenha valores descartados
+                        alvo = pd.Series(alvo, index=index, dtype=object)
+                    #----Fonte com valores só nos registros descartados: o
+                    #    fillna com esses valores deixaria o destino object
+                    if col not in cheias or not fonte.isnull().all():
+                        alvo = alvo.fillna(fonte)
+                    else:
+                        alvo = alvo.astype(object)
+                    series[destino] = alvo
+                    del series[col]
+        series = OrderedDict((nome, serie) for nome, serie in series.items()
+                             if self.aceita(nome))
+        return pd.DataFrame(series, index=index, columns=list(series))
+
+def novasSecoes(periodo=None):
+    """Dicionário vazio de seções, como devolvido por extraiSecoes e
+    AlvoSecoes.
+
+    Args:
+        periodo (type): Anos das produções, ver AcumuladorColunas `periodo`.
+            Defaults to None.
+
+    Returns:
+        type: Dicionário de seções vazias.
+
+    """
+    filtros = {tag: filtroAtributos(esquema)
+               for tag, esquema in ESQUEMAS.items()}
+    anos = {tag: chaveAno(esquema) for tag, esquema in ESQUEMAS.items()}
+    secoes = {tag: [AcumuladorColunas(filtros[tag], periodo, anos[tag]),
+                    AcumuladorColunas(filtros[tag], periodo, anos[tag])]
+              for tag in SECOES_PRODUCAO}
+    tag = 'TIPOS-PRODUCAO-TECNICA'
+    secoes[tag] = AcumuladorColunas(filtros[tag], periodo, anos[tag])
+    secoes['DADOS-GERAIS'] = []
+    tag = 'FORMACAO-ACADEMICA-TITULACAO'
+    secoes[tag] = AcumuladorColunas(filtros[tag])
+    secoes['AREAS'] = []
+    secoes['ENDERECO-PROFISSIONAL'] = []
+    return secoes
+
+def extraiSecoes(root, periodo=None):
+    """Percorre a árvore do currículo uma única vez, visitando cada elemento
+    uma vez, e distribui os registros por seção. Produz as mesmas listas que
+    xml2dict, xml2dict_3 e as buscas em DADOS-GERAIS.
+
+    Args:
+        root (type): raiz do XML `root`.
+        periodo (type): Anos das produções. Registros fora do período são
+            descartados durante a extração, ver AcumuladorColunas. None guarda
+            todos `periodo`. Defaults to None.
+
+    Returns:
+        type: Dicionário. As chaves de SECOES_PRODUCAO têm [dados, detalhe]
+            como xml2dict; 'TIPOS-PRODUCAO-TECNICA' tem os registros de
+            xml2dict_3; todos em AcumuladorColunas com o filtro de ESQUEMAS.
+            'DADOS-GERAIS', 'AREAS' e 'ENDERECO-PROFISSIONAL' são listas e
+            'FORMACAO-ACADEMICA-TITULACAO' é um AcumuladorColunas.
+
+    """
+    secoes = novasSecoes(periodo)
+    tipos = secoes['TIPOS-PRODUCAO-TECNICA']
+    for el1 in root.iterchildren():
+        tag = el1.tag
+        if tag == 'DADOS-GERAIS':
+            secoes['DADOS-GERAIS'].append({**el1.attrib})
+            for el2 in el1.iterchildren():
+                if el2.tag == 'FORMACAO-ACADEMICA-TITULACAO':
+                    titulacoes = secoes['FORMACAO-ACADEMICA-TITULACAO']
+                    for el3 in el2.iterchildren():
+                        titulacoes.adiciona((('TITULACAO', el3.tag),),
+                                            el3.items())
+                elif el2.tag == 'AREAS-DE-ATUACAO':
+                    secoes['AREAS'].extend(
+                        el3.get("NOME-DA-AREA-DO-CONHECIMENTO")
+                        for el3 in el2.iterchildren(tag=etree.Element))
+                elif el2.tag == 'ENDERECO':
+                    secoes['ENDERECO-PROFISSIONAL'].extend(
+                        {**el3.attrib} for el3 in
+                        el2.iterchildren(tag='ENDERECO-PROFISSIONAL'))
+        elif tag in secoes:
+            dados, detalhe = secoes[tag]
+            #----Blocos DETALHAMENTO são usados apenas nestas seções. Na
+            #    PRODUCAO-TECNICA o filtro original de INSTITUICAO-FINANCIADORA
+            #    nunca é satisfeito e a lista fica vazia.
+            usaDetalhe = tag in ['PRODUCAO-BIBLIOGRAFICA', 'OUTRA-PRODUCAO']
+            tecnica = tag == 'PRODUCAO-TECNICA'
+            for el2 in el1.iterchildren():
+                for el3 in el2.iterchildren():
+                    if tecnica and any(tipo in el3.tag
+                                       for tipo in TIPOS_PRODUCAO_TECNICA):
+                        tipos.adiciona((('PRODUCAO', el2.tag),), el2.items(),
+                                       (('TIPO-PRODUCAO', el3.tag),),
+                                       el3.items())
+                    for el4 in el3.iterchildren():
+                        if 'DADOS' in el4.tag:
+                            dados.adiciona((('PRODUCAO', el3.tag),),
+                                           el3.items(), el4.items())
+                        if usaDetalhe and 'DETALHAMENTO' in el4.tag:
+                            detalhe.adiciona((('PRODUCAO', el3.tag),),
+                                             el3.items(), el4.items())
+    return secoes
+
+class AlvoSecoes:
+    """Alvo do parser do lxml (XMLParser(target=...)). Recebe os eventos de
+    início e fim de cada elemento e distribui os registros como extraiSecoes,
+    sem construir a árvore: a memória do parsing fica proporcional à
+    profundidade do XML.
+
+    Args:
+        periodo (type): Anos das produções, ver AcumuladorColunas `periodo`.
+            Defaults to None.
+
+    """
+    def __init__(self, periodo=None):
+        self.secoes = novasSecoes(periodo)
+        self.cabecalho = None
+        self.nome = None
+        self.filhos = 0
+        #----Pilha de (tag, atributos) dos elementos abertos
+        self.pilha = []
+
+    def start(self, tag, attrib):
+        pilha = self.pilha
+        nivel = len(pilha)
+        if nivel > 4:
+            #----Abaixo do nível dos registros só a profundidade importa
+            pilha.append(None)
+            return
+        secoes = self.secoes
+        items = list(attrib.items())
+        if nivel == 0:
+            self.cabecalho = dict(items)
+        elif nivel == 1:
+            if self.filhos == 0:
+                #----getDadosBasicos lê o nome do primeiro filho da raiz
+                self.nome = attrib.get('NOME-COMPLETO')
+            self.filhos += 1
+            if tag == 'DADOS-GERAIS':
+                secoes['DADOS-GERAIS'].append(dict(items))
+        elif nivel == 3:
+            secao = pilha[1][0]
+            if secao == 'DADOS-GERAIS':
+                bloco = pilha[2][0]
+                if bloco == 'FORMACAO-ACADEMICA-TITULACAO':
+                    secoes[bloco].adiciona((('TITULACAO', tag),), items)
+                elif bloco == 'AREAS-DE-ATUACAO':
+                    secoes['AREAS'].append(
+                        attrib.get("NOME-DA-AREA-DO-CONHECIMENTO"))
+                elif bloco == 'ENDERECO' and tag == 'ENDERECO-PROFISSIONAL':
+                    secoes['ENDERECO-PROFISSIONAL'].append(dict(items))
+            elif secao == 'PRODUCAO-TECNICA' and any(
+                    tipo in tag for tipo in TIPOS_PRODUCAO_TECNICA):
+                producao, atributos = pilha[2]
+                secoes['TIPOS-PRODUCAO-TECNICA'].adiciona(
+                    (('PRODUCAO', producao),), atributos,
+                    (('TIPO-PRODUCAO', tag),), items)
+        elif nivel == 4:
+            secao = pilha[1][0]
+            if secao in SECOES_PRODUCAO:
+                dados, detalhe = secoes[secao]
+                producao, atributos = pilha[3]
+                if 'DADOS' in tag:
+                    dados.adiciona((('PRODUCAO', producao),), atributos, items)
+                if secao in ['PRODUCAO-BIBLIOGRAFICA',
+                             'OUTRA-PRODUCAO'] and 'DETALHAMENTO' in tag:
+                    detalhe.adiciona((('PRODUCAO', producao),), atributos,
+                                     items)
+        pilha.append((tag, items))
+
+    def end(self, tag):
+        self.pilha.pop()
+
+    def comment(self, text):
+        #----Comentários também contam como primeiro filho da raiz em
+        #    getchildren
+        if len(self.pilha) == 1:
+            self.filhos += 1
+
+    def pi(self, target, data):
+        if len(self.pilha) == 1:
+            self.filhos += 1
+
+    def close(self):
+        return self
+
+def extraiSecoesEventos(file, periodo=None):
+    """Mesmas seções de extraiSecoes lidas direto do arquivo pelos eventos do
+    parser, sem árvore. Aceita as formas de abreXML.
+
+    Args:
+        file (type): Caminho do XML `file`.
+        periodo (type): Anos das produções `periodo`. Defaults to None.
+
+    Returns:
+        type: AlvoSecoes com secoes, cabecalho (atributos da raiz) e nome
+            (NOME-COMPLETO do primeiro filho da raiz).
+
+    """
+    parser = etree.XMLParser(target=AlvoSecoes(periodo))
+    if not compactado(file):
+        return etree.parse(file, parser)
+    with abreXML(file) as arquivo:
+        return etree.parse(arquivo, parser)
+
+#----------------------------------------------------------------------------
+#----Validação de ISSN e ISBN
+#----------------------------------------------------------------------------
+#----O mesmo periódico aparece milhares de vezes: cache limitado por processo
+MAX_CODIGOS = 2**16
+
+@lru_cache(maxsize=MAX_CODIGOS)
+def validaCodigo(codigo):
+    """Valida um ISSN ou ISBN com stdnum. O resultado fica em cache,
+    compartilhado por todos os pesquisadores do processo.
+
+    Args:
+        codigo (type): ISSN ou ISBN `codigo`.
+
+    Returns:
+        type: Código com traço depois do quarto dígito ou 'INVALIDO'.
+
+    """
+    if not isinstance(codigo, str) or not (issn.is_valid(codigo)
+                                           or isbn.is_valid(codigo)):
+        return 'INVALIDO'
+    #----issn retorna fora da forma padrão. Retorna o traço
+    return codigo[:4]+'-'+codigo[4:]
+
+def validaSerieISSN_ISBN(serie):
+    """Valida uma coluna inteira validando apenas os valores distintos.
+
+    Args:
+        serie (type): Series com ISSN ou ISBN `serie`.
+
+    Returns:
+        type: Series com o mesmo índice, ver validaCodigo.
+
+    """
+    codigos, unicos = pd.factorize(serie)
+    #----NaN recebe código -1, que aponta para o último item
+    validos = np.array([validaCodigo(codigo)
+                        for codigo in unicos] + ['INVALIDO'], dtype=object)
+    return pd.Series(validos[codigos], index=serie.index, name=serie.name)
+
+#----------------------------------------------------------------------------
+#----Resolução de DOI
+#----------------------------------------------------------------------------
+#----Endpoint padrão; o DOI é acrescentado ao final
+CROSSREF_WORKS = 'https://api.crossref.org/works/'
+#----Respostas que valem nova tentativa
+STATUS_REPETE = {429, 500, 502, 503, 504}
+#----Única resposta de erro gravada no cache: o DOI não existe. 403, 429 e
+#    outros 4xx podem mudar.
+STATUS_INVALIDO = {404}
+
+class ResolvedorDOI:
+    """Resolve DOI -> ISSN de forma assíncrona: conexões reaproveitadas (uma
+    requests.Session por thread, ou urllib sem requests), no máximo
+    `concorrencia` consultas simultâneas, novas tentativas com espera
+    exponencial e cache em SQLite. Durante a espera entre tentativas a vaga da
+    consulta fica livre para outro DOI. O endpoint é configurável para uso com
+    um servidor local de testes.
+
+    Args:
+        PATH (type): Arquivo SQLite do cache. None não usa cache em disco
+            `PATH`. Defaults to "../../data/interim/doi.sqlite".
+        endpoint (type): URL base, o DOI é acrescentado ao final `endpoint`.
+            Defaults to CROSSREF_WORKS.
+        concorrencia (type): Consultas simultâneas e tamanho do pool de
+            conexões `concorrencia`. Defaults to 16.
+        tentativas (type): Número máximo de tentativas por DOI `tentativas`.
+            Defaults to 4.
+        espera (type): Espera inicial em segundos, dobrada a cada tentativa
+            `espera`. Defaults to 0.5.
+        esperaMaxima (type): Limite em segundos da espera, inclusive a pedida
+            pelo servidor em Retry-After `esperaMaxima`. Defaults to 60.
+        timeout (type): Timeout de cada requisição em segundos `timeout`.
+            Defaults to 10.
+        agente (type): User-Agent enviado; o Crossref pede um contato (mailto)
+            `agente`. Defaults to 'pylattesLXML'.
+
+    """
+    def __init__(self, PATH="../../data/interim/doi.sqlite",
+                 endpoint=CROSSREF_WORKS, concorrencia=16, tentativas=4,
+                 espera=0.5, esperaMaxima=60, timeout=10,
+                 agente='pylattesLXML'):
+        self.PATH = pathHandler(PATH) if PATH else None
+        self.endpoint = endpoint
+        self.concorrencia = concorrencia
+        self.tentativas = tentativas
+        self.espera = espera
+        self.esperaMaxima = esperaMaxima
+        self.timeout = timeout
+        self.agente = agente
+        #----requests.Session não é segura entre threads: uma por thread do
+        #    executor
+        self.__locais = threading.local()
+        if self.PATH is not None:
+            os.makedirs(os.path.dirname(self.PATH), exist_ok=True)
+            with self._conecta() as conexao:
+                conexao.execute('CREATE TABLE IF NOT EXISTS doi '
+                                '(doi TEXT PRIMARY KEY, resultado TEXT)')
+
+    @staticmethod
+    def normalizaDOI(doi):
+        """Forma canônica do DOI, sem prefixo de URL e em minúsculas.
+
+        Args:
+            doi (type): DOI `doi`.
+
+        Returns:
+            type: str, vazio se não for texto.
+
+        """
+        if not isinstance(doi, str):
+            return ''
+        doi = doi.strip().lower()
+        for prefixo in ('https://doi.org/', 'http://doi.org/',
+                        'https://dx.doi.org/', 'http://dx.doi.org/', 'doi:'):
+            if doi.startswith(prefixo):
+                doi = doi[len(prefixo):]
+        return doi
+
+    def _conecta(self):
+        return sqlite3.connect(self.PATH, timeout=30)
+
+    def leCache(self, dois):
+        """Resultados já gravados.
+
+        Args:
+            dois (type): DOIs normalizados `dois`.
+
+        Returns:
+            type: Dicionário DOI -> resultado.
+
+        """
+        if self.PATH is None or not dois:
+            return {}
+        encontrados = {}
+        dois = list(dois)
+        with self._conecta() as conexao:
+            #----Consultas em blocos, limite de variáveis do SQLite
+            for inicio in range(0, len(dois), 500):
+                bloco = dois[inicio:inicio+500]
+                consulta = ('SELECT doi, resultado FROM doi WHERE doi IN (%s)'
+                            % ','.join('?' * len(bloco)))
+                for doi, resultado in conexao.execute(consulta, bloco):
+                    encontrados[doi] = json.loads(resultado)
+        return encontrados
+
+    def gravaCache(self, resultados):
+        """Grava resultados definitivos no cache.
+
+        Args:
+            resultados (type): Dicionário DOI -> resultado `resultados`.
+
+        Returns:
+            type: None.
+
+        """
+        if self.PATH is None or not resultados:
+            return
+        with self._conecta() as conexao:
+            conexao.executemany('INSERT OR REPLACE INTO doi VALUES (?, ?)',
+                                [(doi, json.dumps(resultado))
+                                 for doi, resultado in resultados.items()])
+        return
+
+    def _sessao(self):
+        if requests is None:
+            return None
+        sessao = getattr(self.__locais, 'sessao', None)
+        if sessao is None:
+            sessao = requests.Session()
+            adaptador = requests.adapters.HTTPAdapter(pool_connections=1,
+                                                      pool_maxsize=1)
+            sessao.mount('http://', adaptador)
+            sessao.mount('https://', adaptador)
+            sessao.headers['User-Agent'] = self.agente
+            self.__locais.sessao = sessao
+        return sessao
+
+    def _requisita(self, url):
+        """GET síncrono, executado nas threads do resolvedor.
+
+        Args:
+            url (type): URL completa `url`.
+
+        Returns:
+            type: Tupla (status, corpo em bytes, Retry-After ou None).
+
+        """
+        sessao = self._sessao()
+        if sessao is not None:
+            resposta = sessao.get(url, timeout=self.timeout)
+            return (resposta.status_code, resposta.content,
+                    resposta.headers.get('Retry-After'))
+        requisicao = urllib.request.Request(
+            url, headers={'User-Agent': self.agente})
+        try:
+            with urllib.request.urlopen(requisicao,
+                                        timeout=self.timeout) as resposta:
+                return resposta.status, resposta.read(), None
+        except urllib.error.HTTPError as error:
+            return error.code, b'', error.headers.get('Retry-After')
+
+    def tentativa(self, doi):
+        """Uma única consulta do DOI, sem esperas.
+
+        Args:
+            doi (type): DOI normalizado `doi`.
+
+        Returns:
+            type: Tupla (resultado, definitivo, Retry-After). resultado None
+                pede nova tentativa; senão é a lista de ISSN, 'NAO_ENCONTRADO',
+                'INVALIDO' ou 'ERRO', e só resultados definitivos vão para o
+                cache.
+
+        """
+        url = self.endpoint + urllib.parse.quote(doi, safe='/')
+        try:
+            status, corpo, repete = self._requisita(url)
+        except (OSError, ValueError) as error:
+            return None, False, None
+        if status == 200:
+            try:
+                ISSN = json.loads(corpo.decode('utf-8'))['message'].get('ISSN')
+            except (ValueError, KeyError, AttributeError) as error:
+                return 'ERRO', False, None
+            return (ISSN if ISSN else 'NAO_ENCONTRADO'), True, None
+        if status in STATUS_REPETE:
+            return None, False, repete
+        if status in STATUS_INVALIDO:
+            return 'INVALIDO', True, None
+        #----403 e outros 4xx: sem resultado agora, consultado de novo na
+        #    próxima execução
+        return 'ERRO', False, None
+
+    def intervalo(self, tentativa, repete=None):
+        """Espera antes da próxima tentativa: Retry-After em segundos quando o
+        servidor informa, senão espera exponencial com ruído; sempre limitada a
+        esperaMaxima.
+
+        Args:
+            tentativa (type): Número da tentativa que falhou, a partir de 0
+                `tentativa`.
+            repete (type): Valor do cabeçalho Retry-After `repete`. Defaults to
+                None.
+
+        Returns:
+            type: Segundos.
+
+        """
+        try:
+            espera = max(float(repete), 0.)
+        except (TypeError, ValueError) as error:
+            espera = (self.espera * 2**tentativa
+                      + random.uniform(0, self.espera))
+        return min(espera, self.esperaMaxima)
+
+    async def resolveAsync(self, dois):
+        """Resolve uma lista de DOIs. Repetidos e já presentes no cache não são
+        consultados. Cada tentativa ocupa uma das `concorrencia` vagas; a
+        espera até a próxima é feita fora da vaga.
+
+        Args:
+            dois (type): Lista de DOIs `dois`.
+
+        Returns:
+            type: Lista de resultados na mesma ordem, ver tentativa.
+
+        """
+        normalizados = [self.normalizaDOI(doi) for doi in dois]
+        unicos = [doi for doi in OrderedDict.fromkeys(normalizados) if doi]
+        resultados = self.leCache(unicos)
+        faltantes = [doi for doi in unicos if doi not in resultados]
+        if faltantes:
+            loop = asyncio.get_running_loop()
+            semaforo = asyncio.Semaphore(self.concorrencia)
+            novos = {}
+            with ThreadPoolExecutor(max_workers=self.concorrencia) as executor:
+                async def resolveUm(doi):
+                    resultado, definitivo = 'ERRO', False
+                    for tentativa in range(self.tentativas):
+                        async with semaforo:
+                            obtido, definitivo, repete = \
+                                await loop.run_in_executor(
+                                    executor, self.tentativa, doi)
+                        if obtido is not None:
+                            resultado = obtido
+                            break
+                        if tentativa + 1 < self.tentativas:
+                            await asyncio.sleep(self.intervalo(tentativa,
+                                                               repete))
+                    resultados[doi] = resultado
+                    if definitivo:
+                        novos[doi] = resultado
+                await asyncio.gather(*(resolveUm(doi) for doi in faltantes))
+            self.gravaCache(novos)
+        return [resultados.get(doi, 'INVALIDO') for doi in normalizados]
+
+    def resolve(self, dois):
+        """Versão síncrona de resolveAsync. Dentro de um loop já em execução,
+        como no Jupyter, roda em outra thread.
+
+        Args:
+            dois (type): Lista de DOIs `dois`.
+
+        Returns:
+            type: Lista de resultados na mesma ordem.
+
+        """
+        dois = list(dois)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.resolveAsync(dois))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run,
+                                   self.resolveAsync(dois)).result()
+
+#----------------------------------------------------------------------------
+#----Índice QUALIS
+#----------------------------------------------------------------------------
+def normalizaArea(area):
+    """Forma canônica de nomes de área: sem acentos, sem espaços nas pontas,
+    maiúsculas.
 
     Args:
-        PATH (type): Caminho para arquivos XML de Curriculos Lattes `PATH`. Defaults to "../../data/raw/CVs".
+        area (type): Nome da área `area`.
 
     Returns:
-        type: Lista com o nome dos arquivos em path absoluto.
+        type: str.
 
     """
-    path = pathHandler(PATH)
-    maskCV = str(path) + "/*.xml"
-    try:
-        files = glob(maskCV)
-    except OsError as error:
-        #LOG.error("readFolder: %s", error)
-        sys.exit(error)
-    n = len(files)
-    #LOG.info("readFolder: %s Arquivos XML lidos", n)
-    return files
+    return unidecode(str(area)).strip().upper()
 
-def makeDBnomes(PATH, save_to_disk = False):
-    """Lê todos os XML indicados no caminho e extrai informações mínimas. Nome do Arquivo, CPF, ID_CNself e NOME. Se arquivo não tiver informações corretas, produz outro dataframe.
+def normalizaISSN(codigo):
+    """ISSN só com dígitos e X, para comparar '0031-9007', '00319007' e a saída
+    de validaCodigo.
 
     Args:
-        PATH (type): caminho (pode usar glob) `PATH`.
-        save_to_disk (type): Grava ou não o resultado na pasta /data/external/ `save_to_disk`. Defaults to False.
+        codigo (type): ISSN `codigo`.
 
     Returns:
-        type:Um dataframe com sucessos e um dataframe com fracassos.
+        type: str, vazio se não for texto ou for INVALIDO.
 
     """
-    #----Le todas as pastas e subpastas indicadas para busca de XML
-    files = readFolder(PATH)
-    nomes = []
-    problemas = []
+    if not isinstance(codigo, str) or codigo == 'INVALIDO':
+        return ''
+    return codigo.replace('-', '').strip().upper()
 
-    for file in files:
-        NOME = []
-        CPF = []
-        ID = []
-        try:
-            #----XML funciona?
-            tree = etree.parse(file)
-        except etree.XMLSyntaxError:
-            #LOG.error("XML inválido: %s", file)
-            problemas.append([file, ID, CPF, NOME])
-        except (ParserError, ParseError) as error:
-            #LOG.error("XML inválido: %s", file)
-            problemas.append([file, ID, CPF, NOME])
+class IndiceQualis:
+    """Índice (área CAPES, ISSN) -> melhor estrato QUALIS, construído uma vez a
+    partir da planilha e gravado em Parquet (pickle sem pyarrow). Substitui o
+    filtro da tabela inteira a cada produção feito por setQualis.
+
+    Args:
+        tabela (type): Dataframe com AREA, ISSN e RANKING normalizados, uma
+            linha por par (AREA, ISSN) `tabela`.
+
+    """
+    def __init__(self, tabela):
+        self.tabela = tabela.reset_index(drop=True)
+        self.__mapa = None
+
+    @staticmethod
+    def constroi(PATH="../data/Qualis_2013-2016.zip", area='area', issn='issn',
+                 ranking='ranking'):
+        """Lê a planilha QUALIS e fica com o melhor estrato de cada par (área,
+        ISSN). Melhor é o menor em ordem alfabética: A1 < A2 < B1.
+
+        Args:
+            PATH (type): Planilha QUALIS, CSV ou CSV compactado `PATH`.
+                Defaults to "../data/Qualis_2013-2016.zip".
+            area (type): Coluna de área `area`. Defaults to 'area'.
+            issn (type): Coluna de ISSN `issn`. Defaults to 'issn'.
+            ranking (type): Coluna do estrato `ranking`. Defaults to 'ranking'.
+
+        Returns:
+            type: Dataframe AREA, ISSN, RANKING.
+
+        """
+        #----encoding do CNPq precisa evoluir
+        df = pd.read_csv(pathHandler(PATH), encoding="ISO-8859-1",
+                         index_col=0).reset_index()
+        #----Coluna de areas tem muitos whitespaces escondidos. Normaliza uma
+        #    vez por valor distinto.
+        areas = df[area].astype(str)
+        unicas = pd.unique(areas)
+        areas = areas.map(dict(zip(unicas, map(normalizaArea, unicas))))
+        tabela = pd.DataFrame({'AREA': areas,
+                               'ISSN': df[issn].map(normalizaISSN),
+                               'RANKING': df[ranking].astype(str).str.strip()})
+        tabela = tabela[(tabela['ISSN'] != '') & (tabela['RANKING'] != '')]
+        #----sort + drop_duplicates: groupby().min() em texto cai no caminho
+        #    Python do pandas
+        tabela = tabela.sort_values('RANKING', kind='mergesort')
+        tabela = tabela.drop_duplicates(['AREA', 'ISSN'])
+        tabela = tabela.reset_index(drop=True)
+        tabela['AREA'] = tabela['AREA'].astype('category')
+        return tabela
+
+    @classmethod
+    def carrega(cls, PATH="../data/Qualis_2013-2016.zip",
+                indice="../../data/interim/qualis.parquet"):
+        """Índice compartilhado pelo processo. O arquivo binário é refeito
+        quando a planilha é mais nova que ele.
+
+        Args:
+            PATH (type): Planilha QUALIS `PATH`. Defaults to
+                "../data/Qualis_2013-2016.zip".
+            indice (type): Arquivo do índice; sem pyarrow a extensão vira .pkl
+                `indice`. Defaults to "../../data/interim/qualis.parquet".
+
+        Returns:
+            type: IndiceQualis.
+
+        """
+        path = pathHandler(PATH)
+        chave = ('qualis', path, os.path.getmtime(path))
+        if chave in _REFERENCIAS:
+            return _REFERENCIAS[chave]
+        destino = pathHandler(indice)
+        if pyarrow is None:
+            destino = os.path.splitext(destino)[0] + '.pkl'
+        if (isfile(destino)
+                and os.path.getmtime(destino) >= os.path.getmtime(path)):
+            if pyarrow is not None:
+                tabela = pd.read_parquet(destino)
+            else:
+                tabela = pd.read_pickle(destino)
         else:
-            root = tree.getroot()
-            try:
-                CPF = root.find('DADOS-GERAIS').attrib['CPF']
-            except (KeyError, AttributeError) as error:
-                CPF = np.nan
-            try:
-                NOME = root.find('DADOS-GERAIS').attrib['NOME-COMPLETO']
-            except (KeyError, AttributeError) as error:
-                NOME = np.nan
-            try:
-                ID = root.attrib['NUMERO-IDENTIFICADOR']
-            except (KeyError, AttributeError) as error:
-                #LOG.error("XML inválido: %s", file)
-                problemas.append([file, ID, CPF, NOME])
-                ID = np.nan
-            nomes.append([file, ID, CPF, NOME])
+            tabela = cls.constroi(path)
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            temporario = destino + '.%d.tmp' % os.getpid()
+            if pyarrow is not None:
+                tabela.to_parquet(temporario)
+            else:
+                tabela.to_pickle(temporario)
+            os.replace(temporario, destino)
+        _REFERENCIAS[chave] = cls(tabela)
+        return _REFERENCIAS[chave]
 
-    if len(nomes) != 0:
-        df = pd.DataFrame(nomes)
-        df.columns = ['FILE','ID', 'CPF','NOME']
-        if len(problemas) !=0:
-            dfProblema = pd.DataFrame(problemas)
-            dfProblema.columns = ['FILE','ID', 'CPF','NOME']
+    @property
+    def mapa(self):
+        """Dicionário (AREA, ISSN) -> RANKING para consultas avulsas, criado na
+        primeira consulta.
+
+        Returns:
+            type: dict.
+
+        """
+        if self.__mapa is None:
+            self.__mapa = dict(zip(zip(self.tabela['AREA'].astype(str),
+                                       self.tabela['ISSN']),
+                                   self.tabela['RANKING']))
+        return self.__mapa
+
+    def ranking(self, areas, codigo):
+        """Melhor estrato de um ISSN entre várias áreas, como setQualis.
+
+        Args:
+            areas (type): Lista de áreas CAPES `areas`.
+            codigo (type): ISSN `codigo`.
+
+        Returns:
+            type: Estrato ou ''.
+
+        """
+        codigo = normalizaISSN(codigo)
+        estratos = [self.mapa.get((normalizaArea(area), codigo))
+                    for area in areas]
+        estratos = [estrato for estrato in estratos if estrato is not None]
+        return min(estratos) if estratos else ''
+
+    def atribui(self, df, areas, coluna='ISSN-ISBN', chave='ID'):
+        """Coluna QUALIS de uma tabela de produções com um único join.
+
+        Args:
+            df (type): Produções de um ou vários pesquisadores `df`.
+            areas (type): Lista de áreas CAPES, igual para todas as linhas, ou
+                dataframe com `chave` e AREA, uma linha por área de cada
+                pesquisador `areas`.
+            coluna (type): Coluna de ISSN `coluna`. Defaults to 'ISSN-ISBN'.
+            chave (type): Coluna que identifica o pesquisador quando areas é um
+                dataframe `chave`. Defaults to 'ID'.
+
+        Returns:
+            type: Series QUALIS com o índice de df, '' quando não há estrato.
+
+        """
+        producoes = pd.DataFrame(
+            {'ISSN': df[coluna].map(normalizaISSN).values})
+        tabela = self.tabela.assign(AREA=self.tabela['AREA'].astype(str))
+        if isinstance(areas, pd.DataFrame):
+            pares = pd.DataFrame(
+                {chave: areas[chave].values,
+                 'AREA': areas['AREA'].map(normalizaArea).values})
+            melhores = pares.merge(tabela, on='AREA')
+            melhores = melhores.sort_values('RANKING', kind='mergesort')
+            melhores = melhores.drop_duplicates([chave, 'ISSN'])
+            producoes[chave] = df[chave].values
+            resultado = producoes.merge(melhores[[chave, 'ISSN', 'RANKING']],
+                                        on=[chave, 'ISSN'], how='left')
         else:
-            df = pd.DataFrame()
-        #----Apenas nome do arquivo dentro do pacote
-        df['FILE']= df['FILE'].apply( lambda val: '../../' + '/'.join(val.split('/')[-5:]))
-        #----Nome completo, tudo em maíusculas e sem acentos, normalizado para comparações.
-        dfRuim = df[ ( (df['NOME'].isna()) | (df['CPF'].isna()) | (df['ID'].isna()) )]
-        dfRuim = pd.concat([dfRuim, dfProblema], axis = 0)
-        df = df.dropna()
-        df = df.groupby(['NOME']).first().reset_index()
-        df['NOME']=df['NOME'].apply(lambda val: unidecode(val.upper()))
-        #----Salva arquivo XLSX
-        if save_to_disk:
-            PATH = pathHandler('../../data/external/DBnomes.xlsx')
-            PATHRuim = pathHandler('../../data/external/XMLruim.xlsx')
-            df.to_excel(PATH, index=False)
-            dfRuim.to_excel(PATHRuim, index=False)
+            areas = set(normalizaArea(area) for area in areas)
+            melhores = tabela[tabela['AREA'].isin(areas)]
+            melhores = melhores.sort_values('RANKING', kind='mergesort')
+            melhores = melhores.drop_duplicates('ISSN')
+            resultado = producoes.merge(melhores[['ISSN', 'RANKING']],
+                                        on='ISSN', how='left')
+        return pd.Series(resultado['RANKING'].fillna('').values,
+                         index=df.index, name='QUALIS')
 
-    return df, dfRuim
+def equivalenciaCAPES(PATH="../data/TABELA_EQUIVALENCIA_CNPQ_CAPES.csv"):
+    """Tabela de equivalência CNPq -> CAPES normalizada uma vez por processo em
+    um dicionário.
+
+    Args:
+        PATH (type): Caminho da tabela com AREA_CNPQ e AREA_CAPES `PATH`.
+            Defaults to "../data/TABELA_EQUIVALENCIA_CNPQ_CAPES.csv".
+
+    Returns:
+        type: Dicionário {área CNPq normalizada: (áreas CAPES normalizadas)}.
+
+    """
+    path = pathHandler(PATH)
+    chave = ('capes', path, os.path.getmtime(path))
+    if chave not in _REFERENCIAS:
+        equivalencia = OrderedDict()
+        tabela = pd.read_csv(path, dtype=str)
+        tabela = tabela.dropna(subset=['AREA_CNPQ', 'AREA_CAPES'])
+        for cnpq, capes in zip(tabela['AREA_CNPQ'], tabela['AREA_CAPES']):
+            equivalencia.setdefault(normalizaArea(cnpq),
+                                    OrderedDict())[normalizaArea(capes)] = None
+        _REFERENCIAS[chave] = {cnpq: tuple(capes)
+                               for cnpq, capes in equivalencia.items()}
+    return _REFERENCIAS[chave]
+
+def areasCAPES(AREAS, equivalencia):
+    """Áreas CAPES equivalentes a uma lista de áreas CNPq, sem repetições e na
+    ordem das áreas CNPq.
+
+    Args:
+        AREAS (type): Áreas do CNPq `AREAS`.
+        equivalencia (type): Dicionário de equivalenciaCAPES `equivalencia`.
+
+    Returns:
+        type: Lista de áreas CAPES.
+
+    """
+    capes = OrderedDict()
+    for area in AREAS or []:
+        for equivalente in equivalencia.get(normalizaArea(area), ()):
+            capes[equivalente] = None
+    return list(capes)
+
+def areasCAPESCorpus(AREAS, PATH="../data/TABELA_EQUIVALENCIA_CNPQ_CAPES.csv",
+                     chave='ID'):
+    """Mapeia as áreas de todos os pesquisadores de uma vez. O resultado serve
+    direto para IndiceQualis.atribui.
+
+    Args:
+        AREAS (type): Dicionário {ID: [áreas CNPq]} ou dataframe com `chave` e
+            AREA, uma linha por área `AREAS`.
+        PATH (type): Caminho da tabela de equivalência `PATH`. Defaults to
+            "../data/TABELA_EQUIVALENCIA_CNPQ_CAPES.csv".
+        chave (type): Coluna que identifica o pesquisador `chave`. Defaults to
+            'ID'.
+
+    Returns:
+        type: Dataframe com `chave` e AREA (CAPES), uma linha por área.
+
+    """
+    equivalencia = equivalenciaCAPES(PATH)
+    if isinstance(AREAS, pd.DataFrame):
+        agrupado = OrderedDict()
+        for ID, area in zip(AREAS[chave], AREAS['AREA']):
+            agrupado.setdefault(ID, []).append(area)
+        AREAS = agrupado
+    linhas = [(ID, area) for ID, areas in AREAS.items()
+              for area in areasCAPES(areas, equivalencia)]
+    return pd.DataFrame(linhas, columns=[chave, 'AREA'])
+
+#----------------------------------------------------------------------------
+#------------------------- Acervo de produções ------------------------------
+#----------------------------------------------------------------------------
+#----Seções gravadas no acervo: nome -> (getter do Pesquisador, esquema)
+SECOES_ACERVO = OrderedDict([
+    ('bibliografica', ('getProducaoBibliografica', 'PRODUCAO-BIBLIOGRAFICA')),
+    ('tecnica', ('getProducaoTecnica', 'TIPOS-PRODUCAO-TECNICA')),
+    ('apresentacoes', ('getApresentacoes', 'PRODUCAO-TECNICA')),
+    ('outra', ('getProducaoOutra', 'OUTRA-PRODUCAO')),
+    ('complementares', ('getDadosComplementares', 'DADOS-COMPLEMENTARES')),
+])
+
+class AcervoProducao:
+    """Acervo colunar com as produções de todos os currículos. Cada seção é um
+    dataset Parquet particionado por ANO (pastas ANO=2019) com um arquivo por
+    pesquisador (NUMERO-IDENTIFICADOR.parquet), o que permite regravar um
+    currículo sem tocar nos demais. Sem pyarrow o mesmo leiaute é gravado em
+    pickle.
+
+    Args:
+        PATH (type): Pasta do acervo `PATH`. Defaults to
+            "../../data/processed/acervo".
+
+    """
+    #----Partição das produções sem ano
+    SEM_ANO = 'VAZIO'
+
+    def __init__(self, PATH="../../data/processed/acervo"):
+        self.PATH = pathHandler(PATH)
+        self.formato = 'parquet' if pyarrow is not None else 'pickle'
+
+    @staticmethod
+    def colunas(secao):
+        """Colunas gravadas de uma seção: ID e as colunas finais do esquema,
+        sem ANO, que fica no nome da partição.
+
+        Args:
+            secao (type): Nome da seção, chave de SECOES_ACERVO `secao`.
+
+        Returns:
+            type: Lista de colunas.
+
+        """
+        esquema = ESQUEMAS[SECOES_ACERVO[secao][1]]
+        colunas = [col for col in esquema['cols_final']
+                   if col not in ('ID', 'ANO')]
+        return list(OrderedDict.fromkeys(['ID'] + colunas))
+
+    def schema(self, secao):
+        """Schema Arrow da seção, todas as colunas como texto, incluindo a
+        partição ANO.
+
+        Args:
+            secao (type): Nome da seção `secao`.
+
+        Returns:
+            type: pyarrow.Schema.
+
+        """
+        return pyarrow.schema([(col, pyarrow.string())
+                               for col in self.colunas(secao) + ['ANO']])
+
+    def particoes(self, secao, periodo=None):
+        """Lista as partições de ano de uma seção, apenas as do período quando
+        informado.
+
+        Args:
+            secao (type): Nome da seção `secao`.
+            periodo (type): Lista de anos. None lista todas `periodo`. Defaults
+                to None.
+
+        Returns:
+            type: Lista de tuplas (ano, pasta).
+
+        """
+        pasta = join(self.PATH, secao)
+        if not isdir(pasta):
+            return []
+        anos = None if periodo is None else set(str(ano) for ano in periodo)
+        result = []
+        for entrada in os.scandir(pasta):
+            if entrada.is_dir() and entrada.name.startswith('ANO='):
+                ano = entrada.name[4:]
+                if anos is None or ano in anos:
+                    result.append((ano, entrada.path))
+        return sorted(result)
+
+    def remove(self, secao, ID):
+        """Remove todos os registros de um pesquisador em uma seção.
+
+        Args:
+            secao (type): Nome da seção `secao`.
+            ID (type): NUMERO-IDENTIFICADOR `ID`.
+
+        Returns:
+            type: None.
+
+        """
+        for ano, pasta in self.particoes(secao):
+            for extensao in ('.parquet', '.pkl'):
+                try:
+                    os.remove(join(pasta, ID + extensao))
+                except FileNotFoundError:
+                    pass
+        return
+
+    def grava(self, secao, ID, df):
+        """Grava as produções de um pesquisador em uma seção, substituindo as
+        que já estavam no acervo.
+
+        Args:
+            secao (type): Nome da seção `secao`.
+            ID (type): NUMERO-IDENTIFICADOR `ID`.
+            df (type): Dataframe retornado pelo getter da seção, ou None `df`.
+
+        Returns:
+            type: Número de registros gravados.
+
+        """
+        self.remove(secao, ID)
+        if df is None or df.empty:
+            return 0
+        colunas = self.colunas(secao)
+        df = df.reindex(columns=colunas + ['ANO'])
+        df['ID'] = ID
+        anos = df['ANO'].fillna('').astype(str).replace({'': self.SEM_ANO})
+        for ano, parte in df[colunas].groupby(anos.values, sort=False):
+            pasta = join(self.PATH, secao, 'ANO=%s' % ano)
+            os.makedirs(pasta, exist_ok=True)
+            nome = ID + ('.parquet' if self.formato == 'parquet' else '.pkl')
+            #----Prefixo '.' esconde o temporário da leitura do dataset
+            temporario = join(pasta, '.%s.%d.tmp' % (nome, os.getpid()))
+            parte = parte.astype(str).where(parte.notna(),
+                                            None).reset_index(drop=True)
+            if self.formato == 'parquet':
+                schema = pyarrow.schema([(col, pyarrow.string())
+                                         for col in colunas])
+                tabela = pyarrow.Table.from_pandas(parte, schema=schema,
+                                                   preserve_index=False)
+                pyarrow.parquet.write_table(tabela, temporario)
+            else:
+                parte.to_pickle(temporario)
+            os.replace(temporario, join(pasta, nome))
+        return len(df)
+
+    def gravaPesquisador(self, pesquisador):
+        """Grava todas as seções de um pesquisador. getDadosBasicos já deve ter
+        sido chamado.
+
+        Args:
+            pesquisador (type): Instância de Pesquisador `pesquisador`.
+
+        Returns:
+            type: Dicionário seção -> número de registros gravados.
+
+        """
+        return {secao: self.grava(secao, pesquisador.ID,
+                                  getattr(pesquisador, getter)())
+                for secao, (getter, esquema) in SECOES_ACERVO.items()}
+
+    def carrega(self, secao, periodo=None, IDs=None, colunas=None):
+        """Lê uma seção do acervo. O filtro de período é aplicado nas
+        partições, então só os anos pedidos são lidos do disco.
+
+        Args:
+            secao (type): Nome da seção `secao`.
+            periodo (type): Lista de anos. None lê todos `periodo`. Defaults to
+                None.
+            IDs (type): Lista de NUMERO-IDENTIFICADOR. None lê todos `IDs`.
+                Defaults to None.
+            colunas (type): Colunas a ler. None lê todas `colunas`. Defaults to
+                None.
+
+        Returns:
+            type: Dataframe com as colunas da seção e ANO.
+
+        """
+        todas = self.colunas(secao) + ['ANO']
+        colunas = todas if colunas is None else list(colunas)
+        if not self.particoes(secao, periodo):
+            return pd.DataFrame(columns=colunas)
+        if self.formato == 'parquet':
+            schema = self.schema(secao)
+            particoes = pyarrow.dataset.partitioning(
+                pyarrow.schema([('ANO', pyarrow.string())]), flavor='hive')
+            dataset = pyarrow.dataset.dataset(join(self.PATH, secao),
+                                              format='parquet', schema=schema,
+                                              partitioning=particoes)
+            filtro = None
+            if periodo is not None:
+                filtro = pyarrow.dataset.field('ANO').isin(
+                    [str(ano) for ano in periodo])
+            if IDs is not None:
+                porID = pyarrow.dataset.field('ID').isin(list(IDs))
+                filtro = porID if filtro is None else filtro & porID
+            return dataset.to_table(columns=colunas, filter=filtro).to_pandas()
+        partes = []
+        IDs = None if IDs is None else set(IDs)
+        for ano, pasta in self.particoes(secao, periodo):
+            for entrada in os.scandir(pasta):
+                if not entrada.name.endswith('.pkl'):
+                    continue
+                if IDs is not None and entrada.name[:-4] not in IDs:
+                    continue
+                partes.append(pd.read_pickle(entrada.path).assign(ANO=ano))
+        if not partes:
+            return pd.DataFrame(columns=colunas)
+        return pd.concat(partes, ignore_index=True)[colunas]
+
+#----------------------------------------------------------------------------
+#------------------------- Pontuação ----------------------------------------
+#----------------------------------------------------------------------------
+COLUNAS_PONTOS = ['LATTES', 'PRODUCAO','NATUREZA','flag_Nacional',
+                  'SEQUENCIA-PRODUCAO','PONTOS','MAX']
+
+def pontuaProducao(dfProducao, Pontos, chave='ID'):
+    """Pontua as produções de vários pesquisadores de uma vez: um único merge
+    com a tabela de pontos e um único groupby para todo o corpus.
+
+    Args:
+        dfProducao (type): Resumo das produções (PRODUCAO, NATUREZA, TIPO,
+            SEQUENCIA-PRODUCAO, PAIS) concatenado, com a coluna `chave`
+            `dfProducao`.
+        Pontos (type): Tabela de pontuação (pathPontos) `Pontos`.
+        chave (type): Coluna que identifica o pesquisador `chave`. Defaults to
+            'ID'.
+
+    Returns:
+        type: Tupla (dfPontos, dfSum, nota_Producao). nota_Producao é uma
+            Series indexada pela chave.
+
+    """
+    df = dfProducao.replace({'':'VAZIO'})
+    #----PAIS vazio já virou 'VAZIO' e conta como Internacional, como na versão
+    #    por currículo
+    pais = df['PAIS'].astype(str)
+    df['flag_Nacional'] = np.where(pais=='Brasil', 'Nacional',
+                                   np.where(pais.str.len()!=0, 'Internacional',
+                                            'VAZIO'))
+    dfPontos = df.merge(Pontos, on = ['PRODUCAO','NATUREZA','flag_Nacional'],
+                        how = 'left')
+    dfPontos = dfPontos.dropna(axis = 0)
+    dfPontos = dfPontos[[chave] + COLUNAS_PONTOS]
+    dfSum = dfPontos.groupby([chave, 'LATTES', 'PRODUCAO','NATUREZA',
+                              'flag_Nacional'])
+    dfSum = dfSum.agg({'SEQUENCIA-PRODUCAO':'nunique', 'PONTOS':'max',
+                       'MAX':'max'}).reset_index()
+    pontos = dfSum['SEQUENCIA-PRODUCAO']*dfSum['PONTOS']
+    dfSum['Pontuacao'] = np.where(((pontos <= dfSum['MAX'])
+                                   & (dfSum['MAX']!=0)),
+                                  pontos, dfSum['MAX'])
+    nota_Producao = dfSum.groupby(chave)['Pontuacao'].sum()
+    return dfPontos, dfSum, nota_Producao
+
+def pontuaDoutorado(dfTitulacao, chave='ID'):
+    """Ano de conclusão do doutorado de cada pesquisador.
+
+    Args:
+        dfTitulacao (type): Titulações concatenadas com a coluna `chave`
+            `dfTitulacao`.
+        chave (type): Coluna que identifica o pesquisador `chave`. Defaults to
+            'ID'.
+
+    Returns:
+        type: Series indexada pela chave com o ano de conclusão mais recente.
+
+    """
+    doutorado = dfTitulacao[dfTitulacao['TITULACAO']=='DOUTORADO']
+    anos = pd.to_numeric(doutorado['ANO-DE-CONCLUSAO'], errors='coerce')
+    return anos.groupby(doutorado[chave]).max().dropna()
+
+def pontuaSAAP(CPFs, SAAP=None):
+    """Pontos SAAP de uma lista de CPFs: 0.25 por avaliação, no mínimo 2 para
+    quem está na planilha.
+
+    Args:
+        CPFs (type): Series de CPFs, comparados com normalizaCPF `CPFs`.
+        SAAP (type): Planilha SAAP (pathSAAP). None pontua zero para todos
+            `SAAP`. Defaults to None.
+
+    Returns:
+        type: Series alinhada com CPFs.
+
+    """
+    if SAAP is None:
+        return pd.Series(0, index=CPFs.index)
+    #----CPFs comparados na forma canônica (planilhas perdem zeros e
+    #    pontuação); CPF repetido fica com a maior pontuação
+    CPFsSAAP = SAAP['CPF_NUMERO'].map(normalizaCPF)
+    pontos = (SAAP['AVALIACOES']*0.25).groupby(CPFsSAAP).max().clip(lower=2)
+    #----Linha sem CPF na planilha não pontua currículos sem CPF
+    pontos = pontos.drop('', errors='ignore')
+    return CPFs.map(normalizaCPF).map(pontos).fillna(0)
+
+#----Ano de referência do bônus de doutorado sem período, como no edital de
+#    2020
+ANO_REFERENCIA = 2020
+
+def anoReferencia(periodo=None, ano=None):
+    """Ano de referência do bônus de doutorado recente: `ano` se informado,
+    senão o último ano do período.
+
+    Args:
+        periodo (type): Anos da avaliação `periodo`. Defaults to None.
+        ano (type): Ano explícito `ano`. Defaults to None.
+
+    Returns:
+        type: int; ANO_REFERENCIA sem período e sem ano.
+
+    """
+    if ano is not None:
+        return int(ano)
+    if periodo:
+        return max(int(valor) for valor in periodo)
+    return ANO_REFERENCIA
+
+@cronometrado()
+def pontuaCorpus(dfCVP, dfProducao, dfTitulacao, Pontos, SAAP=None, chave='ID',
+                 ano=ANO_REFERENCIA):
+    """Calcula a nota de vários pesquisadores de uma vez. Os valores são os
+    mesmos de doSumarioUFCG chamado currículo a currículo quando cada valor de
+    `chave` identifica um único currículo; com a mesma chave em dois arquivos
+    as produções seriam somadas, por isso scoreCorpus usa a posição do arquivo.
+
+    Args:
+        dfCVP (type): Uma linha por pesquisador com chave, NOME, CPF, CPF_SAAP,
+            ID_proj, EDITAL e AREA `dfCVP`.
+        dfProducao (type): Resumo das produções de todos os pesquisadores
+            `dfProducao`.
+        dfTitulacao (type): Titulações de todos os pesquisadores `dfTitulacao`.
+        Pontos (type): Tabela de pontuação `Pontos`.
+        SAAP (type): Planilha SAAP `SAAP`. Defaults to None.
+        chave (type): Coluna que identifica cada currículo `chave`. Defaults to
+            'ID'.
+        ano (type): Ano de referência para o bônus de doutorado recente, ver
+            anoReferencia `ano`. Defaults to ANO_REFERENCIA.
+
+    Returns:
+        type: Tupla (dfCVP com PRODUCAO, DOUTOR, SAAP e NOTA, dfPontos, dfSum).
+
+    """
+    dfPontos, dfSum, nota_Producao = pontuaProducao(dfProducao, Pontos, chave)
+    chaves = dfCVP[chave]
+    producao = chaves.map(nota_Producao).fillna(0.0)
+    anos = pontuaDoutorado(dfTitulacao, chave)
+    #----int quando há doutorado, 0.0 quando não há: mesmos tipos da versão por
+    #    currículo
+    doutor = [int(anos[k]) if k in anos.index else 0.0 for k in chaves]
+    ano_doutor = np.array(doutor, dtype=float)
+    NOTA_Doutorado = np.where((ano-ano_doutor)<=5, 12,
+                              np.where(ano_doutor!=0, 8, 0))
+    n_saap = pontuaSAAP(dfCVP['CPF'], SAAP)
+    dfCVP = dfCVP.assign(PRODUCAO=producao.values, DOUTOR=doutor,
+                         SAAP=n_saap.values)
+    dfCVP['NOTA'] = dfCVP['SAAP'] + NOTA_Doutorado + dfCVP['PRODUCAO']
+    return dfCVP, dfPontos, dfSum
 
 #----------------------------------------------------------------------------
 #------------------------- CLASSE cvPesquisador------------------------------
@@ -192,7 +2992,8 @@ class Pesquisador:
     Args:
         file (type): Caminho do arquivo do XML do Lattes `file`. Defaults to None.
         nome (type): Caminho do nome do pesquisador. Apenas `nome` ou `file` deve ser utilizado. `nome`. Defaults to None.
-        periodo (type): Período para avaliação dos currículos `periodo`. Defaults to None.
+        periodo (type): Período para avaliação dos currículos; None aceita
+            todos os anos, ver filtraPeriodo `periodo`. Defaults to None.
         **kwargs (type): Caminhos de arquivos adicionais, informações sobre o número de colunas adicionais, conforme documentação mais detalhada. `**kwargs`.
 
     Attributes:
@@ -202,6 +3003,14 @@ class Pesquisador:
         __UFCG (type): Flag booleano controla se serão utilizados os dados da UFCG sobre lotação e SIAPE `__UFCG`. É definido se for fornecido o caminho para o arquivo.
         __SAAP (type): Flag booleano controla se serão utilizados os dados do SAAP É definido se for fornecido o caminho para o arquivo. `__SAAP`.
         __PONTUA (type): Flag booleano controla se serão pontuados os currículos. É definido se for fornecido o caminho para o arquivo. `__PONTUA`.
+        kwargs['nomeAproximado'] (type): Se o nome não for encontrado em
+        DBnomes, getFileFromNome usa o nome mais parecido.
+        kwargs['ano'] (type): Ano de referência do bônus de doutorado em
+        doSumarioUFCG; sem ele vale o último ano do período, ver anoReferencia.
+        cache (type): CacheCV usado por getDadosBasicos e pelos getters de
+            seção; com todas as seções no cache o XML não é lido. Definido por
+            kwargs['cache'], que aceita um CacheCV, um caminho ou True para o
+            cache padrão `cache`.
         kwargs (type): Description of parameter `kwargs`.
 
     """
@@ -216,6 +3025,15 @@ class Pesquisador:
         self.__PONTUA = True
         self.__FLAG = True
         self.kwargs = kwargs
+        cache = kwargs.get('cache')
+        if cache is True:
+            cache = CacheCV()
+        elif isinstance(cache, str):
+            cache = CacheCV(cache)
+        self.cache = cache or None
+        self.memo = {}
+        self.secoes = None
+        self.__paths = None
         pass
 
     #----Setters e Getters via @property
@@ -234,6 +3052,7 @@ class Pesquisador:
     @file.setter
     def file(self, value):
         self.__file = value
+        self.limpaMemo()
 
     @property
     def periodo(self):
@@ -242,6 +3061,51 @@ class Pesquisador:
     @periodo.setter
     def periodo(self, value):
         self.__periodo = value
+        self.limpaMemo(porPeriodo=True)
+
+    #----Seções calculadas na primeira leitura
+    areas = _SecaoPreguicosa('getArea', porPeriodo=False)
+    pessoais = _SecaoPreguicosa('getDadosPessoais', porPeriodo=False)
+    titulacao = _SecaoPreguicosa('getDadosTitulacao', porPeriodo=False)
+    bibliografica = _SecaoPreguicosa('getProducaoBibliografica')
+    tecnica = _SecaoPreguicosa('getProducaoTecnica')
+    apresentacoes = _SecaoPreguicosa('getApresentacoes')
+    outra = _SecaoPreguicosa('getProducaoOutra')
+    complementares = _SecaoPreguicosa('getDadosComplementares')
+
+    @property
+    def valido(self):
+        """XML lido e válido. getDadosBasicos é chamado na primeira leitura.
+
+        Returns:
+            type: bool.
+
+        """
+        if 'valido' not in self.memo:
+            self.getDadosBasicos()
+        return self.memo['valido']
+
+    def limpaMemo(self, porPeriodo=False):
+        """Descarta as seções calculadas. Chamado pelos setters de file e
+        periodo.
+
+        Args:
+            porPeriodo (type): Descarta apenas as seções que dependem do
+                período `porPeriodo`. Defaults to False.
+
+        Returns:
+            type: None.
+
+        """
+        #----As seções do XML são extraídas já filtradas pelo período
+        self.secoes = None
+        if not porPeriodo:
+            self.memo.clear()
+            return
+        for nome in list(self.memo):
+            if getattr(getattr(type(self), nome, None), 'porPeriodo', False):
+                del self.memo[nome]
+        return
     #--------------------------------------------------
     #----Validações
     @staticmethod
@@ -260,13 +3124,17 @@ class Pesquisador:
         return kwDefault
 
     def validaPath(self):
-        """Verifica se todos os caminhos informados são válidos e define os booleanos __UFCG, __SAAP e __PONTUA.
+        """Verifica se todos os caminhos informados são válidos e define os
+        booleanos __UFCG, __SAAP e __PONTUA. A verificação é feita uma vez por
+        instância.
 
         Returns:
             type: Dicionário com caminhos validados.
 
         """
 
+        if self.__paths is not None:
+            return dict(self.__paths)
         kwargs = self.defaultValues()
         kwargs = {**kwargs, **self.kwargs}
         dicio = {k: v for k, v in kwargs.items() if k.startswith('path')}
@@ -296,11 +3164,13 @@ class Pesquisador:
                 else:
                     self.__PONTUA = False
 
+        self.__paths = dict(dicio)
         return dicio
 
     @staticmethod
     def validaISSN_ISBN(*args):
-        """Valida lista de ISSNs ou ISBNs.
+        """Valida lista de ISSNs ou ISBNs. Cada código passa pelo cache de
+        validaCodigo.
 
         Args:
             *args (type): Lista de 1 nível. `*args`.
@@ -309,50 +3179,29 @@ class Pesquisador:
             type: Lista com ISSN, ISBN ou Invalido, conforme o caso.
 
         """
-        result=[]
-        for arg in args:
-            try:
-                assert (issn.is_valid(arg) or isbn.is_valid(arg)), 'INVALIDO'
-                #----issn retorna fora da forma padrão. Retorna o traço
-                result.append(arg[:4]+'-'+arg[4:])
-            except AssertionError as error:
-                result.append('INVALIDO')
-
-        return result
+        return [validaCodigo(arg) for arg in args]
 
     @staticmethod
-    def validaDoi(*args):
-        """Valida código DOI na base de dados crossref
+    def validaDoi(*args, **kwargs):
+        """Valida código DOI na base de dados crossref, consultas assíncronas e
+        em cache, ver ResolvedorDOI.
 
         Args:
             *args (type): Lista de um nível com números doi `*args`.
+            **kwargs (type): Parâmetros de ResolvedorDOI, por exemplo endpoint
+                `**kwargs`.
 
         Returns:
-            type: Retorna lista com ISSN se encontrado, NAO-ENCONTRADO ou INVALIDO.
+            type: Retorna lista com ISSN se encontrado, NAO_ENCONTRADO ou
+                INVALIDO para DOI inexistente (ERRO se o serviço não respondeu
+                ou recusou a consulta).
 
         """
-        #----Problemas por aqui. A consulta retorna uma lista.
-        works = Works()
-        result = []
-        args = [*args]
-        for arg in args:
-            if len(arg) != 0:
-                work = Works()
-                try:
-                    query = work.doi(arg)
-                    ISSN = query['ISSN']
-                    if ISSN is not None:
-                        result.append(query['ISSN'])
-                    else:
-                        result.append('NAO_ENCONTRADO')
-                except CrossrefAPIError as error:
-                    result.append('INVALIDO')
-            else:
-                result.append('INVALIDO')
-        return result
+        return ResolvedorDOI(**kwargs).resolve(args)
 
     #--------------------------------------------------
     #----Carregando dados externos auxiliares
+    @cronometrado()
     def carregaDadosGlobais(self):
         """Carrega todas as tabelas necessárias.
 
@@ -361,34 +3210,18 @@ class Pesquisador:
 
         """
         #----Carrega os dados externos em dataframes uma única vez para ser utililizado.
+        #----As planilhas vêm do registro do processo, compartilhadas entre
+        #    pesquisadores.
         #----Alguns arquivos precisam de trabalho adicional
         paths = self.validaPath()
         if self.__PONTUA:
-            self.Pontos = pd.read_excel(paths['pathPontos'])
+            self.Pontos = carregaTabela(paths['pathPontos'])
         if self.__SAAP:
-            self.SAAP = pd.read_excel(paths['pathSAAP'])
-
-        # try:
-        #     self.CAPES = pd.read_csv(paths['pathCAPES'])
-        #     #----Dados da tabela CAPES precisam ser normalizados, sem acentos para comparação de textos.
-        #     self.CAPES = self.CAPES.applymap(unidecode)
-        # except IOError:
-        #     #LOG.error("Não foi encontrada: Tabela de TABELA_EQUIVALENCIA_CNPQ_CAPES")
-        #     self.CAPES = []
-        #
-        # try:
-        #     #----encoding do CNPq precisa evoluir
-        #     self.QUALIS = pd.read_csv(paths['pathQualis'], encoding = "ISO-8859-1", index_col=0)
-        #     self.QUALIS = self.QUALIS.reset_index()
-        #     #----Coluna de areas tem muitos whitespaces escondidos. stripped.
-        #     self.QUALIS["area"] = self.QUALIS["area"].apply(lambda val: val.strip())
-        #     #----Normaliza e codifica para comparar áreas
-        #     self.QUALIS['area'] = self.QUALIS['area'].str.normalize('NFKD').str.encode('ISO-8859-1', 'ignore')
-        #     #----Este arquivo é muito grande e muitas comparações vão ser feitas. Categorias nas áreas vão agilizar o processamento.
-        #     self.QUALIS['area'] = self.QUALIS['area'].astype('category')
-        # except pd.errors.EmptyDataError as error:
-        #     tmp = None
-        #     return
+            self.SAAP = carregaTabela(paths['pathSAAP'])
+
+        #----CAPES e QUALIS não são carregados aqui: equivalenciaCAPES e o
+        #    índice QUALIS são montados na primeira consulta, ver getAreaCAPES
+        #    e getQualis.
 
         return
 
@@ -398,6 +3231,10 @@ class Pesquisador:
         Returns:
             type: Nome do arquivo.
 
+        Raises:
+            KeyError: O nome não está em DBnomes, nem aproximado com o kwarg
+                nomeAproximado.
+
         """
         if self.__nome is not None:
             #----Se o nome foi informado, coloca na forma canônica
@@ -409,8 +3246,18 @@ class Pesquisador:
                 #LOG.warning("Conflito NOME-FILE, prevalece FILE")
                 return
             else:
-                df = pd.read_excel(pathHandler("../../data/external/DBnomes.xlsx"))
-                self.__file = df.loc[df['NOME']==nome, 'FILE'].values[0]
+                indice = IndiceNomes.carrega()
+                file = indice.arquivo(nome)
+                if file is None and self.kwargs.get('nomeAproximado'):
+                    #----Nome digitado com pequenas diferenças: usa o mais
+                    #    parecido
+                    candidatos = indice.aproximado(nome)
+                    file = candidatos[0][2] if candidatos else None
+                if file is None:
+                    #LOG.error("Nome não encontrado em DBnomes: %s", nome)
+                    raise KeyError(
+                        "Nome não encontrado em DBnomes: {}".format(nome))
+                self.__file = file
         else:
             if self.__file is not None:
                 return
@@ -433,14 +3280,17 @@ class Pesquisador:
         self.carregaDadosGlobais()
         if self.__UFCG:
             paths = self.validaPath()
-            df = pd.read_excel(paths['pathUFCG'])
-            df['CPF'] = df['CPF'].astype(str)
+            df = carregaTabela(paths['pathUFCG'])
+            linhas = indiceCPF(paths['pathUFCG'],
+                               'CPF').get(normalizaCPF(CPF), [])
             #----Se não encontrar retorna empty dataframe que pode ser manipulado.
-            DadosUFCG = df[df['CPF']==CPF][['CPF','Matrícula','Lotação']]
+            DadosUFCG = df.iloc[linhas][['Matrícula','Lotação']]
+            DadosUFCG.insert(0, 'CPF', CPF)
         else:
             DadosUFCG = None
         return DadosUFCG
 
+    @cronometrado()
     def getDadosBasicos(self):
         """Le arquivo XML, inicia parsing e define alguns atributos importantes.
 
@@ -449,19 +3299,39 @@ class Pesquisador:
 
         """
         file = self.__file
+        self.limpaMemo()
+        if self.__basicosEmCache():
+            return self.__FLAG
         try:
-            #----XML funciona?
-            tree = etree.parse(file)
+            #----XML funciona? O motor 'eventos' extrai as seções durante o
+            #    parsing, sem árvore.
+            if self.kwargs.get('motor') == 'eventos':
+                alvo = extraiSecoesEventos(file, self.periodo)
+            else:
+                tree = parseXML(file)
             self.__FLAG = True
         except:
             self.ID = None
         else:
             #----Se estes paramêtros não puderem ser definidos o XML não é CV Lattes ou
             #----foi extraído sem informações pessoais.
-            self.root = tree.getroot()
-            self.ID = self.root.get('NUMERO-IDENTIFICADOR')
-            self.Atualiza = self.root.get('DATA-ATUALIZACAO')
-            self.NOME = self.root.getchildren()[0].get('NOME-COMPLETO')
+            if self.kwargs.get('motor') == 'eventos':
+                self.root = None
+                self.secoes = alvo.secoes
+                self.ID = alvo.cabecalho.get('NUMERO-IDENTIFICADOR')
+                self.Atualiza = alvo.cabecalho.get('DATA-ATUALIZACAO')
+                if alvo.filhos == 0:
+                    raise IndexError("XML sem elementos em {}".format(file))
+                self.NOME = alvo.nome
+                gerais = alvo.secoes['DADOS-GERAIS']
+                self.CPF = gerais[0].get('CPF') if gerais else None
+            else:
+                self.root = tree.getroot()
+                self.ID = self.root.get('NUMERO-IDENTIFICADOR')
+                self.Atualiza = self.root.get('DATA-ATUALIZACAO')
+                self.NOME = self.root.getchildren()[0].get('NOME-COMPLETO')
+                gerais = self.root.find('DADOS-GERAIS')
+                self.CPF = gerais.get('CPF') if gerais is not None else None
             if not hasattr(self,'root'):
                 #----Sem root nã tem como fazer parsing. Os métodps seguintes retornam None.
                 self.__FLAG = False
@@ -471,9 +3341,115 @@ class Pesquisador:
         finally:
             if ((self.ID is None) or (self.NOME is None)):
                 self.__FLAG = False
+        self.memo['valido'] = self.__FLAG
+        if self.__FLAG and self.cache is not None:
+            basicos = pd.DataFrame([{'ID': self.ID,
+                                     'DATA-ATUALIZACAO': self.Atualiza,
+                                     'NOME': self.NOME, 'CPF': self.CPF}],
+                                   dtype=object)
+            self.cache.grava(file, self.cache.chaveSecao('basicos', None),
+                             basicos)
         return self.__FLAG
+
+    def __basicosEmCache(self):
+        """Com o CacheCV, uma entrada válida (validada pelo cabeçalho do XML)
+        já tem ID, DATA-ATUALIZACAO, NOME e CPF, e o XML não é lido. A árvore
+        só é construída se alguma seção não estiver no cache.
+
+        Returns:
+            type: bool, True se os dados básicos vieram do cache.
+
+        """
+        if self.cache is None or self.__file is None:
+            return False
+        try:
+            chave = self.cache.chaveSecao('basicos', None)
+            encontrado, basicos = self.cache.carrega(self.__file, chave)
+        except ERROS_CACHE as error:
+            #----XML ilegível ou manifesto corrompido: getDadosBasicos lê o XML
+            #    e marca o currículo como inválido se for o caso
+            warnings.warn("CacheCV: entrada de {} ignorada ({!r})".format(
+                self.__file, error), RuntimeWarning)
+            return False
+        if not encontrado or basicos is None:
+            return False
+        linha = basicos.iloc[0]
+        self.root = None
+        self.secoes = None
+        self.ID = linha['ID']
+        self.Atualiza = linha['DATA-ATUALIZACAO']
+        self.NOME = linha['NOME']
+        self.CPF = linha['CPF']
+        self.__FLAG = True
+        self.memo['valido'] = True
+        return True
+
+    def filtraPeriodo(self, df):
+        """Produções do período. Sem período ficam todas as que têm ano, como
+        se o período tivesse todos os anos.
+
+        Args:
+            df (type): Dataframe arrumado por dfTidy, com a coluna ANO `df`.
+
+        Returns:
+            type: Dataframe filtrado.
+
+        """
+        if self.periodo is None:
+            return df[df['ANO'].fillna('') != '']
+        return df[df['ANO'].isin(self.periodo)]
+
+    def getSecoes(self):
+        """Seções do currículo extraídas em uma única passagem por
+        extraiSecoes, ou por extraiSecoesEventos com o kwarg motor='eventos'. A
+        extração é feita na primeira chamada depois de getDadosBasicos e
+        reaproveitada pelos getters.
+
+        Returns:
+            type: Dicionário de extraiSecoes ou None.
+
+        """
+        if not self.__FLAG:
+            return None
+        if getattr(self, 'secoes', None) is None:
+            with CRONOMETRO.etapa('extraiSecoes') as medida:
+                if self.kwargs.get('motor') == 'eventos':
+                    self.secoes = extraiSecoesEventos(self.file,
+                                                      self.periodo).secoes
+                else:
+                    self.secoes = extraiSecoes(self.getRaiz(), self.periodo)
+                medida.registros = sum(len(self.secoes[tag][0])
+                                       for tag in SECOES_PRODUCAO)
+        return self.secoes
+
+    def getRaiz(self):
+        """Raiz do XML. Depois de liberaArvore o arquivo é lido de novo a cada
+        chamada, sem guardar a árvore.
+
+        Returns:
+            type: Elemento raiz.
+
+        """
+        root = getattr(self, 'root', None)
+        if root is None:
+            root = parseXML(self.file).getroot()
+        return root
+
+    def liberaArvore(self):
+        """Descarta a árvore do XML e as seções brutas de extraiSecoes. As
+        seções já calculadas continuam em memo; uma seção pedida depois é
+        extraída de novo do arquivo.
+
+        Returns:
+            type: None.
+
+        """
+        self.root = None
+        self.secoes = None
+        return
     #--------------------------------------------------
     #----Helpers
+    @_emCache('areas', porPeriodo=False, lista=True)
     def getArea(self):
         """Acessa XML e extrai lista com áreas de conhecimento do perfil do pesquisador.
 
@@ -485,7 +3461,7 @@ class Pesquisador:
         #----Temos XML válido?
         if self.__FLAG:
             #----Areas registradas nos dados-gerais do pesquisador
-            AREAS = [ el.get("NOME-DA-AREA-DO-CONHECIMENTO") for el in self.root.xpath("DADOS-GERAIS/AREAS-DE-ATUACAO/*")]
+            AREAS = self.getSecoes()['AREAS']
             #----tudo maiúsculo. mesma forma da tabela do qualis
             AREAS = [val.upper() for val in AREAS]
             #----elimina duplicatas de um jeito legal
@@ -494,46 +3470,57 @@ class Pesquisador:
         else:
             return None
 
-    # def getAreaCAPES(self, AREAS):
-    #     """Recebe uma lista de Áreas CNPq e retorna as áreas CAPES equivalentes.
-    #
-    #     Args:
-    #         AREAS (type): Areas do CNPq `AREAS`.
-    #
-    #     Returns:
-    #         type: Áreas CAPES.
-    #
-    #     """
-    #     #----Lista de áreas normalizadas
-    #     AREAS = [*AREAS]
-    #     AREAS = [ val.upper() for val in map(unidecode,AREAS)]
-    #     tabelaCapes = self.CAPES
-    #     #----Retorna as áreas CAPES normalizadas
-    #     capes = tabelaCapes[tabelaCapes["AREA_CNPQ"].isin(AREAS) ]["AREA_CAPES"].str.normalize('NFKD').str.encode('utf-8', 'ignore')
-    #
-    #     return capes.tolist()
-
-    # def setQualis(self, Area, ISSN):
-    #     """Recebe uma lista de áreas CAPES e um ISSN e devolve qualis.
-    #
-    #     Args:
-    #         Area (type): AREA CAPES `Area`.
-    #         ISSN (type): `ISSN`.
-    #
-    #     Returns:
-    #         type: Description of returned object.
-    #
-    #     """
-    #     #----Várias áreas, um ISSN, tem que atuar no eixo 0 dos df.
-    #     AREAS = [*Area]
-    #     ISSN = ISSN
-    #     dfQUALIS = self.QUALIS[self.QUALIS['area'].isin(AREAS)]
-    #     rank = dfQUALIS[(dfQUALIS['issn']==ISSN)]['ranking'].tolist()
-    #     if len(rank)>0:
-    #         rank = sorted(rank)[0]
-    #     else:
-    #         rank = ''
-    #     return rank
+    def getAreaCAPES(self, AREAS=None):
+        """Recebe uma lista de Áreas CNPq e retorna as áreas CAPES
+        equivalentes.
+
+        Args:
+            AREAS (type): Areas do CNPq; se None, as do pesquisador `AREAS`.
+                Defaults to None.
+
+        Returns:
+            type: Áreas CAPES normalizadas, lista vazia se a tabela não foi
+                encontrada.
+
+        """
+        paths = self.validaPath()
+        if 'pathCAPES' not in paths:
+            return []
+        if AREAS is None:
+            AREAS = self.areas
+        return areasCAPES(AREAS, equivalenciaCAPES(paths['pathCAPES']))
+
+    def getQualis(self):
+        """Índice QUALIS compartilhado pelo processo, ver IndiceQualis. Só é
+        montado na primeira consulta.
+
+        Returns:
+            type: IndiceQualis ou None se a planilha não foi encontrada.
+
+        """
+        paths = self.validaPath()
+        if 'pathQualis' not in paths:
+            return None
+        indice = self.kwargs.get('pathIndiceQualis',
+                                 "../../data/interim/qualis.parquet")
+        return IndiceQualis.carrega(paths['pathQualis'], indice)
+
+    def setQualis(self, Area, ISSN):
+        """Recebe uma lista de áreas CAPES e um ISSN e devolve qualis. Para
+        tabelas inteiras use IndiceQualis.atribui.
+
+        Args:
+            Area (type): AREA CAPES `Area`.
+            ISSN (type): `ISSN`.
+
+        Returns:
+            type: Melhor estrato entre as áreas ou ''.
+
+        """
+        indice = self.getQualis()
+        if indice is None:
+            return ''
+        return indice.ranking([*Area], ISSN)
 
     @staticmethod
     def BlocoLattes(root, lista ):
@@ -572,23 +3559,26 @@ class Pesquisador:
         listaProducoes = ['PRODUCAO-BIBLIOGRAFICA', 'PRODUCAO-TECNICA', 'OUTRA-PRODUCAO','DADOS-COMPLEMENTARES']
         if self.__FLAG:
             if 'DADOS-GERAIS' in tag:
-                tree = self.root.iterchildren(tag='DADOS-GERAIS')
+                tree = self.getRaiz().iterchildren(tag='DADOS-GERAIS')
                 lista_dados = [{**el1.attrib} for el1 in tree]
                 lista_detalhe = []
             elif "FORMACAO-ACADEMICA-TITULACAO" in tag:
-                tree = self.root.iterchildren(tag='DADOS-GERAIS')
+                tree = self.getRaiz().iterchildren(tag='DADOS-GERAIS')
                 lista_dados = [{'TITULACAO':el3.tag, **el3.attrib}
                     for el1 in tree
                     for el2 in el1.iterchildren(tag=tag)
                     for el3 in el2.iterchildren()]
                 lista_detalhe = []
             elif tag in listaProducoes:
-                lista_dados = self.BlocoLattes(root = self.root, lista=[tag, 'DADOS'])
+                lista_dados = self.BlocoLattes(root = self.getRaiz(),
+                                               lista=[tag, 'DADOS'])
                 if tag in ['PRODUCAO-BIBLIOGRAFICA', 'OUTRA-PRODUCAO']:
-                    lista_detalhe = self.BlocoLattes(root = self.root, lista = [tag, 'DETALHAMENTO'])
+                    lista_detalhe = self.BlocoLattes(
+                        root = self.getRaiz(), lista = [tag, 'DETALHAMENTO'])
                 elif 'PRODUCAO-TECNICA' in tag:
+                    raiz = self.getRaiz()
                     lista_detalhe = [{'PRODUCAO':el3.tag, **el3.attrib,  'FOMENTO': el4['INSTITUICAO-FINANCIADORA']}
-                     for el1 in self.root.iterchildren(tag=tag)
+                                     for el1 in raiz.iterchildren(tag=tag)
                      for el2 in el1.iterchildren()
                      for el3 in el2.iterchildren()
                      for el4 in el3.iterchildren()
@@ -607,7 +3597,7 @@ class Pesquisador:
     def xml2dict_3(self, tag, tipo):
         if self.__FLAG:
             lista = [{'PRODUCAO':el2.tag, **el2.attrib, 'TIPO-PRODUCAO':el3.tag, **el3.attrib}
-                            for el1 in self.root.iterchildren(tag=tag)
+                     for el1 in self.getRaiz().iterchildren(tag=tag)
                             for el2 in el1.iterchildren()
                             for el3 in el2.iterchildren()
                                 if any(tag in el3.tag for tag in tipo)]
@@ -615,7 +3605,9 @@ class Pesquisador:
             lista = None
         return lista
 
-    def dfTidy(self, df, cols_keep, cols_merge, cols_equiv, cols_out, cols_final):
+    @cronometrado()
+    def dfTidy(self, df, cols_keep, cols_merge, cols_equiv, cols_out,
+               cols_final, naoNulas=()):
         """Trabalha as colunas nos dataframes de cada elemento Lattes para ficarem mais amigaveis.
 
         Args:
@@ -625,76 +3617,29 @@ class Pesquisador:
             cols_equiv (type): mudanças de nome de tabelas como dicionário `cols_equiv`.
             cols_out (type): colunas para remover, incluindo substrings `cols_out`.
             cols_final (type): colunas para tentar manter `cols_final`.
+            naoNulas (type): colunas com valores em registros descartados pelo
+                período, ver juntaAcumuladores `naoNulas`. Defaults to ().
 
         Returns:
             type: dataframe mais ou menos arrumado.
 
         """
-        #----Validando argumentos
-        if (not isinstance(df,pd.DataFrame) or df.empty):
+        #----Validando argumentos. Sem registros no período a seção ainda é
+        #    arrumada se houve descartados.
+        if (not isinstance(df,pd.DataFrame) or (df.empty and not naoNulas)):
             return None
-        #----
-        cols = df.columns.tolist()
-        if len(cols_keep)==0:
-            cols_keep = cols
-        if len(cols_merge)==0:
-            cols_merge = None
-        if len(cols_equiv)==0:
-            cols_equiv = None
-        if len(cols_out)==0:
-            cols_out = None
-        #-------------------------
-        #----Sabemos o que manter, garantimos que exista
-        if cols_keep is not None:
-            cols = df.columns.tolist()
-            colG = list(OrderedDict.fromkeys([*cols_keep, *cols]))
-            for col in colG :
-                if col not in cols:
-                    df.loc[:,col] = ""
-        #----Removendo tudo o que parece inútil
-        if cols_out is not None:
-            present = {col for col in set(cols) if any(out in col for out in set(cols_out))}
-            cols = list(set(cols) - present)
-            df = df[cols]
-        #----Renomeando algumas colunas
-        if cols_equiv is not None:
-            for col in cols_equiv.keys():
-                if col not in cols:
-                    df = df.copy()
-                    df.loc[:,col] = ""
-            df = df.rename(columns = cols_equiv)
-        #----Juntando colunas que representam a mesma coisa com fillna
-        cols = sorted(df.columns.tolist())
-        cols_merge = sorted(cols_merge)
-        if cols_merge is not None:
-            for agregado in cols_merge:
-                colmerge = sorted((([col for col in cols if agregado in col]))+[agregado])
-                colmerge = list(OrderedDict.fromkeys(colmerge))
-                for col in colmerge:
-                    if col not in cols:
-                        df.loc[:,col]=np.nan
-                for col in colmerge[1:]:
-                    if not df[col].isnull().all():
-                        df = df.copy()
-                        df.loc[:,colmerge[0]] = df.loc[:,colmerge[0]].fillna(df.loc[:,col])
-                        df = df.drop(col, axis=1)
-
-        cols = df.columns.tolist()
-        if len(cols_final) == 0:
-            cols_final = cols
-        colunas = list({col for col in set(cols) if any(out in col for out in set(cols_final))})
-
-        df = df[colunas]
-
-        return df
+        #----A especificação é compilada uma vez e reaproveitada, ver PlanoTidy
+        plano = PlanoTidy.compila(cols_keep, cols_merge, cols_equiv, cols_out,
+                                  cols_final)
+        return plano.aplica(df, naoNulas)
 
     @staticmethod
     def fixDF(df, cols_fix):
         if df is not None:
             cols = df.columns.to_list()
-            for col in cols_fix:
-                if col not in cols:
-                    df[col] = ''
+            #----assign devolve uma cópia: as seções guardadas em memo não são
+            #    alteradas
+            df = df.assign(**{col: '' for col in cols_fix if col not in cols})
             df = df[cols_fix]
             df = df.fillna('')
         else:
@@ -703,6 +3648,7 @@ class Pesquisador:
 
     #--------------------------------------------------
     #----Informações do CV Lattes
+    @cronometrado()
     def getDadosPessoais(self):
         """Extrai informações pessoais do pesquisador do XML do Lattes. Precisa da definição da raiz do XML que é realizada em getDadosBasicos.
 
@@ -712,16 +3658,11 @@ class Pesquisador:
         """
         #----Se existe um Lattes
         if self.__FLAG:
-            dictPessoais = {}
-            #----Parse Data, xml2dict returns double list, only first is relevant here
-            lista = self.xml2dict(tag = 'DADOS-GERAIS')
-            df = pd.DataFrame(lista[0])
-            #---- Organizando DF
-            cols = ["NOME-COMPLETO", "CPF", "PAIS-DE-NASCIMENTO", "UF-NASCIMENTO", "DATA-NASCIMENTO","SEXO", "RACA-OU-COR"]
-            coldf = df.columns.tolist()
-            new_cols = list(set(coldf).intersection(set(cols)))
-            df = df[new_cols]
-            #----
+            #----Dados do XML, do cache se houver; IES vai para o final depois
+            #    do banco de servidores
+            df = self.getDadosGerais()
+            IES = df.pop('IES')
+            IES = IES.values[0] if len(IES) else 'NAO ENCONTRADO'
             #----Incluindo dados do banco de servidores
             if self.__UFCG:
                 try:
@@ -735,16 +3676,43 @@ class Pesquisador:
             #---- Inclui Identificador Lattes
             df["ID"] = self.ID
             df["DATA-ATUALIZACAO"] = self.Atualiza
-            try:
-                IES = list(self.root.findall("DADOS-GERAIS/ENDERECO/ENDERECO-PROFISSIONAL"))[0].attrib['NOME-INSTITUICAO-EMPRESA']
-            except IndexError as error:
-                IES = 'NAO ENCONTRADO'
             df["IES"] = IES
             result = df
         else:
             result =  None
         return result
 
+    @_emCache('pessoais', porPeriodo=False)
+    def getDadosGerais(self):
+        """Parte de getDadosPessoais que vem do XML: atributos de DADOS-GERAIS
+        e a instituição do endereço profissional, sem o banco de servidores.
+
+        Returns:
+            type: Dataframe com a coluna IES ou None.
+
+        """
+        if not self.__FLAG:
+            return None
+        #----Parse Data, xml2dict returns double list, only first is relevant
+        #    here
+        lista = self.getSecoes()['DADOS-GERAIS']
+        df = pd.DataFrame(lista)
+        #---- Organizando DF
+        cols = ["NOME-COMPLETO", "CPF", "PAIS-DE-NASCIMENTO", "UF-NASCIMENTO",
+                "DATA-NASCIMENTO","SEXO", "RACA-OU-COR"]
+        coldf = df.columns.tolist()
+        new_cols = list(set(coldf).intersection(set(cols)))
+        df = df[new_cols]
+        try:
+            endereco = self.getSecoes()['ENDERECO-PROFISSIONAL'][0]
+            IES = endereco['NOME-INSTITUICAO-EMPRESA']
+        except IndexError as error:
+            IES = 'NAO ENCONTRADO'
+        df["IES"] = IES
+        return df
+
+    @cronometrado()
+    @_emCache('titulacao', porPeriodo=False)
     def getDadosTitulacao(self):
         """Extrai informações de Titulacao do pesquisador do XML do Lattes. Precisa da definição da raiz do XML que é realizada em getDadosBasicos.
 
@@ -755,22 +3723,13 @@ class Pesquisador:
         if self.__FLAG:
             #----Ajustando informações para o bloco
             TAGs = 'FORMACAO-ACADEMICA-TITULACAO'
-            #----Definindo quais campos são úteis
-            #--------Colunas com múltiplas equivalências.
-            cols_merge = ['TIPO', 'NOME-INSTITUICAO']
-            #--------Colunas que tem que mudar de nome
-            cols_equiv = {}
-            #--------Juntando todos os dados básicos e complementares.
-            cols_keep = []
-            #--------Jogue fora toda coluna com estes termos
-            cols_out = ['INGLES', 'CODIGO', 'FLAG', 'ORIENTADOR', 'OUTRA', 'TITULO']
-            cols_final = []
+            esquema = ESQUEMAS['FORMACAO-ACADEMICA-TITULACAO']
             #----Parsing
-            lista = self.xml2dict(tag = TAGs)
-            df = df = pd.DataFrame(lista[0])
+            lista = self.getSecoes()[TAGs]
+            df = lista.dataframe()
             if not df.empty:
                 #----Tidying up
-                df = self.dfTidy(df, cols_keep=cols_keep, cols_merge = cols_merge, cols_equiv = cols_equiv, cols_out=cols_out, cols_final=cols_final)
+                df = self.dfTidy(df, **esquema)
 
                 result =  df
             else:
@@ -779,6 +3738,8 @@ class Pesquisador:
             result = None
         return  result
 
+    @cronometrado()
+    @_emCache('bibliografica', opcoes=('validaISSN', 'qualis'))
     def getProducaoBibliografica(self):
         """Extrai informações de Producao Bibliografica do pesquisador do XML do Lattes. Insere informação de ISSN e ISBN, verifica validade e ajusta fator QUALIS. Precisa da definição da raiz do XML que é realizada em getDadosBasicos.
 
@@ -789,46 +3750,39 @@ class Pesquisador:
         if self.__FLAG:
             #----Ajustando informações para o bloco
             TAGs = 'PRODUCAO-BIBLIOGRAFICA'
-            #----Definindo quais campos são úteis
-            #--------Colunas dos Dados Básicos
-            cols_BIB_basicos = ['PRODUCAO', 'TIPO', 'NATUREZA','TITULO', 'ANO', 'PAIS', 'MEIO', 'DOI', 'REVISTA' ]
-            #--------Colunas dos dados complementares.
-            cols_BIB_complementares = ['CLASSIFICACAO', 'NOME', 'EDITORA', 'ISSN-ISBN', 'ISSN', 'ISBN']
-            #--------Colunas com múltiplas equivalências.
-            cols_merge = ['ANO', 'TITULO','PAIS', 'REVISTA', 'MEIO', 'ISSN-ISBN']
-            #--------Colunas que tem que mudar de nome
-            cols_equiv = {'TITULO-DO-PERIODICO-OU-REVISTA':'REVISTA', 'TITULO-DOS-ANAIS-OU-PROCEEDINGS':'REVISTA-PROC', 'TITULO-DO-JORNAL-OU-REVISTA':'REVISTA-JORNAL', 'ISBN':'ISSN-ISBN-1', 'ISSN':'ISSN-ISBN-2'}
-            #--------Juntando todos os dados básicos e complementares.
-            cols_keep = list(OrderedDict.fromkeys([*cols_BIB_basicos, *cols_BIB_complementares]))
-            #--------Jogue fora toda coluna com estes termos
-            cols_out = ['INGLES', 'CODIGO', 'FLAG', 'HOME', 'CIDADE','PAGINA']
-            cols_final = ['SEQUENCIA-PRODUCAO', 'PRODUCAO', 'NATUREZA', 'CLASSIFICACAO', 'TIPO', 'TITULO', 'ANO', 'PAIS', 'REVISTA','DOI', 'ISBN' ,'NOME']
+            esquema = ESQUEMAS['PRODUCAO-BIBLIOGRAFICA']
             #----Parsing
-            lista = self.xml2dict(tag = TAGs)
-            df = pd.concat([pd.DataFrame(lista[0]), pd.DataFrame(lista[1])], ignore_index=True)
-            if not df.empty:
+            lista = self.getSecoes()[TAGs]
+            df, descartadas = juntaAcumuladores(*lista)
+            if not df.empty or descartadas:
                 #----Tidying up
-                df = self.dfTidy(df, cols_keep=cols_keep, cols_merge = cols_merge, cols_equiv = cols_equiv, cols_out=cols_out, cols_final=cols_final)
+                df = self.dfTidy(df, naoNulas=descartadas, **esquema)
                 #----Filtrando
-                df = df[df['ANO'].isin(self.periodo)]
-                # #----Validando ISSN/ISBN
-                # if 'ISSN-ISBN' not in df.columns.tolist():
-                #     if 'ISSN' not in df.columns.tolist():
-                #         if 'ISBN' in df.columns.tolist():
-                #             df.rename(columns = {'ISBN':'ISSN-ISBN'})
-                #         else:
-                #             df['ISSN-ISBN'] = ""
-                #     else:
-                #         df.rename(columns = {'ISSN':'ISSN-ISBN'})
-                # df['ISSN-ISBN'] = df['ISSN-ISBN'].apply(self.validaISSN_ISBN)
-                # df['ISSN-ISBN'] = df['ISSN-ISBN'].apply(lambda val: ''.join(val))
-                # #---- QUALIS
-                # AREA_CNPQ = self.getArea()
-                # AREA_CAPES = self.getAreaCAPES(AREA_CNPQ)
-                # try:
-                #     df['QUALIS'] = df.apply(lambda val: self.setQualis(AREA_CAPES, val['ISSN-ISBN']) if val['ISSN-ISBN']!='INVALIDO' else '', axis = 1)
-                # except ValueError as error:
-                #     df['QUALIS'] = 'ERRO'
+                df = self.filtraPeriodo(df)
+                #----Validando ISSN/ISBN, opcional: kwarg validaISSN
+                if self.kwargs.get('validaISSN'):
+                    if 'ISSN-ISBN' not in df.columns.tolist():
+                        if 'ISSN' not in df.columns.tolist():
+                            if 'ISBN' in df.columns.tolist():
+                                df = df.rename(columns = {'ISBN':'ISSN-ISBN'})
+                            else:
+                                df['ISSN-ISBN'] = ""
+                        else:
+                            df = df.rename(columns = {'ISSN':'ISSN-ISBN'})
+                    df['ISSN-ISBN'] = validaSerieISSN_ISBN(df['ISSN-ISBN'])
+                #----QUALIS, opcional: kwarg qualis. Um join com o índice (área
+                #    CAPES, ISSN).
+                if self.kwargs.get('qualis'):
+                    coluna = next((col
+                                   for col in ('ISSN-ISBN',
+                                               'ISSN') if col in df.columns),
+                                  None)
+                    indice = self.getQualis()
+                    if coluna is not None and indice is not None:
+                        df['QUALIS'] = indice.atribui(df, self.getAreaCAPES(),
+                                                      coluna)
+                    else:
+                        df['QUALIS'] = ''
                 # #----doi
                 # #DOI = self.validaDoi(df.DOI)
                 df["ID"] = self.ID
@@ -839,6 +3793,8 @@ class Pesquisador:
             result = None
         return result
 
+    @cronometrado()
+    @_emCache('tecnica')
     def getProducaoTecnica(self):
         """Extrai informações de Producao Tecnica do pesquisador do XML do Lattes.
 
@@ -849,26 +3805,15 @@ class Pesquisador:
         if self.__FLAG:
             #----Ajustando informações para o bloco
             TAGs = 'PRODUCAO-TECNICA'
-            #----Definindo quais campos são úteis
-            #--------Colunas com múltiplas equivalências.
-            cols_merge = ['ANO', 'TITULO','PAIS']
-            #--------Colunas que tem que mudar de nome
-            cols_equiv = {'INSTITUICAO-FINANCIADORA':'FOMENTO'}
-            #--------Juntando todos os dados básicos e complementares.
-            cols_keep = ['ANO','PRODUCAO', 'SEQUENCIA-PRODUCAO', 'TIPO-PRODUCAO', 'NATUREZA', 'PAIS', 'IDIOMA', 'DOI', 'FINALIDADE', 'INSTITUICAO-FINANCIADORA','TITULO', 'NOME-COMPLETO-DO-AUTOR', 'CATEGORIA', 'TIPO-PRODUTO']
-            #--------Jogue fora toda coluna com estes termos
-            cols_out = ['INGLES', 'CODIGO', 'FLAG', 'HOME', 'CIDADE','PAGINA']
-            #--------
-            cols_final = ['ANO','PRODUCAO', 'SEQUENCIA-PRODUCAO', 'TIPO-PRODUCAO', 'NATUREZA', 'PAIS', 'IDIOMA', 'DOI', 'FINALIDADE', 'INSTITUICAO-FINANCIADORA','TITULO', 'NOME-COMPLETO-DO-AUTOR', 'CATEGORIA', 'TIPO-PRODUTO']
+            esquema = ESQUEMAS['TIPOS-PRODUCAO-TECNICA']
             #----Parsing
-            TIPO_PRODUCAO = ['DADOS-BASICOS-DO-SOFTWARE', 'DADOS-BASICOS-DA-PATENTE','APRESENTACAO-DE-TRABALHO', 'ORGANIZACAO-DE-EVENTO', 'DADOS-BASICOS-DO-TRABALHO-TECNICO', 'CURSO-DE-CURTA-DURACAO-MINISTRADO', 'PROGRAMA-DE-RADIO-OU-TV', 'RELATORIO-DE-PESQUISA', 'OUTRA-PRODUCAO-TECNICA', 'EDITORACAO', 'DADOS-BASICOS-DO-PROCESSOS-OU-TECNICAS', 'DADOS-BASICOS-DO-PRODUTO-TECNOLOGICO', 'DESENVOLVIMENTO-DE-MATERIAL-DIDATICO-OU-INSTRUCIONAL', 'MIDIA-SOCIAL-WEBSITE-BLOG', 'DADOS-BASICOS-DA-MARCA', 'CARTA-MAPA-OU-SIMILAR', 'MAQUETE']
-            lista = self.xml2dict_3(tag = TAGs, tipo = TIPO_PRODUCAO )
-            df = pd.DataFrame(lista)
-            if not df.empty:
+            lista = self.getSecoes()['TIPOS-PRODUCAO-TECNICA']
+            df, descartadas = juntaAcumuladores(lista)
+            if not df.empty or descartadas:
                 #----Tidying up
-                df = self.dfTidy(df, cols_keep=cols_keep, cols_merge = cols_merge, cols_equiv = cols_equiv, cols_out=cols_out, cols_final=cols_final)
+                df = self.dfTidy(df, naoNulas=descartadas, **esquema)
                 #----Filtrando
-                df = df[df['ANO'].isin(self.periodo)]
+                df = self.filtraPeriodo(df)
                 df["ID"] = self.ID
                 result =  df
             else:
@@ -877,6 +3822,8 @@ class Pesquisador:
             result =  None
         return result
 
+    @cronometrado()
+    @_emCache('apresentacoes')
     def getApresentacoes(self):
         """Obtem as informações da seção OUTRA-PRODUCAO do currículo do pesquisador
 
@@ -887,24 +3834,15 @@ class Pesquisador:
         if self.__FLAG:
             #----Ajustando informações para o bloco
             TAGs = 'PRODUCAO-TECNICA'
-            #----Definindo quais campos são úteis
-            #--------Colunas com múltiplas equivalências.
-            cols_merge = ['ANO', 'TITULO','PAIS']
-            #--------Colunas que tem que mudar de nome
-            cols_equiv = {}
-            #--------Juntando todos os dados básicos e complementares.
-            cols_keep =  ['PRODUCAO', 'SEQUENCIA-PRODUCAO', 'NATUREZA', 'TITULO', 'ANO', 'PAIS', 'IDIOMA', 'DOI','PRODUCAO', 'SEQUENCIA-PRODUCAO', 'TIPO-DE-ORIENTACAO', 'NOME-DO-ORIENTANDO', 'NOME-DA-AGENCIA']
-            #--------Jogue fora toda coluna com estes termos
-            cols_out = ['INGLES', 'CODIGO', 'FLAG', 'HOME', 'CIDADE','PAGINA']
-            cols_final = ['SEQUENCIA-PRODUCAO', 'PRODUCAO', 'TIPO','NATUREZA', 'TITULO','ANO', 'PAIS', 'IDIOMA', 'DOI']
+            esquema = ESQUEMAS['PRODUCAO-TECNICA']
             #----Parsing
-            lista = self.xml2dict(tag = TAGs)
-            df = pd.concat([pd.DataFrame(lista[0]), pd.DataFrame(lista[1])], ignore_index=True)
-            if not df.empty:
+            lista = self.getSecoes()[TAGs]
+            df, descartadas = juntaAcumuladores(*lista)
+            if not df.empty or descartadas:
                 #----Tidying up
-                df = self.dfTidy(df, cols_keep=cols_keep, cols_merge = cols_merge, cols_equiv = cols_equiv, cols_out=cols_out, cols_final=cols_final)
+                df = self.dfTidy(df, naoNulas=descartadas, **esquema)
                 #----Filtrando
-                df = df[df['ANO'].isin(self.periodo)]
+                df = self.filtraPeriodo(df)
                 df["ID"] = self.ID
                 result = df
             else:
@@ -913,6 +3851,8 @@ class Pesquisador:
             result = None
         return result
 
+    @cronometrado()
+    @_emCache('outra')
     def getProducaoOutra(self):
         """Obtem as informações da seção OUTRA-PRODUCAO do currículo do pesquisador
 
@@ -923,24 +3863,15 @@ class Pesquisador:
         if self.__FLAG:
             #----Ajustando informações para o bloco
             TAGs = 'OUTRA-PRODUCAO'
-            #----Definindo quais campos são úteis
-            #--------Colunas com múltiplas equivalências.
-            cols_merge = ['ANO', 'TITULO','PAIS']
-            #--------Colunas que tem que mudar de nome
-            cols_equiv = {}
-            #--------Juntando todos os dados básicos e complementares.
-            cols_keep =  ['PRODUCAO', 'SEQUENCIA-PRODUCAO', 'NATUREZA', 'TITULO', 'ANO', 'PAIS', 'IDIOMA', 'DOI','PRODUCAO', 'SEQUENCIA-PRODUCAO', 'TIPO-DE-ORIENTACAO', 'NOME-DO-ORIENTANDO', 'NOME-DA-AGENCIA']
-            #--------Jogue fora toda coluna com estes termos
-            cols_out = ['INGLES', 'CODIGO', 'FLAG', 'HOME', 'CIDADE','PAGINA']
-            cols_final = ['SEQUENCIA-PRODUCAO', 'PRODUCAO', 'TIPO','NATUREZA', 'TITULO','ANO', 'PAIS', 'IDIOMA', 'DOI']
+            esquema = ESQUEMAS['OUTRA-PRODUCAO']
             #----Parsing
-            lista = self.xml2dict(tag = TAGs)
-            df = pd.concat([pd.DataFrame(lista[0]), pd.DataFrame(lista[1])], ignore_index=True)
-            if not df.empty:
+            lista = self.getSecoes()[TAGs]
+            df, descartadas = juntaAcumuladores(*lista)
+            if not df.empty or descartadas:
                 #----Tidying up
-                df = self.dfTidy(df, cols_keep=cols_keep, cols_merge = cols_merge, cols_equiv = cols_equiv, cols_out=cols_out, cols_final=cols_final)
+                df = self.dfTidy(df, naoNulas=descartadas, **esquema)
                 #----Filtrando
-                df = df[df['ANO'].isin(self.periodo)]
+                df = self.filtraPeriodo(df)
                 df["ID"] = self.ID
                 result = df
             else:
@@ -949,6 +3880,8 @@ class Pesquisador:
             result = None
         return result
 
+    @cronometrado()
+    @_emCache('complementares')
     def getDadosComplementares(self):
         """Extrai informações de DADOS-COMPLEMENTARES do pesquisador do XML do Lattes.
 
@@ -959,24 +3892,15 @@ class Pesquisador:
         if self.__FLAG:
             #----Ajustando informações para o bloco
             TAGs = 'DADOS-COMPLEMENTARES'
-            #----Definindo quais campos são úteis
-            #--------Colunas com múltiplas equivalências.
-            cols_merge = ['ANO', 'TITULO','PAIS']
-            #--------Colunas que tem que mudar de nome
-            cols_equiv = {}
-            #--------Juntando todos os dados básicos e complementares.
-            cols_keep =  ['PRODUCAO', 'SEQUENCIA-PRODUCAO', 'NATUREZA', 'TITULO', 'ANO', 'PAIS', 'IDIOMA', 'TIPO-PARTICIPACAO']
-            #--------Jogue fora toda coluna com estes termos
-            cols_out = ['INGLES', 'CODIGO', 'FLAG', 'HOME', 'CIDADE','PAGINA']
-            cols_final = ['SEQUENCIA-PRODUCAO', 'PRODUCAO', 'TIPO','NATUREZA', 'TITULO','ANO', 'PAIS', 'IDIOMA', 'DOI']
+            esquema = ESQUEMAS['DADOS-COMPLEMENTARES']
             #----Parsing
-            lista = self.xml2dict(tag = TAGs)
-            df = pd.DataFrame(lista[0])
+            lista = self.getSecoes()[TAGs]
+            df, descartadas = juntaAcumuladores(lista[0])
             #----Tidying up
-            if ((not df.empty) and (df is not None)) :
-                df = self.dfTidy(df, cols_keep=cols_keep, cols_merge = cols_merge, cols_equiv = cols_equiv, cols_out=cols_out, cols_final=cols_final)
+            if ((not df.empty) or descartadas) :
+                df = self.dfTidy(df, naoNulas=descartadas, **esquema)
                 #----Filtrando
-                df = df[df['ANO'].isin(self.periodo)]
+                df = self.filtraPeriodo(df)
 
                 result = df
             else:
@@ -1003,15 +3927,20 @@ class Pesquisador:
         return
     #--------------------------------------------------
     #----Resumos e Relatórios
-    def doSumarioUFCG(self):
-        """Chamada no jupyter notebook para gerar relatório geral do pesquisador.
+    @cronometrado()
+    def extraiSumario(self):
+        """Lê do XML tudo que a pontuação precisa, sem pontuar. Usada por
+        doSumarioUFCG e por scoreCorpus, que pontua todos os currículos de uma
+        vez com pontuaCorpus.
 
         Returns:
-            type: Dicionário com elementos do Sistema, Sumários e dados listados de produção.
+            type: Dicionário com CVP (uma linha de identificação), Producao
+                (resumo das produções com ID), Pessoal, Demografico e Titulacao
+                (com ID). None se o XML for inválido.
 
         """
         dadosGlobais = self.carregaDadosGlobais()
-        flag = self.getDadosBasicos()
+        flag = self.valido
         if flag:
         #----Arquivos externos utilizados
             tmp = self.validaPath();
@@ -1023,15 +3952,14 @@ class Pesquisador:
             #     return
             #else:
 
-        #----Lendo dados de XML
-            dadosGlobais = self.carregaDadosGlobais()
-            Pessoais = self.getDadosPessoais()
-            Titulacao = self.getDadosTitulacao()
-            Bibliografico = self.getProducaoBibliografica()
-            Apresentacoes = self.getApresentacoes()
-            Tecnico = self.getProducaoTecnica()
-            Outra = self.getProducaoOutra()
-            Complementares = self.getDadosComplementares()
+        #----Lendo dados de XML, cada seção é calculada uma vez
+            Pessoais = self.pessoais
+            Titulacao = self.titulacao
+            Bibliografico = self.bibliografica
+            Apresentacoes = self.apresentacoes
+            Tecnico = self.tecnica
+            Outra = self.outra
+            Complementares = self.complementares
             #----Colunas
             cols_final_Pessoais = ['DATA-ATUALIZACAO', 'ID', 'CPF', 'Matrícula', 'IES', 'Lotação', 'NOME-COMPLETO']
             cols_final_Demograficos = ['NOME-COMPLETO', 'DATA-NASCIMENTO','NACIONALIDADE', 'RACA-OU-COR', 'SEXO', 'UF-NASCIMENTO']
@@ -1059,70 +3987,872 @@ class Pesquisador:
             produtos = [Bibliografico, Apresentacoes, Tecnico, Outra, Complementares]
             resumos= [self.fixDF(df,colunasResumo) for df in produtos]
             df = pd.concat(resumos)
-            df = df.replace({'':'VAZIO'})
-            df.loc[:,'flag_Nacional'] = df['PAIS'].apply(lambda val: 'Nacional' if str(val)=='Brasil' else ('Internacional' if len(val)!=0 else "VAZIO"))
-            dfPontos = df.merge(self.Pontos, on = ['PRODUCAO','NATUREZA','flag_Nacional'], how = 'left')
-            dfPontos = dfPontos.dropna(axis = 0)
-            dfPontos = dfPontos[['LATTES', 'PRODUCAO','NATUREZA','flag_Nacional','SEQUENCIA-PRODUCAO','PONTOS','MAX']]
-            dfSum = dfPontos.groupby(['LATTES', 'PRODUCAO','NATUREZA','flag_Nacional']).agg({'SEQUENCIA-PRODUCAO':'nunique', 'PONTOS':'max', 'MAX':'max'}).reset_index()
-            dfSum['Pontuacao'] = np.where(((dfSum['SEQUENCIA-PRODUCAO']*dfSum['PONTOS']<= dfSum['MAX']) & (dfSum['MAX']!=0)),
-            dfSum['SEQUENCIA-PRODUCAO']*dfSum['PONTOS'], dfSum['MAX'])
-
-            nota_Producao = dfSum['Pontuacao'].sum()
-            try:
-                CPF = self.root.find('DADOS-GERAIS').attrib['CPF']
-            except:
-                CPF = self.file.split('/')[-1].split('-')[0]
-            try:
-                ano_doutor = int(Titulacao[Titulacao['TITULACAO']=='DOUTORADO']['ANO-DE-CONCLUSAO'].max())
-            except (UnboundLocalError, ValueError, TypeError) as error:
-                ano_doutor = 0.0
-            if isinstance(CPF,str):
-                try:
-                    DATA_saap = self.SAAP
-                    DATA_saap = self.SAAP[['CPF_NUMERO','AVALIACOES']]
-                    DATA_saap.columns = ['CPF',"AVALIACOES"]
-                except AttributeError as error:
-                    n_saap = 0
-                else:
-                    DATA_saap = DATA_saap.copy()
-                    DATA_saap.loc[:,'CPF'] = DATA_saap['CPF'].astype(str)
-                    DATA_saap.loc[:,'PONTOS'] = DATA_saap['AVALIACOES']*0.25
-                    n_saap =  max(DATA_saap[DATA_saap['CPF']== CPF]['PONTOS'].values,2) if CPF in DATA_saap['CPF'].tolist() else 0
-                finally:
-                    NOTA_Doutorado = 12 if (2020-ano_doutor)<=5 else ( 8 if ano_doutor!=0 else 0)
-
-            NOTA_CVP = n_saap + NOTA_Doutorado + nota_Producao
-            AREA = self.getArea()
+            df.insert(0, 'ID', self.ID)
+            #----EDITAL, CPF e projeto vêm do nome do arquivo, também dentro de
+            #    .zip
+            caminho = caminhoLogico(self.file)
+            CPF = getattr(self, 'CPF', None)
+            if CPF is None:
+                CPF = caminho.split('/')[-1].split('-')[0]
+            AREA = self.areas
             if AREA is not None:
-                Area = ' '.join(self.getArea())
+                Area = ' '.join(AREA)
 
+            nomeArquivo = caminho.split('/')[-1].split('.')[0].split('-')
             infoCVP = {'ID':self.ID,
                         'NOME':unidecode(self.NOME.strip().upper()),
                         'CPF': CPF,
-                        'CPF_SAAP':self.file.split('/')[-1].split('.')[0].split('-')[0],
-                        'ID_proj':self.file.split('/')[-1].split('.')[0].split('-')[1],
-                        'EDITAL': self.file.split('/')[-2].split('-')[0],
-                       'AREA':Area,
-                       'PRODUCAO':nota_Producao, 'DOUTOR':ano_doutor, 'SAAP':n_saap,
-                        'NOTA':NOTA_CVP}
-            df = pd.DataFrame([infoCVP])
+                       'CPF_SAAP':nomeArquivo[0],
+                       'ID_proj':nomeArquivo[1],
+                       'EDITAL': caminho.split('/')[-2].split('-')[0],
+                       'AREA':Area}
 
-            result = [df, dfPontos, dfSum, Pessoal, Demografico, Titulacao]
+            result = {'CVP':pd.DataFrame([infoCVP]), 'Producao':df,
+                      'Pessoal':Pessoal, 'Demografico':Demografico,
+                      'Titulacao':Titulacao.assign(ID=self.ID)}
 
         else:
-            print('BAD XML:')
             return
 
         return result
 
+    @cronometrado()
+    def doSumarioUFCG(self):
+        """Chamada no jupyter notebook para gerar relatório geral do pesquisador.
+
+        Returns:
+            type: Dicionário com elementos do Sistema, Sumários e dados listados de produção.
+
+        """
+        dados = self.extraiSumario()
+        if self.kwargs.get('liberaArvore'):
+            self.liberaArvore()
+        if dados is None:
+            print('BAD XML:')
+            return
+        dfCVP, dfPontos, dfSum = pontuaCorpus(dados['CVP'], dados['Producao'],
+                                              dados['Titulacao'],
+                                              self.Pontos,
+                                              getattr(self, 'SAAP', None),
+                                              ano=anoReferencia(
+                                                  self.periodo,
+                                                  self.kwargs.get('ano')))
+        Titulacao = dados['Titulacao'].drop(columns='ID')
+        result = [dfCVP, dfPontos.drop(columns='ID'), dfSum.drop(columns='ID'),
+                  dados['Pessoal'], dados['Demografico'], Titulacao]
+        return result
+
+#----------------------------------------------------------------------------
+#------------------------- Processamento em lote-----------------------------
+#----------------------------------------------------------------------------
+def _executaMedido(funcao, ativo, *args):
+    """Executa uma tarefa do pool e devolve também as medidas do CRONOMETRO do
+    processo filho.
+
+    Args:
+        funcao (type): Função do nível do módulo `funcao`.
+        ativo (type): CRONOMETRO ligado no processo principal `ativo`.
+        *args (type): Argumentos de funcao `*args`.
+
+    Returns:
+        type: Tupla (resultado, amostras ou None).
+
+    """
+    if ativo:
+        #----Processos criados por fork herdam as amostras do processo
+        #    principal: só valem as desta tarefa
+        CRONOMETRO.ativa().limpa()
+    resultado = funcao(*args)
+    return resultado, (CRONOMETRO.extrai() if ativo else None)
+
+def _mapeiaArquivos(funcao, files, workers, *fixos, progresso=None):
+    """Aplica funcao(file, *fixos) a cada arquivo, no próprio processo ou em um
+    pool, mantendo a ordem. As medidas do CRONOMETRO feitas nos processos do
+    pool são somadas às do processo principal.
+
+    Args:
+        funcao (type): Função do nível do módulo `funcao`.
+        files (type): Lista de arquivos `files`.
+        workers (type): Número de processos; 1 executa no próprio processo
+            `workers`.
+        *fixos (type): Argumentos repetidos em todas as chamadas `*fixos`.
+        progresso (type): Função chamada com (feitos, total) a cada arquivo
+            concluído `progresso`. Defaults to None.
+
+    Returns:
+        type: Lista de resultados.
+
+    """
+    resultados = []
+    total = len(files)
+    if workers == 1:
+        for file in files:
+            resultados.append(funcao(file, *fixos))
+            if progresso is not None:
+                progresso(len(resultados), total)
+        return resultados
+    #----Blocos grandes reduzem o custo de comunicação entre processos
+    chunksize = max(1, total // (workers * 4))
+    ativo = CRONOMETRO.ativo
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for resultado, amostras in executor.map(_executaMedido, repeat(funcao),
+                                                repeat(ativo), files,
+                                                *map(repeat, fixos),
+                                                chunksize=chunksize):
+            CRONOMETRO.junta(amostras)
+            resultados.append(resultado)
+            if progresso is not None:
+                progresso(len(resultados), total)
+    return resultados
+
+def _sumarioArquivo(file, periodo, kwargs):
+    """Extrai os dados de pontuação de um único arquivo. Precisa estar no nível
+    do módulo para ser enviada aos processos do pool.
+
+    Args:
+        file (type): Caminho do XML `file`.
+        periodo (type): Período de avaliação `periodo`.
+        kwargs (type): Caminhos adicionais repassados ao Pesquisador `kwargs`.
+
+    Returns:
+        type: Tupla (file, resultado de extraiSumario ou None, mensagem de erro
+            ou None).
+
+    """
+    try:
+        pesquisador = Pesquisador(file=file, periodo=periodo, **kwargs)
+        resultado = pesquisador.extraiSumario()
+        pesquisador.liberaArvore()
+    except Exception:
+        #LOG.error("scoreCorpus: %s", file)
+        return file, None, traceback.format_exc()
+    if resultado is None:
+        return file, None, 'BAD XML'
+    return file, resultado, None
+
+def scoreCorpus(files, periodo, workers=None, progresso=None, sumarios=False,
+                ano=None, **kwargs):
+    """Pontua um conjunto de currículos. A leitura dos XML é distribuída em um
+    pool de processos e a pontuação é feita uma única vez para todo o corpus
+    com pontuaCorpus. A ordem dos resultados é a mesma da lista de arquivos.
+
+    Args:
+        files (type): Lista de caminhos de XML, por exemplo o retorno de
+            readFolder `files`.
+        periodo (type): Período para avaliação dos currículos `periodo`.
+        workers (type): Número de processos. None usa todos os núcleos, 1
+            executa no próprio processo `workers`. Defaults to None.
+        progresso (type): Função chamada com (feitos, total) a cada currículo
+            lido `progresso`. Defaults to None.
+        sumarios (type): Devolve também Pessoal, Demografico e Titulacao de
+            cada arquivo, para geraRelatorios não ler os currículos de novo
+            `sumarios`. Defaults to False.
+        ano (type): Ano de referência do bônus de doutorado; None usa o último
+            ano do período, ver anoReferencia `ano`. Defaults to None.
+        **kwargs (type): Caminhos de arquivos adicionais repassados a cada
+            Pesquisador `**kwargs`.
+
+    Returns:
+        type: Tupla (dfRanking, dfPontos, dfSum, falhas). Cada linha de
+            dfRanking é um arquivo e tem a coluna FILE; dfPontos e dfSum
+            recebem as colunas ID e FILE. falhas é uma lista [file, erro]. Com
+            sumarios a tupla tem um quinto item, o dicionário file -> resultado
+            de extraiSumario.
+
+    """
+    files = list(files)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(files)))
+    resultados = _mapeiaArquivos(_sumarioArquivo, files, workers, periodo,
+                                 kwargs, progresso=progresso)
+
+    cvps = []
+    producoes = []
+    titulacoes = []
+    falhas = []
+    extraidos = {}
+    #----A chave da pontuação é a posição do arquivo: o mesmo pesquisador em
+    #    dois arquivos (dois projetos, duas versões do CV) é pontuado duas
+    #    vezes, como em doSumarioUFCG
+    for posicao, (file, resultado, erro) in enumerate(resultados):
+        if resultado is None:
+            falhas.append([file, erro])
+            continue
+        cvps.append(resultado['CVP'].assign(ARQUIVO=posicao))
+        producoes.append(resultado['Producao'].assign(ARQUIVO=posicao))
+        titulacoes.append(resultado['Titulacao'].assign(ARQUIVO=posicao))
+        if sumarios:
+            extraidos[file] = resultado
+    if not cvps:
+        return (pd.DataFrame(), pd.DataFrame(), pd.DataFrame(),
+                falhas) + ((extraidos,) if sumarios else ())
+
+    #----Tabelas de pontos e SAAP são carregadas uma vez no processo principal
+    referencia = Pesquisador(periodo=periodo, **kwargs)
+    referencia.carregaDadosGlobais()
+    dfRanking, dfPontos, dfSum = pontuaCorpus(
+        pd.concat(cvps, ignore_index=True),
+        pd.concat(producoes, ignore_index=True),
+        pd.concat(titulacoes, ignore_index=True), referencia.Pontos,
+        getattr(referencia, 'SAAP', None), chave='ARQUIVO',
+        ano=anoReferencia(periodo, ano))
+    #----Troca a posição pelo caminho do arquivo e devolve o ID às tabelas de
+    #    produção
+    IDs = dict(zip(dfRanking['ARQUIVO'], dfRanking['ID']))
+    dfRanking = dfRanking.rename(columns={'ARQUIVO': 'FILE'})
+    dfRanking['FILE'] = [files[posicao] for posicao in dfRanking['FILE']]
+    for df in (dfPontos, dfSum):
+        posicoes = df.pop('ARQUIVO')
+        df.insert(0, 'FILE', [files[posicao] for posicao in posicoes])
+        df.insert(0, 'ID', posicoes.map(IDs).values)
+    return (dfRanking, dfPontos, dfSum,
+            falhas) + ((extraidos,) if sumarios else ())
+
+def _acervoArquivo(file, periodo, PATH, kwargs):
+    """Grava as produções de um único arquivo no acervo. Precisa estar no nível
+    do módulo para ser enviada aos processos do pool.
+
+    Args:
+        file (type): Caminho do XML `file`.
+        periodo (type): Período das produções gravadas `periodo`.
+        PATH (type): Pasta do acervo `PATH`.
+        kwargs (type): Caminhos adicionais repassados ao Pesquisador `kwargs`.
+
+    Returns:
+        type: Tupla (file, dicionário seção -> registros ou None, mensagem de
+            erro ou None).
+
+    """
+    try:
+        pesquisador = Pesquisador(file=file, periodo=periodo, **kwargs)
+        if not pesquisador.getDadosBasicos():
+            return file, None, 'BAD XML'
+        contagem = AcervoProducao(PATH).gravaPesquisador(pesquisador)
+    except Exception:
+        return file, None, traceback.format_exc()
+    return file, dict(contagem, ID=pesquisador.ID), None
+
+def exportaAcervo(files, periodo=None, PATH="../../data/processed/acervo",
+                  workers=None,
+                  **kwargs):
+    """Grava as produções de um conjunto de currículos no acervo Parquet, um
+    processo por núcleo. Cada pesquisador é gravado em arquivos próprios, então
+    os processos não disputam arquivos.
+
+    Args:
+        files (type): Lista de caminhos de XML `files`.
+        periodo (type): Anos das produções gravadas; None grava todos os anos
+            do currículo `periodo`. Defaults to None.
+        PATH (type): Pasta do acervo `PATH`. Defaults to
+            "../../data/processed/acervo".
+        workers (type): Número de processos. None usa todos os núcleos, 1
+            executa no próprio processo `workers`. Defaults to None.
+        **kwargs (type): Caminhos de arquivos adicionais repassados a cada
+            Pesquisador `**kwargs`.
+
+    Returns:
+        type: Tupla (dfContagem, falhas). dfContagem tem uma linha por arquivo
+            com os registros gravados em cada seção.
+
+    """
+    files = list(files)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(files)))
+    resultados = _mapeiaArquivos(_acervoArquivo, files, workers, periodo, PATH,
+                                 kwargs)
+    contagens = [dict(contagem, FILE=file) for file, contagem, erro
+                 in resultados if contagem is not None]
+    falhas = [[file, erro]
+              for file, contagem, erro in resultados if contagem is None]
+    dfContagem = pd.DataFrame(contagens,
+                              columns=['FILE', 'ID'] + list(SECOES_ACERVO))
+    return dfContagem, falhas
+
+class ResultadoPesquisador:
+    """Resultado compacto de um pesquisador no processamento em lote. Guarda
+    apenas os dataframes de doSumarioUFCG, sem árvore XML nem seções brutas.
+
+    Args:
+        file (type): Caminho do XML `file`.
+        ID (type): NUMERO-IDENTIFICADOR `ID`.
+        CVP (type): Linha de pontuação `CVP`.
+        Pontos (type): Produções pontuadas `Pontos`.
+        Soma (type): Pontuação por tipo de produção `Soma`.
+        Pessoal (type): Dados pessoais `Pessoal`.
+        Demografico (type): Dados demográficos `Demografico`.
+        Titulacao (type): Titulações `Titulacao`.
+
+    """
+    __slots__ = ('file', 'ID', 'CVP', 'Pontos', 'Soma', 'Pessoal',
+                 'Demografico', 'Titulacao')
+
+    def __init__(self, file, ID, CVP=None, Pontos=None, Soma=None,
+                 Pessoal=None, Demografico=None, Titulacao=None):
+        self.file = file
+        self.ID = ID
+        self.CVP = CVP
+        self.Pontos = Pontos
+        self.Soma = Soma
+        self.Pessoal = Pessoal
+        self.Demografico = Demografico
+        self.Titulacao = Titulacao
+
+    @classmethod
+    def deSumario(cls, file, resultado):
+        """Cria o resultado a partir da lista devolvida por doSumarioUFCG.
+
+        Args:
+            file (type): Caminho do XML `file`.
+            resultado (type): Lista de doSumarioUFCG `resultado`.
+
+        Returns:
+            type: ResultadoPesquisador.
+
+        """
+        CVP, Pontos, Soma, Pessoal, Demografico, Titulacao = resultado
+        return cls(file, CVP['ID'].values[0], CVP, Pontos, Soma, Pessoal,
+                   Demografico, Titulacao)
+
+    def lista(self):
+        """Mesmo formato de doSumarioUFCG.
+
+        Returns:
+            type: Lista [CVP, Pontos, Soma, Pessoal, Demografico, Titulacao].
+
+        """
+        return [self.CVP, self.Pontos, self.Soma, self.Pessoal,
+                self.Demografico, self.Titulacao]
+
+    def __repr__(self):
+        return 'ResultadoPesquisador(ID=%r, file=%r)' % (self.ID, self.file)
+
+def iteraSumarios(files, periodo, **kwargs):
+    """Gerador do processamento em lote com memória limitada: cada currículo é
+    lido, resumido e sua árvore XML é descartada antes do próximo. Apenas o
+    ResultadoPesquisador sai do gerador, então o pico de memória não cresce com
+    o número de arquivos.
+
+    Args:
+        files (type): Lista de caminhos de XML `files`.
+        periodo (type): Período para avaliação dos currículos `periodo`.
+        **kwargs (type): Caminhos de arquivos adicionais repassados a cada
+            Pesquisador `**kwargs`.
+
+    Returns:
+        type: Gera tuplas (file, ResultadoPesquisador ou None, mensagem de erro
+            ou None).
+
+    """
+    for file in files:
+        try:
+            pesquisador = Pesquisador(file=file, periodo=periodo,
+                                      **{**kwargs, 'liberaArvore': True})
+            resultado = pesquisador.doSumarioUFCG()
+        except Exception:
+            yield file, None, traceback.format_exc()
+            continue
+        finally:
+            pesquisador = None
+        if resultado is None:
+            yield file, None, 'BAD XML'
+        else:
+            yield file, ResultadoPesquisador.deSumario(file, resultado), None
+
+#----------------------------------------------------------------------------
+#------------------------- Relatórios individuais ---------------------------
+#----------------------------------------------------------------------------
+#----Mesmas seções do notebook RelatorioPessoalLattesUFCG, sem kernel nem
+#    nbconvert
+TEMPLATE_RELATORIO = 'relatorio.html'
+
+def _tabelaHTML(df):
+    """Filtro "tabela" do template: dataframe em HTML sem índice e com vazios
+    no lugar de NaN.
+
+    Args:
+        df (type): Dataframe ou None `df`.
+
+    Returns:
+        type: Markup com a tabela.
+
+    """
+    if df is None or df.empty:
+        return markupsafe.Markup('<p>Sem registros.</p>')
+    return markupsafe.Markup(df.to_html(index=False, na_rep='', border=0,
+                                        classes='tabela'))
+
+def ambienteRelatorios(PATH=None):
+    """Ambiente Jinja2 dos relatórios, criado uma única vez por processo. Os
+    templates compilados ficam no ambiente, então cada relatório só executa o
+    template.
+
+    Args:
+        PATH (type): Pasta dos templates; None usa a pasta templates do módulo
+            `PATH`. Defaults to None.
+
+    Returns:
+        type: jinja2.Environment.
+
+    """
+    if jinja2 is None:
+        raise ImportError("Relatórios em HTML precisam do jinja2")
+    if PATH:
+        path = pathHandler(PATH)
+    else:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'templates')
+    chave = ('relatorios', path)
+    if chave not in _REFERENCIAS:
+        ambiente = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(path),
+            autoescape=jinja2.select_autoescape(['html']), auto_reload=False)
+        ambiente.filters['tabela'] = _tabelaHTML
+        _REFERENCIAS[chave] = ambiente
+    return _REFERENCIAS[chave]
+
+def logoRelatorio(PATH=None):
+    """Logo da UFCG embutido no HTML, para que o relatório seja um único
+    arquivo. Lido uma vez por processo.
+
+    Args:
+        PATH (type): Caminho do PNG; None usa assets/Logo-UFCG.png do projeto
+            `PATH`. Defaults to None.
+
+    Returns:
+        type: URI data:image/png;base64 ou None se o arquivo não existe.
+
+    """
+    if PATH:
+        path = pathHandler(PATH)
+    else:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                            '..', 'assets', 'Logo-UFCG.png')
+    if not isfile(path):
+        return None
+    chave = ('logo', path, os.path.getmtime(path))
+    if chave not in _REFERENCIAS:
+        with open(path, 'rb') as arquivo:
+            conteudo = base64.b64encode(arquivo.read()).decode('ascii')
+            _REFERENCIAS[chave] = 'data:image/png;base64,' + conteudo
+    return _REFERENCIAS[chave]
+
+@lru_cache(maxsize=1)
+def _sistemaRelatorio():
+    #----Substitui !whoami, !uname -a e !python --version do notebook
+    try:
+        usuario = getpass.getuser()
+    except Exception:
+        usuario = ''
+    return {'usuario': usuario, 'plataforma': platform.platform(),
+            'python': platform.python_version()}
+
+def nomeRelatorio(CVP):
+    """Nome do arquivo do relatório, como em notebooks/relatorio.py, com o ID
+    no lugar do horário para não repetir nomes.
+
+    Args:
+        CVP (type): Dataframe de pontuação de doSumarioUFCG `CVP`.
+
+    Returns:
+        type: Nome do arquivo .html.
+
+    """
+    nome = str(CVP['NOME'].values[0]).replace(os.sep, '_')
+    return 'RelatorioLattes-{}-{}.html'.format(nome, CVP['ID'].values[0])
+
+@cronometrado()
+def renderizaRelatorio(resultado, Pontos=None, periodo=None,
+                       template=TEMPLATE_RELATORIO, PATH=None, logo=None):
+    """Relatório individual em HTML a partir da lista de doSumarioUFCG, no
+    próprio processo.
+
+    Args:
+        resultado (type): Lista [CVP, Pontos, Soma, Pessoal, Demografico,
+            Titulacao] de doSumarioUFCG ou ResultadoPesquisador.lista()
+            `resultado`.
+        Pontos (type): Tabela de pontuação mostrada em Critérios de Pontuação,
+            por exemplo Pesquisador.Pontos `Pontos`. Defaults to None.
+        periodo (type): Período da avaliação, mostrado na metodologia
+            `periodo`. Defaults to None.
+        template (type): Nome do template `template`. Defaults to
+            TEMPLATE_RELATORIO.
+        PATH (type): Pasta dos templates, ver ambienteRelatorios `PATH`.
+            Defaults to None.
+        logo (type): Caminho do logo, ver logoRelatorio `logo`. Defaults to
+            None.
+
+    Returns:
+        type: Texto HTML.
+
+    """
+    CVP, producao, pontuada, pessoal, demografico, titulacao = resultado
+    contexto = {'nome': CVP['NOME'].values[0],
+                'periodo': sorted(periodo) if periodo else None,
+                'data': dt.now().strftime('%d/%m/%Y %H:%M'),
+                'sistema': _sistemaRelatorio(),
+                'logo': logoRelatorio(logo),
+                'pessoal': pessoal,
+                'demografico': demografico,
+                'titulacao': titulacao,
+                'producao': producao,
+                'pontuada': pontuada,
+                'nota': CVP,
+                'criterios': Pontos}
+    return ambienteRelatorios(PATH).get_template(template).render(**contexto)
+
+def sumariosPontuados(dfRanking, dfPontos, dfSum, sumarios):
+    """Resultados no formato de doSumarioUFCG, um por arquivo, montados a
+    partir de scoreCorpus com sumarios=True, sem ler nem pontuar os currículos
+    de novo.
+
+    Args:
+        dfRanking (type): Ranking de scoreCorpus `dfRanking`.
+        dfPontos (type): Produções pontuadas de scoreCorpus `dfPontos`.
+        dfSum (type): Soma por tipo de produção de scoreCorpus `dfSum`.
+        sumarios (type): Dicionário file -> resultado de extraiSumario de
+            scoreCorpus `sumarios`.
+
+    Returns:
+        type: Lista de tuplas (file, [CVP, Pontos, Soma, Pessoal, Demografico,
+            Titulacao]) na ordem de dfRanking.
+
+    """
+    if dfRanking.empty:
+        return []
+    #----Um groupby para cada tabela, em vez de um filtro por pesquisador
+    pontos = dict(tuple(dfPontos.groupby('FILE', sort=False)))
+    somas = dict(tuple(dfSum.groupby('FILE', sort=False)))
+    vazio = lambda df: df.iloc[0:0]
+    resultados = []
+    for posicao, file in enumerate(dfRanking['FILE']):
+        dados = sumarios[file]
+        CVP = dfRanking.iloc[[posicao]].drop(columns='FILE')
+        CVP = CVP.reset_index(drop=True)
+        #----No corpus DOUTOR vira float; sozinho o ano é int e a ausência 0.0,
+        #    ver pontuaCorpus
+        if CVP['DOUTOR'].iloc[0] != 0:
+            CVP['DOUTOR'] = CVP['DOUTOR'].astype(int)
+        Pontos = pontos.get(file, vazio(dfPontos)).drop(columns=['ID', 'FILE'])
+        Soma = somas.get(file, vazio(dfSum)).drop(columns=['ID', 'FILE'])
+        resultados.append((file,
+                           [CVP, Pontos, Soma, dados['Pessoal'],
+                            dados['Demografico'],
+                            dados['Titulacao'].drop(columns='ID')]))
+    return resultados
+
+def _relatorioArquivo(item, periodo, PATH, kwargs):
+    """Renderiza e grava o relatório de um único arquivo já pontuado. Precisa
+    estar no nível do módulo para ser enviada aos processos do pool.
+
+    Args:
+        item (type): Tupla (file, resultado) de sumariosPontuados `item`.
+        periodo (type): Período de avaliação `periodo`.
+        PATH (type): Pasta dos relatórios `PATH`.
+        kwargs (type): Caminhos adicionais; a tabela de pontos vem de
+            pathPontos `kwargs`.
+
+    Returns:
+        type: Tupla (file, caminho do relatório ou None, mensagem de erro ou
+            None).
+
+    """
+    file, resultado = item
+    try:
+        referencia = Pesquisador(periodo=periodo, **kwargs)
+        referencia.carregaDadosGlobais()
+        html = renderizaRelatorio(resultado,
+                                  getattr(referencia, 'Pontos', None), periodo)
+        path = join(PATH, nomeRelatorio(resultado[0]))
+        with open(path, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(html)
+    except Exception:
+        return file, None, traceback.format_exc()
+    return file, path, None
+
+def geraRelatorios(files, periodo, PATH="../../reports/Pessoal", workers=None,
+                   progresso=None, pontuacao=None, **kwargs):
+    """Relatórios individuais em HTML de um conjunto de currículos, sem
+    papermill. Os currículos são lidos e pontuados uma única vez por
+    scoreCorpus, ou não são lidos quando `pontuacao` já traz esse resultado; os
+    relatórios são renderizados em um pool de processos. As tabelas de
+    referência e o template são carregados antes do pool, então os processos
+    criados por fork já os recebem prontos; nos demais cada processo carrega
+    uma única vez.
+
+    Args:
+        files (type): Lista de caminhos de XML `files`.
+        periodo (type): Período para avaliação dos currículos `periodo`.
+        PATH (type): Pasta dos relatórios `PATH`. Defaults to
+            "../../reports/Pessoal".
+        workers (type): Número de processos. None usa todos os núcleos, 1
+            executa no próprio processo `workers`. Defaults to None.
+        progresso (type): Função chamada com (feitos, total) a cada relatório
+            `progresso`. Defaults to None.
+        pontuacao (type): Retorno de scoreCorpus(files, periodo, sumarios=True)
+            `pontuacao`. Defaults to None.
+        **kwargs (type): Caminhos de arquivos adicionais repassados a cada
+            Pesquisador `**kwargs`.
+
+    Returns:
+        type: Tupla (dfRelatorios, falhas). dfRelatorios tem as colunas FILE e
+            RELATORIO; falhas inclui as de scoreCorpus.
+
+    """
+    files = list(files)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(files)))
+    if pontuacao is None:
+        pontuacao = scoreCorpus(files, periodo, workers=workers, sumarios=True,
+                                **kwargs)
+    dfRanking, dfPontos, dfSum, falhas, sumarios = pontuacao
+    itens = sumariosPontuados(dfRanking, dfPontos, dfSum, sumarios)
+    PATH = pathHandler(PATH)
+    os.makedirs(PATH, exist_ok=True)
+    Pesquisador(periodo=periodo, **kwargs).carregaDadosGlobais()
+    ambienteRelatorios().get_template(TEMPLATE_RELATORIO)
+    logoRelatorio()
+    resultados = _mapeiaArquivos(_relatorioArquivo, itens,
+                                 max(1, min(workers, len(itens))), periodo,
+                                 PATH, kwargs, progresso=progresso)
+    relatorios = [[file, path]
+                  for file, path, erro in resultados if path is not None]
+    falhas = list(falhas) + [[file, erro] for file, path, erro in resultados
+                             if path is None]
+    return pd.DataFrame(relatorios, columns=['FILE', 'RELATORIO']), falhas
+
 #-----------------------------------------------------------------------
-def main():
-    PATH = pathHandler()
-    sys.path.append(PATH)
-    #LOG.info("Rodando o módulo: %s",PATH)
-    pass
+#----------------------------------------------------------------------------
+#------------------------- Linha de comando ---------------------------------
+#----------------------------------------------------------------------------
+#----Formatos de saída: extensão e se precisa de pyarrow
+FORMATOS = {'parquet': '.parquet', 'csv': '.csv', 'xlsx': '.xlsx'}
+
+def arquivosEntrada(PATH):
+    """Currículos de uma pasta (com subpastas e .zip internos), de um padrão
+    glob de pastas, de um .zip ou de um único XML.
+
+    Args:
+        PATH (type): Pasta, padrão glob, arquivo .zip ou XML (também .xml.gz e
+            .xml.zst) `PATH`.
+
+    Returns:
+        type: Lista de caminhos, membros de .zip como
+            "arquivo.zip::membro.xml".
+
+    """
+    path = pathHandler(PATH)
+    if isdir(path) or not os.path.exists(path):
+        return readFolder(path)
+    if path.lower().endswith('.zip'):
+        membros = _abreZip(path).namelist()
+        return [path + SEPARADOR_ZIP + membro for membro in sorted(membros)
+                if membro.lower().endswith('.xml')
+                and not any(fnmatch(os.path.basename(membro), padrao)
+                            for padrao in EXCLUI_CVS)]
+    return [path]
+
+def intervaloAnos(texto):
+    """Período da linha de comando: "2016-2020", "2016:2020" ou "2016".
+
+    Args:
+        texto (type): Intervalo inclusivo `texto`.
+
+    Returns:
+        type: Lista de anos em texto, como os getters esperam.
+
+    """
+    partes = texto.replace(':', '-').split('-')
+    inicio, fim = int(partes[0]), int(partes[-1])
+    if len(partes) > 2 or fim < inicio:
+        raise ValueError("Período inválido: {}".format(texto))
+    return [str(ano) for ano in range(inicio, fim + 1)]
+
+def gravaTabela(df, PATH, formato):
+    """Grava um dataframe no formato da linha de comando.
+
+    Args:
+        df (type): Dataframe `df`.
+        PATH (type): Caminho sem extensão `PATH`.
+        formato (type): Chave de FORMATOS `formato`.
+
+    Returns:
+        type: Caminho gravado.
+
+    """
+    path = PATH + FORMATOS[formato]
+    if formato == 'parquet':
+        #----Colunas object com tipos misturados viram texto, como no acervo
+        texto = lambda coluna: coluna.astype(str).where(coluna.notna(), None)
+        df = df.apply(lambda coluna: texto(coluna) if coluna.dtype == object
+                      else coluna)
+        df.to_parquet(path, index=False)
+    elif formato == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+    return path
+
+def mostraProgresso(inicio, saida=sys.stderr):
+    """Função de progresso para scoreCorpus: currículos lidos e CVs/s.
+
+    Args:
+        inicio (type): time.perf_counter() do início `inicio`.
+        saida (type): Arquivo de texto `saida`. Defaults to sys.stderr.
+
+    Returns:
+        type: Função (feitos, total).
+
+    """
+    #----No terminal a linha é reescrita; em arquivo ou pipe sai uma linha a
+    #    cada 10%
+    terminal = saida.isatty()
+    def progresso(feitos, total):
+        passo = max(1, total // (100 if terminal else 10))
+        if feitos % passo and feitos != total:
+            return
+        segundos = time.perf_counter() - inicio
+        taxa = feitos / segundos if segundos > 0 else 0.0
+        print("{}{:>7}/{} CVs  {:5.1f}%  {:8.1f} CVs/s".format(
+                  '\r' if terminal else '', feitos, total,
+                  100.0 * feitos / total, taxa),
+              end='' if terminal and feitos != total else '\n', file=saida,
+              flush=True)
+    return progresso
+
+def main(argv=None):
+    """Ranking de um corpus de currículos pela linha de comando: python -m
+    pylattesLXML PASTA --periodo 2016-2020.
+
+    Args:
+        argv (type): Argumentos; None usa sys.argv `argv`. Defaults to None.
+
+    Returns:
+        type: Código de saída: 0 com sucesso, 1 se nenhum currículo foi
+            pontuado.
+
+    """
+    modulo = os.path.dirname(os.path.abspath(__file__))
+    anoAtual = dt.now().year
+    parser = argparse.ArgumentParser(
+        prog='python -m pylattesLXML',
+        description='Pontua um conjunto de currículos Lattes em XML.')
+    parser.add_argument('entrada',
+                        help='pasta com XML (inclusive subpastas e .zip), '
+                             'arquivo .zip ou XML')
+    parser.add_argument('--periodo',
+                        default='{}-{}'.format(anoAtual - 5, anoAtual - 1),
+                        help='anos das produções, por exemplo 2016-2020 '
+                             '(padrão: os últimos cinco anos completos)')
+    parser.add_argument('--ano', type=int, default=None,
+                        help='ano de referência do bônus de doutorado recente '
+                             '(padrão: o último ano do período)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='processos; padrão é um por núcleo, 1 roda sem '
+                             'pool')
+    parser.add_argument('--formato', choices=list(FORMATOS),
+                        default='parquet' if pyarrow is not None else 'csv')
+    parser.add_argument('--saida',
+                        default=os.path.join(modulo, '..', '..', 'reports',
+                                             'CVsranking'),
+                        help='pasta dos resultados')
+    parser.add_argument('--pontos',
+                        default=os.path.join(modulo, '..', 'data',
+                                             'pontuacao.xlsx'),
+                        help='tabela de pontuação')
+    parser.add_argument('--ufcg',
+                        default=os.path.join(modulo, '..', '..', 'data',
+                                             'external',
+                                             'SERVIDORES_UFCG.xls'),
+                        help='planilha de servidores')
+    parser.add_argument('--saap',
+                        default=os.path.join(modulo, '..', '..', 'data',
+                                             'external', 'SAAP_UFCG.xls'),
+                        help='planilha SAAP')
+    parser.add_argument('--motor', choices=['eventos'], default=None,
+                        help='extração sem árvore, ver AlvoSecoes')
+    parser.add_argument('--cache', default=None, help='pasta do CacheCV')
+    parser.add_argument('--cronometro', action='store_true',
+                        help='grava tempos por etapa em tempos.json')
+    parser.add_argument('--relatorios', action='store_true',
+                        help='gera também os relatórios individuais em HTML '
+                             'na pasta relatorios da saída')
+    args = parser.parse_args(argv)
+
+    try:
+        periodo = intervaloAnos(args.periodo)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.formato == 'parquet' and pyarrow is None:
+        parser.error('formato parquet precisa de pyarrow')
+    if args.relatorios and jinja2 is None:
+        parser.error('relatórios em HTML precisam do jinja2')
+    entrada = pathHandler(args.entrada)
+    if not os.path.exists(entrada) and not glob(entrada):
+        parser.error('entrada não encontrada: {}'.format(args.entrada))
+    files = arquivosEntrada(args.entrada)
+    if not files:
+        print('Nenhum XML em {}'.format(args.entrada), file=sys.stderr)
+        return 1
+    kwargs = {'pathPontos': args.pontos, 'pathUFCG': args.ufcg,
+              'pathSAAP': args.saap}
+    if args.ano is not None:
+        kwargs['ano'] = args.ano
+    if args.motor:
+        kwargs['motor'] = args.motor
+    if args.cache:
+        kwargs['cache'] = args.cache
+    if args.cronometro:
+        CRONOMETRO.ativa()
+    workers = args.workers or os.cpu_count() or 1
+
+    print('{} currículos, período {}-{}, {} processo(s)'.format(
+              len(files), periodo[0], periodo[-1], min(workers, len(files))),
+          file=sys.stderr)
+    inicio = time.perf_counter()
+    #----Com --relatorios a pontuação guarda também os dados pessoais, e os
+    #    relatórios não releem os currículos
+    pontuacao = scoreCorpus(files, periodo, workers=workers,
+                            progresso=mostraProgresso(inicio),
+                            sumarios=args.relatorios, **kwargs)
+    dfRanking, dfPontos, dfSum, falhas = pontuacao[:4]
+    segundos = time.perf_counter() - inicio
+    taxa = len(files) / segundos if segundos > 0 else 0.0
+    print('{} pontuados, {} falhas em {:.1f} s ({:.1f} CVs/s)'.format(
+              len(files) - len(falhas), len(falhas), segundos, taxa),
+          file=sys.stderr)
+
+    os.makedirs(args.saida, exist_ok=True)
+    base = os.path.join(args.saida, 'ranking')
+    dfFalhas = pd.DataFrame(falhas, columns=['FILE', 'ERRO'])
+    if args.formato == 'xlsx':
+        with pd.ExcelWriter(base + '.xlsx') as writer:
+            for nome, df in [('Ranking', dfRanking), ('Pontos', dfPontos),
+                             ('Soma', dfSum), ('Falhas', dfFalhas)]:
+                df.to_excel(writer, sheet_name=nome, index=False)
+        gravados = [base + '.xlsx']
+    else:
+        gravados = [gravaTabela(df, base + sufixo, args.formato)
+                    for sufixo, df in [('', dfRanking), ('_pontos', dfPontos),
+                                       ('_soma', dfSum)]]
+        gravados.append(gravaTabela(dfFalhas, base + '_falhas', 'csv'))
+    if args.relatorios:
+        inicio = time.perf_counter()
+        dfRelatorios, falhasRelatorios = geraRelatorios(
+            files, periodo, os.path.join(args.saida, 'relatorios'),
+            workers=workers, progresso=mostraProgresso(inicio),
+            pontuacao=pontuacao, **kwargs)
+        print('{} relatórios, {} falhas em {:.1f} s'.format(
+                  len(dfRelatorios), len(falhasRelatorios) - len(falhas),
+                  time.perf_counter() - inicio),
+              file=sys.stderr)
+        gravados.append(os.path.join(args.saida, 'relatorios'))
+    if args.cronometro:
+        gravados.append(os.path.join(args.saida, 'tempos.json'))
+        CRONOMETRO.json(gravados[-1])
+    for path in gravados:
+        print(path, file=sys.stderr)
+    return 0 if len(falhas) < len(files) else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 #-----------------------------------------------------------------------
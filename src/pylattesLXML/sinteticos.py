@@ -0,0 +1,476 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# UNIVERSIDADE FEDERAL DE CAMPINA GRANDE
+# PRÓ-REITORIA DE PÓS-GRADUAÇÃO
+# COORDENAÇÃO GERAL DE PESQUISA
+# PYLATTES - Currículos Lattes sintéticos para testes e medidas de desempenho.
+# Gera XML com as mesmas tags e atributos do formato exportado pelo CNPq,
+# no tamanho pedido, e as planilhas de servidores e SAAP correspondentes.
+# ---------------------------------------------------------------------------
+#----------------------------------------------------------------------------
+# INICIALIZAÇÃO
+#----------------------------------------------------------------------------
+import os
+import random
+import argparse
+
+import pandas as pd
+
+from lxml import etree
+
+#----------------------------------------------------------------------------
+#----Vocabulário dos currículos
+#----------------------------------------------------------------------------
+AREAS = [('CIENCIAS_EXATAS_E_DA_TERRA', 'Física',
+          'Física da Matéria Condensada'),
+         ('CIENCIAS_EXATAS_E_DA_TERRA', 'Matemática', 'Análise'),
+         ('CIENCIAS_EXATAS_E_DA_TERRA', 'Probabilidade e Estatística',
+          'Probabilidade'),
+         ('CIENCIAS_EXATAS_E_DA_TERRA', 'Química', 'Físico-Química'),
+         ('CIENCIAS_EXATAS_E_DA_TERRA', 'Ciência da Computação',
+          'Metodologia e Técnicas da Computação'),
+         ('ENGENHARIAS', 'Engenharia Elétrica', 'Telecomunicações'),
+         ('CIENCIAS_BIOLOGICAS', 'Ecologia', 'Ecologia Aplicada'),
+         ('CIENCIAS_HUMANAS', 'Educação', 'Ensino-Aprendizagem')]
+#----ISSN válidos e inválidos, como aparecem nos currículos: sem traço
+ISSNS = ['00319007', '03702693', '01676105', '00224596', '15334406',
+         '12345678']
+ISBNS = ['9788576051565', '9780262033848', '9788521612599', '9999999999999']
+PAISES = ['Brasil', 'Brasil', 'Brasil', 'Estados Unidos', 'Portugal', '']
+IDIOMAS = ['Português', 'Inglês', 'Espanhol']
+#----Formações na ordem em que aparecem em FORMACAO-ACADEMICA-TITULACAO
+FORMACOES = [('GRADUACAO', '1'), ('ESPECIALIZACAO', '2'), ('MESTRADO', '3'),
+             ('DOUTORADO', '4'), ('POS-DOUTORADO', '5')]
+TIPOS_TECNICA = [('SOFTWARE', 'DADOS-BASICOS-DO-SOFTWARE',
+                  'DETALHAMENTO-DO-SOFTWARE', 'TITULO-DO-SOFTWARE'),
+                 ('PATENTE', 'DADOS-BASICOS-DA-PATENTE',
+                  'DETALHAMENTO-DA-PATENTE', 'TITULO'),
+                 ('TRABALHO-TECNICO', 'DADOS-BASICOS-DO-TRABALHO-TECNICO',
+                  'DETALHAMENTO-DO-TRABALHO-TECNICO',
+                  'TITULO-DO-TRABALHO-TECNICO'),
+                 ('PRODUTO-TECNOLOGICO',
+                  'DADOS-BASICOS-DO-PRODUTO-TECNOLOGICO',
+                  'DETALHAMENTO-DO-PRODUTO-TECNOLOGICO', 'TITULO-DO-PRODUTO')]
+TIPOS_DEMAIS_TECNICA = ['APRESENTACAO-DE-TRABALHO',
+                        'CURSO-DE-CURTA-DURACAO-MINISTRADO',
+                        'ORGANIZACAO-DE-EVENTO', 'RELATORIO-DE-PESQUISA']
+ORIENTACOES = [('ORIENTACOES-CONCLUIDAS-PARA-MESTRADO',
+                'Dissertação de mestrado'),
+               ('ORIENTACOES-CONCLUIDAS-PARA-DOUTORADO', 'Tese de doutorado'),
+               ('OUTRAS-ORIENTACOES-CONCLUIDAS', 'INICIACAO_CIENTIFICA'),
+               ('OUTRAS-ORIENTACOES-CONCLUIDAS',
+                'TRABALHO_DE_CONCLUSAO_DE_CURSO_GRADUACAO')]
+#----Tamanho padrão: um pesquisador ativo
+TAMANHO = {'artigos': 20, 'eventos': 30, 'tecnicas': 8, 'titulacoes': 3,
+           'orientacoes': 10, 'participacoes': 15}
+
+#----------------------------------------------------------------------------
+#----Geração
+#----------------------------------------------------------------------------
+def cpfSintetico(indice):
+    """CPF com dígitos verificadores corretos, distinto para cada índice.
+
+    Args:
+        indice (type): Número do currículo `indice`.
+
+    Returns:
+        type: CPF com 11 dígitos.
+
+    """
+    base = '%09d' % (123456789 + 7919 * indice)
+    for tamanho in (9, 10):
+        soma = sum(int(digito) * peso
+                   for digito, peso in zip(base, range(tamanho + 1, 1, -1)))
+        base += str((soma * 10) % 11 % 10)
+    return base
+
+def nomeArquivo(indice):
+    """Nome do arquivo como vem das plataformas de submissão: CPF-PROJETO.xml.
+
+    Args:
+        indice (type): Número do currículo `indice`.
+
+    Returns:
+        type: Nome do arquivo.
+
+    """
+    return '{}-{}.xml'.format(cpfSintetico(indice), 1000 + indice)
+
+def _autores(pai, r, quantidade=3):
+    for ordem in range(1, quantidade + 1):
+        etree.SubElement(pai, 'AUTORES', {
+            'NOME-COMPLETO-DO-AUTOR': 'Autor {}'.format(r.randint(1, 500)),
+            'NOME-PARA-CITACAO': 'AUTOR, A.',
+            'ORDEM-DE-AUTORIA': str(ordem),
+            'NRO-ID-CNPQ': ''})
+
+def _palavrasChave(pai, r):
+    etree.SubElement(pai, 'PALAVRAS-CHAVE', {
+        'PALAVRA-CHAVE-{}'.format(k): 'palavra{}'.format(r.randint(1, 50))
+        for k in range(1, 4)})
+
+def _areasConhecimento(pai, r):
+    areas = etree.SubElement(pai, 'AREAS-DO-CONHECIMENTO')
+    grande, area, sub = r.choice(AREAS)
+    etree.SubElement(areas, 'AREA-DO-CONHECIMENTO-1', {
+        'NOME-GRANDE-AREA-DO-CONHECIMENTO': grande,
+        'NOME-DA-AREA-DO-CONHECIMENTO': area,
+        'NOME-DA-SUB-AREA-DO-CONHECIMENTO': sub,
+        'NOME-DA-ESPECIALIDADE': ''})
+
+def geraCV(indice, artigos=20, eventos=30, tecnicas=8, titulacoes=3,
+           orientacoes=10, participacoes=15, anos=(2010, 2020), semente=0):
+    """Gera um currículo Lattes sintético com as tags e atributos do XML do
+    CNPq. Os blocos aparecem nos mesmos níveis do formato real, incluindo os
+    elementos de nível mais profundo que os getters ignoram (AUTORES,
+    PALAVRAS-CHAVE, AREAS-DO-CONHECIMENTO, ATUACOES-PROFISSIONAIS).
+
+    Args:
+        indice (type): Número do currículo; define CPF, ID e nome `indice`.
+        artigos (type): Artigos publicados `artigos`. Defaults to 20.
+        eventos (type): Trabalhos em eventos `eventos`. Defaults to 30.
+        tecnicas (type): Produções técnicas; metade com DADOS-BASICOS no
+            terceiro nível e metade em DEMAIS-TIPOS-DE-PRODUCAO-TECNICA
+            `tecnicas`. Defaults to 8.
+        titulacoes (type): Formações acadêmicas, de GRADUACAO até POS-DOUTORADO
+            `titulacoes`. Defaults to 3.
+        orientacoes (type): Orientações concluídas `orientacoes`. Defaults to
+            10.
+        participacoes (type): Participações em congressos e bancas
+            `participacoes`. Defaults to 15.
+        anos (type): Intervalo dos anos das produções `anos`. Defaults to
+            (2010, 2020).
+        semente (type): Semente; o mesmo (indice, semente) gera o mesmo XML
+            `semente`. Defaults to 0.
+
+    Returns:
+        type: ElementTree.
+
+    """
+    r = random.Random(semente * 1000003 + indice)
+    ano = lambda: str(r.randint(*anos))
+    sequencia = iter(range(1, 10**7))
+    root = etree.Element('CURRICULO-VITAE', {
+        'SISTEMA-ORIGEM-XML': 'LATTES_OFFLINE',
+        'NUMERO-IDENTIFICADOR': '%016d' % (7000000000000000 + indice),
+        'DATA-ATUALIZACAO': '%02d%02d%d' % (r.randint(1, 28), r.randint(1, 12),
+                                            anos[1]),
+        'HORA-ATUALIZACAO': '101010'})
+    #----DADOS-GERAIS
+    dados = etree.SubElement(root, 'DADOS-GERAIS', {
+        'NOME-COMPLETO': 'Pesquisador Sintético {}'.format(indice),
+        'NOME-EM-CITACOES-BIBLIOGRAFICAS': 'SINTETICO, P.',
+        'NACIONALIDADE': 'B',
+        'CPF': cpfSintetico(indice),
+        'PAIS-DE-NASCIMENTO': 'Brasil',
+        'UF-NASCIMENTO': r.choice(['PB', 'PE', 'RN', 'SP']),
+        'CIDADE-NASCIMENTO': 'Campina Grande',
+        'DATA-NASCIMENTO': '%02d%02d%d' % (r.randint(1, 28), r.randint(1, 12),
+                                           r.randint(1950, 1990)),
+        'SEXO': r.choice(['MASCULINO', 'FEMININO']),
+        'RACA-OU-COR': r.choice(['Branca', 'Parda', 'Preta', 'Amarela',
+                                 'Indígena']),
+        'ORCID-ID': ''})
+    etree.SubElement(dados, 'RESUMO-CV', {
+        'TEXTO-RESUMO-CV-RH': 'Possui graduação e doutorado. ' * 20})
+    endereco = etree.SubElement(dados, 'ENDERECO', {
+        'FLAG-DE-PREFERENCIA': 'ENDERECO_INSTITUCIONAL'})
+    etree.SubElement(endereco, 'ENDERECO-PROFISSIONAL', {
+        'CODIGO-INSTITUICAO-EMPRESA': '002400000002',
+        'NOME-INSTITUICAO-EMPRESA': 'Universidade Federal de Campina Grande',
+        'NOME-ORGAO': 'Centro de Ciências e Tecnologia',
+        'NOME-UNIDADE': 'Unidade Acadêmica',
+        'PAIS': 'Brasil',
+        'UF': 'PB',
+        'CEP': '58429900',
+        'CIDADE': 'Campina Grande',
+        'BAIRRO': 'Universitário',
+        'E-MAIL': 'pesquisador{}@ufcg.edu.br'.format(indice)})
+    formacao = etree.SubElement(dados, 'FORMACAO-ACADEMICA-TITULACAO')
+    inicio = r.randint(1980, 2000)
+    for k, (tag, nivel) in enumerate(FORMACOES[:titulacoes]):
+        conclusao = str(inicio + 4 * (k + 1))
+        if k == titulacoes - 1 and r.random() < 0.2:
+            conclusao = ''
+        titulo = etree.SubElement(formacao, tag, {
+            'SEQUENCIA-FORMACAO': str(k + 1),
+            'NIVEL': nivel,
+            'CODIGO-INSTITUICAO': '00%d' % k,
+            'NOME-INSTITUICAO': r.choice(['UFCG', 'UFPB', 'USP', 'UNICAMP',
+                                          'UFPE']),
+            'CODIGO-CURSO': '9000%d' % k,
+            'NOME-CURSO': r.choice(AREAS)[1],
+            'STATUS-DO-CURSO': 'CONCLUIDO' if conclusao else 'EM_ANDAMENTO',
+            'ANO-DE-INICIO': str(inicio + 4 * k),
+            'ANO-DE-CONCLUSAO': conclusao,
+            'FLAG-BOLSA': 'SIM',
+            'NOME-AGENCIA': r.choice(['CNPq', 'CAPES', '']),
+            'TITULO-DA-DISSERTACAO-TESE': 'Trabalho de formação {}'.format(k),
+            'NOME-COMPLETO-DO-ORIENTADOR': 'Orientador {}'.format(k)})
+        if tag in ('MESTRADO', 'DOUTORADO'):
+            _palavrasChave(titulo, r)
+            _areasConhecimento(titulo, r)
+    atuacoes = etree.SubElement(dados, 'ATUACOES-PROFISSIONAIS')
+    atuacao = etree.SubElement(atuacoes, 'ATUACAO-PROFISSIONAL', {
+        'CODIGO-INSTITUICAO': '002400000002',
+        'NOME-INSTITUICAO': 'Universidade Federal de Campina Grande',
+        'SEQUENCIA-ATIVIDADE': '1'})
+    etree.SubElement(atuacao, 'VINCULOS', {
+        'ANO-INICIO': str(inicio + 10),
+        'TIPO-DE-VINCULO': 'SERVIDOR_PUBLICO',
+        'ENQUADRAMENTO-FUNCIONAL': 'PROFESSOR_VISITANTE',
+        'CARGA-HORARIA-SEMANAL': '40'})
+    areasAtuacao = etree.SubElement(dados, 'AREAS-DE-ATUACAO')
+    for k, (grande, area, sub) in enumerate(r.sample(AREAS, 2)):
+        etree.SubElement(areasAtuacao, 'AREA-DE-ATUACAO', {
+            'SEQUENCIA-AREA-DE-ATUACAO': str(k + 1),
+            'NOME-GRANDE-AREA-DO-CONHECIMENTO': grande,
+            'NOME-DA-AREA-DO-CONHECIMENTO': area,
+            'NOME-DA-SUB-AREA-DO-CONHECIMENTO': sub,
+            'NOME-DA-ESPECIALIDADE': ''})
+    #----PRODUCAO-BIBLIOGRAFICA
+    bibliografica = etree.SubElement(root, 'PRODUCAO-BIBLIOGRAFICA')
+    trabalhos = etree.SubElement(bibliografica, 'TRABALHOS-EM-EVENTOS')
+    for k in range(eventos):
+        anoEvento = ano()
+        trabalho = etree.SubElement(trabalhos, 'TRABALHO-EM-EVENTOS', {
+            'SEQUENCIA-PRODUCAO': str(next(sequencia))})
+        etree.SubElement(trabalho, 'DADOS-BASICOS-DO-TRABALHO', {
+            'NATUREZA': r.choice(['COMPLETO', 'RESUMO', 'RESUMO_EXPANDIDO']),
+            'TITULO-DO-TRABALHO': 'Trabalho em evento {}'.format(k),
+            'ANO-DO-TRABALHO': anoEvento,
+            'PAIS-DO-EVENTO': r.choice(PAISES),
+            'IDIOMA': r.choice(IDIOMAS),
+            'MEIO-DE-DIVULGACAO': 'IMPRESSO',
+            'HOME-PAGE-DO-TRABALHO': '',
+            'FLAG-RELEVANCIA': 'NAO',
+            'DOI': '',
+            'TITULO-DO-TRABALHO-INGLES': '',
+            'FLAG-DIVULGACAO-CIENTIFICA': 'NAO'})
+        etree.SubElement(trabalho, 'DETALHAMENTO-DO-TRABALHO', {
+            'CLASSIFICACAO-DO-EVENTO': r.choice(['NACIONAL', 'INTERNACIONAL',
+                                                 'REGIONAL']),
+            'NOME-DO-EVENTO': 'Encontro {}'.format(r.randint(1, 40)),
+            'CIDADE-DO-EVENTO': 'João Pessoa',
+            'ANO-DE-REALIZACAO': anoEvento,
+            'TITULO-DOS-ANAIS-OU-PROCEEDINGS': 'Anais',
+            'VOLUME': '1',
+            'FASCICULO': '',
+            'SERIE': '',
+            'PAGINA-INICIAL': '1',
+            'PAGINA-FINAL': '4',
+            'ISBN': r.choice(ISBNS),
+            'NOME-DA-EDITORA': 'Editora',
+            'CIDADE-DA-EDITORA': 'Recife'})
+        _autores(trabalho, r)
+        _palavrasChave(trabalho, r)
+        _areasConhecimento(trabalho, r)
+    publicados = etree.SubElement(bibliografica, 'ARTIGOS-PUBLICADOS')
+    for k in range(artigos):
+        artigo = etree.SubElement(publicados, 'ARTIGO-PUBLICADO', {
+            'SEQUENCIA-PRODUCAO': str(next(sequencia))})
+        etree.SubElement(artigo, 'DADOS-BASICOS-DO-ARTIGO', {
+            'NATUREZA': 'COMPLETO',
+            'TITULO-DO-ARTIGO': 'Artigo {}'.format(k),
+            'ANO-DO-ARTIGO': ano(),
+            'PAIS-DE-PUBLICACAO': r.choice(PAISES),
+            'IDIOMA': r.choice(IDIOMAS),
+            'MEIO-DE-DIVULGACAO': r.choice(['IMPRESSO', 'MEIO_DIGITAL']),
+            'HOME-PAGE-DO-TRABALHO': '',
+            'FLAG-RELEVANCIA': 'NAO',
+            'DOI': '10.1000/sintetico.{}.{}'.format(indice, k),
+            'TITULO-DO-ARTIGO-INGLES': '',
+            'FLAG-DIVULGACAO-CIENTIFICA': 'NAO'})
+        etree.SubElement(artigo, 'DETALHAMENTO-DO-ARTIGO', {
+            'TITULO-DO-PERIODICO-OU-REVISTA':
+                'Revista {}'.format(r.randint(1, 30)),
+            'ISSN': r.choice(ISSNS),
+            'VOLUME': str(r.randint(1, 90)),
+            'FASCICULO': '',
+            'SERIE': '',
+            'PAGINA-INICIAL': '1',
+            'PAGINA-FINAL': '10',
+            'LOCAL-DE-PUBLICACAO': ''})
+        _autores(artigo, r, r.randint(1, 6))
+        _palavrasChave(artigo, r)
+        _areasConhecimento(artigo, r)
+    demais = etree.SubElement(bibliografica,
+                              'DEMAIS-TIPOS-DE-PRODUCAO-BIBLIOGRAFICA')
+    outra = etree.SubElement(demais, 'OUTRA-PRODUCAO-BIBLIOGRAFICA', {
+        'SEQUENCIA-PRODUCAO': str(next(sequencia))})
+    etree.SubElement(outra, 'DADOS-BASICOS-DE-OUTRA-PRODUCAO', {
+        'NATUREZA': 'OUTRA',
+        'TITULO': 'Outra produção',
+        'ANO': ano(),
+        'PAIS-DE-PUBLICACAO': 'Brasil',
+        'IDIOMA': 'Português',
+        'MEIO-DE-DIVULGACAO': 'IMPRESSO'})
+    etree.SubElement(outra, 'DETALHAMENTO-DE-OUTRA-PRODUCAO', {
+        'EDITORA': 'Editora',
+        'CIDADE-DA-EDITORA': 'Recife',
+        'NUMERO-DE-PAGINAS': '10',
+        'ISSN-ISBN': r.choice(ISBNS)})
+    #----PRODUCAO-TECNICA
+    tecnica = etree.SubElement(root, 'PRODUCAO-TECNICA')
+    for k in range(tecnicas - tecnicas // 2):
+        tipo = TIPOS_TECNICA[k % len(TIPOS_TECNICA)]
+        tag, dadosTag, detalheTag, tituloTag = tipo
+        produto = etree.SubElement(tecnica, tag, {
+            'SEQUENCIA-PRODUCAO': str(next(sequencia))})
+        etree.SubElement(produto, dadosTag, {
+            'NATUREZA': 'NAO_INFORMADO',
+            tituloTag: '{} {}'.format(tag.title(), k),
+            'ANO': ano(),
+            'PAIS': 'Brasil',
+            'IDIOMA': r.choice(IDIOMAS),
+            'MEIO-DE-DIVULGACAO': 'MEIO_DIGITAL',
+            'FLAG-RELEVANCIA': 'NAO',
+            'FLAG-POTENCIAL-INOVACAO': 'NAO'})
+        etree.SubElement(produto, detalheTag, {
+            'FINALIDADE': 'Pesquisa',
+            'PLATAFORMA': 'Linux',
+            'DISPONIBILIDADE': 'IRRESTRITA',
+            'INSTITUICAO-FINANCIADORA': ''})
+        _autores(produto, r, 2)
+    demaisTecnica = etree.SubElement(tecnica,
+                                     'DEMAIS-TIPOS-DE-PRODUCAO-TECNICA')
+    for k in range(tecnicas // 2):
+        tag = TIPOS_DEMAIS_TECNICA[k % len(TIPOS_DEMAIS_TECNICA)]
+        produto = etree.SubElement(demaisTecnica, tag, {
+            'SEQUENCIA-PRODUCAO': str(next(sequencia))})
+        etree.SubElement(produto, 'DADOS-BASICOS-DA-' + tag, {
+            'NATUREZA': ('CONFERENCIA' if tag == 'APRESENTACAO-DE-TRABALHO'
+                         else 'OUTRA'),
+            'TITULO': '{} {}'.format(tag.title(), k),
+            'ANO': ano(),
+            'PAIS': 'Brasil',
+            'IDIOMA': r.choice(IDIOMAS),
+            'FLAG-RELEVANCIA': 'NAO',
+            'DOI': ''})
+        etree.SubElement(produto, 'DETALHAMENTO-DA-' + tag, {
+            'NOME-DO-EVENTO': 'Encontro {}'.format(r.randint(1, 40)),
+            'INSTITUICAO-PROMOTORA': 'UFCG',
+            'CIDADE': 'Campina Grande'})
+        _autores(produto, r, 2)
+    #----OUTRA-PRODUCAO
+    outraProducao = etree.SubElement(root, 'OUTRA-PRODUCAO')
+    concluidas = etree.SubElement(outraProducao, 'ORIENTACOES-CONCLUIDAS')
+    for k in range(orientacoes):
+        tag, natureza = r.choice(ORIENTACOES)
+        orientacao = etree.SubElement(concluidas, tag, {
+            'SEQUENCIA-PRODUCAO': str(next(sequencia))})
+        etree.SubElement(orientacao, 'DADOS-BASICOS-DE-' + tag, {
+            'NATUREZA': natureza,
+            'TIPO': 'ACADEMICO',
+            'TITULO': 'Orientação {}'.format(k),
+            'ANO': ano(),
+            'PAIS': 'Brasil',
+            'IDIOMA': 'Português',
+            'HOME-PAGE': '',
+            'FLAG-RELEVANCIA': 'NAO',
+            'DOI': ''})
+        etree.SubElement(orientacao, 'DETALHAMENTO-DE-' + tag, {
+            'TIPO-DE-ORIENTACAO': r.choice(['ORIENTADOR_PRINCIPAL',
+                                            'CO_ORIENTADOR']),
+            'NOME-DO-ORIENTADO': 'Aluno {}'.format(k),
+            'NOME-DA-INSTITUICAO': 'Universidade Federal de Campina Grande',
+            'NOME-DO-CURSO': 'Física',
+            'FLAG-BOLSA': 'SIM',
+            'NOME-DA-AGENCIA': r.choice(['CNPq', 'CAPES', ''])})
+        _palavrasChave(orientacao, r)
+    #----DADOS-COMPLEMENTARES
+    complementares = etree.SubElement(root, 'DADOS-COMPLEMENTARES')
+    eventosCongressos = etree.SubElement(complementares,
+                                         'PARTICIPACAO-EM-EVENTOS-CONGRESSOS')
+    bancas = etree.SubElement(complementares,
+                              'PARTICIPACAO-EM-BANCA-TRABALHOS-CONCLUSAO')
+    for k in range(participacoes):
+        if k % 2:
+            tag = r.choice(['PARTICIPACAO-EM-BANCA-DE-MESTRADO',
+                            'PARTICIPACAO-EM-BANCA-DE-DOUTORADO'])
+            participacao = etree.SubElement(bancas, tag, {
+                'SEQUENCIA-PRODUCAO': str(next(sequencia))})
+            etree.SubElement(participacao, 'DADOS-BASICOS-DA-' + tag, {
+                'NATUREZA': 'Mestrado' if 'MESTRADO' in tag else 'Doutorado',
+                'TITULO': 'Banca {}'.format(k),
+                'ANO': ano(),
+                'PAIS': 'Brasil',
+                'IDIOMA': 'Português'})
+            etree.SubElement(participacao, 'DETALHAMENTO-DA-' + tag, {
+                'NOME-DO-CANDIDATO': 'Candidato {}'.format(k),
+                'NOME-INSTITUICAO': 'UFPB',
+                'NOME-CURSO': 'Física'})
+        else:
+            tag = 'PARTICIPACAO-EM-CONGRESSO'
+            participacao = etree.SubElement(eventosCongressos, tag, {
+                'SEQUENCIA-PRODUCAO': str(next(sequencia))})
+            etree.SubElement(participacao, 'DADOS-BASICOS-DA-' + tag, {
+                'NATUREZA': 'OUTRA',
+                'TITULO': 'Participação {}'.format(k),
+                'ANO': ano(),
+                'PAIS': 'Brasil',
+                'IDIOMA': 'Português',
+                'TIPO-PARTICIPACAO': r.choice(['Participante',
+                                               'Apresentação Oral'])})
+            etree.SubElement(participacao, 'DETALHAMENTO-DA-' + tag, {
+                'NOME-DO-EVENTO': 'Congresso {}'.format(r.randint(1, 40)),
+                'CIDADE-DO-EVENTO': 'Natal',
+                'LOCAL-DO-EVENTO': ''})
+    return etree.ElementTree(root)
+
+def geraCorpus(PATH, quantidade, edital='EDITAL01-2020', semente=0, **tamanho):
+    """Grava um corpus de currículos sintéticos em PATH/edital, em ISO-8859-1
+    como os XML exportados pelo Lattes, e as planilhas SERVIDORES_UFCG.xlsx e
+    SAAP_UFCG.xlsx em PATH.
+
+    Args:
+        PATH (type): Pasta de destino `PATH`.
+        quantidade (type): Número de currículos `quantidade`.
+        edital (type): Subpasta com o nome do edital, usada por extraiSumario
+            `edital`. Defaults to 'EDITAL01-2020'.
+        semente (type): Semente `semente`. Defaults to 0.
+        **tamanho (type): Quantidades de geraCV, ver TAMANHO `**tamanho`.
+
+    Returns:
+        type: Lista de arquivos gravados.
+
+    """
+    tamanho = {**TAMANHO, **tamanho}
+    pasta = os.path.join(PATH, edital)
+    os.makedirs(pasta, exist_ok=True)
+    files = []
+    for indice in range(quantidade):
+        file = os.path.join(pasta, nomeArquivo(indice))
+        cv = geraCV(indice, semente=semente, **tamanho)
+        cv.write(file, encoding='ISO-8859-1', xml_declaration=True)
+        files.append(file)
+    r = random.Random(semente)
+    CPFs = [cpfSintetico(indice) for indice in range(quantidade)]
+    servidores = pd.DataFrame({
+        'CPF': CPFs,
+        'Matrícula': range(1, quantidade + 1),
+        'Lotação': [r.choice(['UAF', 'UAME', 'UAEE', 'UAEQ']) for _ in CPFs],
+        'Nome': ['Pesquisador Sintético {}'.format(indice)
+                 for indice in range(quantidade)]})
+    servidores.to_excel(os.path.join(PATH, 'SERVIDORES_UFCG.xlsx'),
+                        index=False)
+    SAAP = pd.DataFrame({'CPF_NUMERO': CPFs[::2],
+                         'AVALIACOES': [r.randint(0, 12) for _ in CPFs[::2]]})
+    SAAP.to_excel(os.path.join(PATH, 'SAAP_UFCG.xlsx'), index=False)
+    return files
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Gera currículos Lattes sintéticos.')
+    parser.add_argument('PATH', help='pasta de destino')
+    parser.add_argument('quantidade', type=int, help='número de currículos')
+    parser.add_argument('--edital', default='EDITAL01-2020')
+    parser.add_argument('--semente', type=int, default=0)
+    for chave, valor in TAMANHO.items():
+        parser.add_argument('--' + chave, type=int, default=valor)
+    args = vars(parser.parse_args(argv))
+    files = geraCorpus(args.pop('PATH'), args.pop('quantidade'), **args)
+    print('{} currículos gravados'.format(len(files)))
+
+if __name__ == "__main__":
+    main()
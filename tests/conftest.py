@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Testes de regressão do pylattesLXML em currículos sintéticos
+# (src/pylattesLXML/sinteticos.py).
+# Rodar da raiz do repositório: python -m pytest tests
+#----------------------------------------------------------------------------
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from src.pylattesLXML.sinteticos import geraCorpus, geraCV, nomeArquivo
+
+#----O módulo resolve as planilhas de referência a partir da pasta de trabalho,
+#    como nos notebooks
+PASTA_MODULO = os.path.join(RAIZ, 'src', 'pylattesLXML')
+#----Períodos de avaliação: todos os anos, parte do intervalo, um ano isolado e
+#    nenhum ano com produção
+PERIODOS = {'todos': [str(ano) for ano in range(1990, 2030)],
+            'recente': ['2017', '2018', '2019', '2020'],
+            'isolado': ['2015'],
+            'alternado': ['2016', '2019'],
+            'fora': ['1800']}
+
+@pytest.fixture(scope='session')
+def L():
+    """Módulo pylattesLXML importado com a pasta de trabalho em
+    src/pylattesLXML."""
+    anterior = os.getcwd()
+    os.chdir(PASTA_MODULO)
+    from src.pylattesLXML import pylattesLXML
+    yield pylattesLXML
+    os.chdir(anterior)
+
+def _grava(arvore, file):
+    arvore.write(file, encoding='ISO-8859-1', xml_declaration=True)
+    return file
+
+def _semSecoes(indice):
+    """Currículo sem as seções de produção técnica, outras produções e dados
+    complementares, e sem artigos."""
+    arvore = geraCV(indice, anos=(2005, 2025))
+    root = arvore.getroot()
+    for tag in ('PRODUCAO-TECNICA', 'OUTRA-PRODUCAO', 'DADOS-COMPLEMENTARES'):
+        root.remove(root.find(tag))
+    bibliografica = root.find('PRODUCAO-BIBLIOGRAFICA')
+    bibliografica.remove(bibliografica.find('ARTIGOS-PUBLICADOS'))
+    return arvore
+
+def _paisVazio(indice):
+    """Currículo com todos os atributos de país vazios."""
+    arvore = geraCV(indice, anos=(2005, 2025))
+    for el in arvore.iter():
+        for chave in el.keys():
+            if 'PAIS' in chave:
+                el.set(chave, '')
+    return arvore
+
+def comparaComSumario(L, files, periodo, workers, kwargs):
+    """Compara o resultado de scoreCorpus, convertido por sumariosPontuados,
+    com doSumarioUFCG de cada currículo.
+
+    Returns:
+        type: dfRanking de scoreCorpus.
+
+    """
+    dfRanking, dfPontos, dfSum, falhas, sumarios = L.scoreCorpus(
+        files, periodo, workers=workers, sumarios=True, **kwargs)
+    assert not falhas
+    itens = L.sumariosPontuados(dfRanking, dfPontos, dfSum, sumarios)
+    assert sorted(file for file, resultado in itens) == sorted(files)
+    for file, resultado in itens:
+        esperado = L.Pesquisador(file=file, periodo=periodo,
+                                 **kwargs).doSumarioUFCG()
+        for obtido, df in zip(resultado, esperado):
+            pd.testing.assert_frame_equal(obtido.reset_index(drop=True),
+                                          df.reset_index(drop=True))
+    return dfRanking
+
+@pytest.fixture(scope='session')
+def arquivos(tmp_path_factory):
+    """Corpus sintético com produções de 2005 a 2025, mais currículos sem
+    seções, sem produções e com países vazios.
+
+    Returns:
+        type: Lista de arquivos XML.
+
+    """
+    PATH = str(tmp_path_factory.mktemp('sinteticos'))
+    files = geraCorpus(PATH, 6, anos=(2005, 2025))
+    pasta = os.path.dirname(files[0])
+    files.append(_grava(_semSecoes(6), os.path.join(pasta, nomeArquivo(6))))
+    files.append(_grava(geraCV(7, artigos=0, eventos=0, tecnicas=0,
+                               orientacoes=0, participacoes=0),
+                        os.path.join(pasta, nomeArquivo(7))))
+    files.append(_grava(_paisVazio(8), os.path.join(pasta, nomeArquivo(8))))
+    return files
+
+@pytest.fixture(scope='session')
+def planilhas(arquivos):
+    """Planilhas de servidores e SAAP gravadas por geraCorpus, como kwargs do
+    Pesquisador."""
+    PATH = os.path.dirname(os.path.dirname(arquivos[0]))
+    return {'pathUFCG': os.path.join(PATH, 'SERVIDORES_UFCG.xlsx'),
+            'pathSAAP': os.path.join(PATH, 'SAAP_UFCG.xlsx')}
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Caminho de referência: extração pelo DOM com listas de dicionários e o dfTidy
+# original, como no pylattesLXML antes de extraiSecoes, AcumuladorColunas e
+# PlanoTidy.
+#----------------------------------------------------------------------------
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+#----Seções com blocos DETALHAMENTO usados nos dataframes
+SECOES_DETALHE = ['PRODUCAO-BIBLIOGRAFICA', 'OUTRA-PRODUCAO']
+
+def blocoLattes(root, TAG, bloco):
+    return [{'PRODUCAO': el3.tag, **el3.attrib, **el4.attrib}
+            for el1 in root.iterchildren(tag=TAG)
+            for el2 in el1.iterchildren()
+            for el3 in el2.iterchildren()
+            for el4 in el3.iterchildren() if bloco in el4.tag]
+
+def secaoReferencia(root, tag, tipos=()):
+    """Dataframe de uma seção montado como no getter original.
+
+    Args:
+        root (type): Raiz do XML `root`.
+        tag (type): Chave de ESQUEMAS `tag`.
+        tipos (type): TIPOS_PRODUCAO_TECNICA, usado em 'TIPOS-PRODUCAO-TECNICA'
+            `tipos`. Defaults to ().
+
+    Returns:
+        type: Dataframe sem arrumar.
+
+    """
+    if tag == 'FORMACAO-ACADEMICA-TITULACAO':
+        return pd.DataFrame([{'TITULACAO': el3.tag, **el3.attrib}
+                             for el1 in root.iterchildren(tag='DADOS-GERAIS')
+                             for el2 in el1.iterchildren(tag=tag)
+                             for el3 in el2.iterchildren()])
+    if tag == 'TIPOS-PRODUCAO-TECNICA':
+        tecnica = 'PRODUCAO-TECNICA'
+        return pd.DataFrame([{'PRODUCAO': el2.tag, **el2.attrib,
+                              'TIPO-PRODUCAO': el3.tag, **el3.attrib}
+                             for el1 in root.iterchildren(tag=tecnica)
+                             for el2 in el1.iterchildren()
+                             for el3 in el2.iterchildren()
+                             if any(tipo in el3.tag for tipo in tipos)])
+    dados = blocoLattes(root, tag, 'DADOS')
+    detalhe = blocoLattes(root, tag,
+                          'DETALHAMENTO') if tag in SECOES_DETALHE else []
+    return pd.concat([pd.DataFrame(dados), pd.DataFrame(detalhe)],
+                     ignore_index=True)
+
+def dfTidyReferencia(df, cols_keep, cols_merge, cols_equiv, cols_out,
+                     cols_final):
+    """dfTidy original, mantido como referência de PlanoTidy."""
+    if (not isinstance(df,pd.DataFrame) or df.empty):
+        return None
+    cols = df.columns.tolist()
+    if len(cols_keep)==0:
+        cols_keep = cols
+    if len(cols_merge)==0:
+        cols_merge = None
+    if len(cols_equiv)==0:
+        cols_equiv = None
+    if len(cols_out)==0:
+        cols_out = None
+    if cols_keep is not None:
+        cols = df.columns.tolist()
+        colG = list(OrderedDict.fromkeys([*cols_keep, *cols]))
+        for col in colG :
+            if col not in cols:
+                df.loc[:,col] = ""
+    if cols_out is not None:
+        present = {col
+                   for col in set(cols) if any(out in col
+                                               for out in set(cols_out))}
+        cols = list(set(cols) - present)
+        df = df[cols]
+    if cols_equiv is not None:
+        for col in cols_equiv.keys():
+            if col not in cols:
+                df = df.copy()
+                df.loc[:,col] = ""
+        df = df.rename(columns = cols_equiv)
+    cols = sorted(df.columns.tolist())
+    cols_merge = sorted(cols_merge)
+    if cols_merge is not None:
+        for agregado in cols_merge:
+            colmerge = sorted([col for col in cols
+                               if agregado in col] + [agregado])
+            colmerge = list(OrderedDict.fromkeys(colmerge))
+            for col in colmerge:
+                if col not in cols:
+                    df.loc[:,col]=np.nan
+            for col in colmerge[1:]:
+                if not df[col].isnull().all():
+                    df = df.copy()
+                    df.loc[:, colmerge[0]] = df.loc[:, colmerge[0]].fillna(
+                        df.loc[:, col])
+                    df = df.drop(col, axis=1)
+    cols = df.columns.tolist()
+    if len(cols_final) == 0:
+        cols_final = cols
+    colunas = list({col
+                    for col in set(cols) if any(out in col
+                                                for out in set(cols_final))})
+    return df[colunas]
+
+def tidyReferencia(root, tag, esquema, periodo=None, tipos=()):
+    """Seção arrumada pelo caminho de referência e, com periodo, filtrada
+    depois de arrumar, como nos getters originais.
+
+    Returns:
+        type: Dataframe ou None.
+
+    """
+    df = dfTidyReferencia(secaoReferencia(root, tag, tipos), **esquema)
+    if df is not None and periodo is not None:
+        df = df[df['ANO'].isin(periodo)]
+    return df
+
+def comparaTidy(obtido, esperado):
+    """Compara dois dataframes arrumados sem depender da ordem das colunas, que
+    no dfTidy original vem de um set.
+
+    """
+    if esperado is None or obtido is None:
+        assert obtido is None and esperado is None, (obtido, esperado)
+        return
+    obtido = obtido.reset_index(drop=True).sort_index(axis=1)
+    esperado = esperado.reset_index(drop=True).sort_index(axis=1)
+    pd.testing.assert_frame_equal(obtido, esperado)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# AcervoProducao: exportação do corpus e leitura com filtros de ANO e ID.
+#----------------------------------------------------------------------------
+import pandas as pd
+import pytest
+
+from conftest import PERIODOS
+
+def _ordena(df):
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+@pytest.fixture(scope='module')
+def acervo(L, arquivos, tmp_path_factory):
+    """Acervo de todo o corpus, sem filtro de período."""
+    PATH = str(tmp_path_factory.mktemp('acervo'))
+    dfContagem, falhas = L.exportaAcervo(arquivos, None, PATH, workers=1)
+    assert not falhas
+    return L.AcervoProducao(PATH), dfContagem
+
+def test_periodoNoneGravaTudo(L, arquivos, acervo, tmp_path):
+    acervo, dfContagem = acervo
+    assert sorted(dfContagem['FILE']) == sorted(arquivos)
+    for secao in L.SECOES_ACERVO:
+        assert len(acervo.carrega(secao)) == dfContagem[secao].sum()
+    #----O corpus tem produções de 2005 a 2025: o mesmo acervo de um período
+    #    com todos esses anos
+    todos = L.AcervoProducao(str(tmp_path))
+    L.exportaAcervo(arquivos, PERIODOS['todos'], todos.PATH, workers=1)
+    for secao in L.SECOES_ACERVO:
+        pd.testing.assert_frame_equal(_ordena(acervo.carrega(secao)),
+                                      _ordena(todos.carrega(secao)))
+
+def test_idaEVolta(L, arquivos, acervo):
+    acervo, dfContagem = acervo
+    for file in arquivos[:3]:
+        pesquisador = L.Pesquisador(file=file)
+        assert pesquisador.getDadosBasicos()
+        for secao, (getter, esquema) in L.SECOES_ACERVO.items():
+            esperado = getattr(pesquisador, getter)()
+            obtido = acervo.carrega(secao, IDs=[pesquisador.ID])
+            if esperado is None or esperado.empty:
+                assert obtido.empty
+                continue
+            colunas = L.AcervoProducao.colunas(secao)
+            esperado = esperado.reindex(columns=colunas + ['ANO'])
+            esperado = esperado.assign(ID=pesquisador.ID)
+            esperado = esperado.astype(str).where(esperado.notna(), None)
+            pd.testing.assert_frame_equal(_ordena(obtido[colunas + ['ANO']]),
+                                          _ordena(esperado), check_dtype=False)
+
+@pytest.mark.parametrize('periodo', ['recente', 'isolado', 'fora'])
+def test_filtroIDeAno(L, arquivos, acervo, periodo):
+    acervo, dfContagem = acervo
+    IDs = dfContagem['ID'].tolist()[:2]
+    for secao in L.SECOES_ACERVO:
+        tudo = acervo.carrega(secao)
+        filtro = tudo['ANO'].isin(PERIODOS[periodo]) & tudo['ID'].isin(IDs)
+        esperado = tudo[filtro][['ID', 'ANO']]
+        obtido = acervo.carrega(secao, PERIODOS[periodo], IDs,
+                                colunas=['ID', 'ANO'])
+        assert list(obtido.columns) == ['ID', 'ANO']
+        pd.testing.assert_frame_equal(_ordena(obtido), _ordena(esperado),
+                                      check_dtype=False)
+        #----O filtro de período é o mesmo dos getters
+        for ID in IDs:
+            file = dfContagem.loc[dfContagem['ID'] == ID, 'FILE'].iloc[0]
+            pesquisador = L.Pesquisador(file=file, periodo=PERIODOS[periodo])
+            assert pesquisador.getDadosBasicos()
+            df = getattr(pesquisador, L.SECOES_ACERVO[secao][0])()
+            assert (obtido['ID'] == ID).sum() == (0 if df is None else len(df))
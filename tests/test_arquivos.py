@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Leitura das pastas de currículos: readFolder, iteraArquivos e padrões glob.
+#----------------------------------------------------------------------------
+import os
+import shutil
+import zipfile
+
+import pytest
+
+@pytest.fixture(scope='module')
+def editais(arquivos, tmp_path_factory):
+    """Três pastas com dois currículos cada: EDITAL1, EDITAL2 (com um .zip) e
+    OUTRO."""
+    PATH = tmp_path_factory.mktemp('editais')
+    for k, pasta in enumerate(['EDITAL1', 'EDITAL2', 'OUTRO']):
+        (PATH / pasta).mkdir()
+        for file in arquivos[2*k:2*k+2]:
+            shutil.copy(file, str(PATH / pasta))
+    with zipfile.ZipFile(str(PATH / 'EDITAL2' / 'lote.zip'), 'w') as arquivo:
+        arquivo.write(arquivos[6], 'curriculo.xml')
+        arquivo.write(arquivos[6], '__MACOSX/._curriculo.xml')
+    return PATH
+
+def test_readFolderRecursivo(L, editais):
+    files = L.readFolder(str(editais))
+    assert len(files) == 7
+    lote = str(editais / 'EDITAL2' / 'lote.zip')
+    assert lote + L.SEPARADOR_ZIP + 'curriculo.xml' in files
+
+def test_readFolderPadraoGlob(L, editais):
+    files = L.readFolder(str(editais / 'EDITAL*'))
+    assert len(files) == 5
+    assert all(os.sep + 'EDITAL' in file for file in files)
+    assert (L.readFolder(str(editais / 'EDITAL1' / '*.xml'))
+            == L.readFolder(str(editais / 'EDITAL1')))
+    assert L.readFolder(str(editais / 'NADA*')) == []
+
+def test_iteraArquivosNaoRecursivo(L, editais):
+    assert list(L.iteraArquivos(str(editais), recursivo=False)) == []
+    arquivo = next(L.iteraArquivos(str(editais / 'OUTRO')))
+    assert arquivo.tamanho == os.path.getsize(arquivo.file)
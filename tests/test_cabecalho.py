@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# leCabecalho e makeDBnomes com cabecalho=True contra o parsing do XML inteiro.
+#----------------------------------------------------------------------------
+import os
+
+import pandas as pd
+
+def test_leCabecalhoIgualArvore(L, arquivos):
+    for file in arquivos:
+        root = L.parseXML(file).getroot()
+        raiz, gerais = L.leCabecalho(file)
+        assert raiz == dict(root.attrib)
+        assert gerais == dict(root.find('DADOS-GERAIS').attrib)
+
+def test_leCabecalhoSemDadosGerais(L, tmp_path):
+    file = str(tmp_path / 'semGerais.xml')
+    with open(file, 'w') as arquivo:
+        arquivo.write('<CURRICULO-VITAE NUMERO-IDENTIFICADOR="1">'
+                      '<PRODUCAO-BIBLIOGRAFICA/></CURRICULO-VITAE>')
+    assert L.leCabecalho(file) == ({'NUMERO-IDENTIFICADOR': '1'}, None)
+
+def test_leCabecalhoNaoLeORestante(L, arquivos, tmp_path):
+    #----XML truncado depois de DADOS-GERAIS: o cabeçalho é lido, o parsing
+    #    completo falha
+    with open(arquivos[0], 'rb') as arquivo:
+        conteudo = arquivo.read()
+    file = str(tmp_path / 'truncado.xml')
+    with open(file, 'wb') as arquivo:
+        fim = conteudo.index(b'<PRODUCAO-BIBLIOGRAFICA') + 30
+        arquivo.write(conteudo[:fim])
+    assert L.leCabecalho(file) == L.leCabecalho(arquivos[0])
+
+def test_makeDBnomesCabecalhoIgualCompleto(L, arquivos):
+    PATH = os.path.dirname(arquivos[0])
+    completo, ruimCompleto = L.makeDBnomes(PATH)
+    cabecalho, ruimCabecalho = L.makeDBnomes(PATH, cabecalho=True)
+    pd.testing.assert_frame_equal(cabecalho, completo)
+    pd.testing.assert_frame_equal(ruimCabecalho.reset_index(drop=True),
+                                  ruimCompleto.reset_index(drop=True))
+    assert len(completo) == len(arquivos)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# CacheCV: acerto e falta, invalidação por conteúdo e versão, remoção das
+# entradas menos usadas.
+#----------------------------------------------------------------------------
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import PERIODOS, geraCorpus, geraCV
+
+@pytest.fixture
+def corpus(tmp_path):
+    return geraCorpus(str(tmp_path / 'cvs'), 3)
+
+@pytest.fixture
+def cache(L, tmp_path):
+    return L.CacheCV(str(tmp_path / 'cache'))
+
+def _chave(L):
+    return L.CacheCV.chaveSecao('teste', PERIODOS['recente'])
+
+def test_acertoEFalta(L, corpus, cache):
+    df = pd.DataFrame({'ANO': ['2019', '2020'], 'TITULO': ['a', 'b']})
+    assert cache.carrega(corpus[0], _chave(L)) == (False, None)
+    cache.grava(corpus[0], _chave(L), df)
+    encontrado, obtido = cache.carrega(corpus[0], _chave(L))
+    assert encontrado
+    pd.testing.assert_frame_equal(obtido, df)
+    #----Outra seção, outro período e outro arquivo não são encontrados
+    outra = L.CacheCV.chaveSecao('outra', PERIODOS['recente'])
+    assert not cache.carrega(corpus[0], outra)[0]
+    isolado = L.CacheCV.chaveSecao('teste', PERIODOS['isolado'])
+    assert not cache.carrega(corpus[0], isolado)[0]
+    assert not cache.carrega(corpus[1], _chave(L))[0]
+    #----Seção vazia também é guardada
+    cache.grava(corpus[1], _chave(L), None)
+    assert cache.carrega(corpus[1], _chave(L)) == (True, None)
+
+def test_pesquisadorNaoLeXMLComCache(L, corpus, cache):
+    def producao(**kwargs):
+        pesquisador = L.Pesquisador(file=corpus[0],
+                                    periodo=PERIODOS['recente'], **kwargs)
+        assert pesquisador.getDadosBasicos()
+        return pesquisador.getProducaoBibliografica()
+    esperado = producao()
+    producao(cache=cache)
+    pesquisador = L.Pesquisador(file=corpus[0], periodo=PERIODOS['recente'],
+                                cache=L.CacheCV(cache.path))
+    assert pesquisador.getDadosBasicos()
+    assert pesquisador.root is None
+    pd.testing.assert_frame_equal(pesquisador.getProducaoBibliografica(),
+                                  esperado)
+
+def test_invalidaPorConteudo(L, corpus, cache):
+    cache.grava(corpus[0], _chave(L), pd.DataFrame({'A': [1]}))
+    #----Só o mtime muda: o hash do conteúdo é o mesmo e a entrada continua
+    #    válida
+    os.utime(corpus[0], (1, 1))
+    assert L.CacheCV(cache.path).carrega(corpus[0], _chave(L))[0]
+    #----Mesmo ID com outro conteúdo
+    geraCV(0, artigos=3).write(corpus[0], encoding='ISO-8859-1',
+                               xml_declaration=True)
+    assert not L.CacheCV(cache.path).carrega(corpus[0], _chave(L))[0]
+
+def test_invalidaPorVersao(L, corpus, cache, monkeypatch):
+    cache.grava(corpus[0], _chave(L), pd.DataFrame({'A': [1]}))
+    monkeypatch.setattr(L.CacheCV, 'VERSAO', L.CacheCV.VERSAO + 1)
+    novo = L.CacheCV(cache.path)
+    chave = L.CacheCV.chaveSecao('teste', PERIODOS['recente'])
+    assert not novo.carrega(corpus[0], chave)[0]
+
+def test_secaoCorrompida(L, corpus, cache):
+    cache.grava(corpus[0], _chave(L), pd.DataFrame({'A': [1]}))
+    ID, manifesto = cache.entrada(corpus[0])
+    with open(os.path.join(cache.path, ID, manifesto['secoes'][_chave(L)]),
+              'wb') as arquivo:
+        arquivo.write(b'\x80\x04corrompido')
+    with pytest.warns(RuntimeWarning, match='ilegível'):
+        assert cache.carrega(corpus[0], _chave(L)) == (False, None)
+
+def test_xmlIlegivelNaoEscondeErros(L, corpus, cache, tmp_path):
+    ruim = str(tmp_path / 'ruim.xml')
+    with open(ruim, 'w') as arquivo:
+        arquivo.write('<CURRICULO-VITAE')
+    pesquisador = L.Pesquisador(file=ruim, cache=cache)
+    with pytest.warns(RuntimeWarning, match='ignorada'):
+        assert not pesquisador.getDadosBasicos()
+    #----Erros que não são de leitura não são engolidos
+    with pytest.raises(AttributeError):
+        cache.carrega(None, _chave(L))
+
+def test_removeMenosUsadas(L, corpus, cache):
+    df = pd.DataFrame({'A': range(1000)})
+    IDs = []
+    for file in corpus:
+        cache.grava(file, _chave(L), df)
+        IDs.append(cache.entrada(file)[0])
+    for k, ID in enumerate(IDs):
+        os.utime(os.path.join(cache.path, ID, L.CacheCV.MANIFESTO),
+                 (100 + k, 100 + k))
+    #----Uma leitura em outro processo (outra instância) marca o acesso da
+    #    entrada mais antiga
+    assert L.CacheCV(cache.path).carrega(corpus[0], _chave(L))[0]
+    total = cache.tamanho()
+    entrada = total // len(IDs)
+    cache.max_bytes = total - entrada // 2
+    assert cache.limita() == 1
+    assert sorted(os.listdir(cache.path)) == sorted([IDs[0], IDs[2]])
+    assert cache.tamanho() <= cache.max_bytes
+    cache.max_bytes = 0
+    assert cache.limita() == 2
+    assert os.listdir(cache.path) == []
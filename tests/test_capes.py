@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Equivalência de áreas CNPq -> CAPES contra o filtro da tabela inteira.
+#----------------------------------------------------------------------------
+import os
+
+import pandas as pd
+import pytest
+from unidecode import unidecode
+
+from conftest import PASTA_MODULO
+
+TABELA = os.path.join(PASTA_MODULO, '..', 'data',
+                      'TABELA_EQUIVALENCIA_CNPQ_CAPES.csv')
+
+def _filtro(AREAS, PATH=TABELA):
+    """Áreas CAPES pelo filtro da tabela normalizada, como o getAreaCAPES
+    original, sem repetições."""
+    tabela = pd.read_csv(PATH, dtype=str).dropna()
+    tabela = tabela.applymap(lambda val: unidecode(val).strip().upper())
+    AREAS = [unidecode(area).strip().upper() for area in AREAS]
+    capes = [capes for area in AREAS
+             for capes in tabela.loc[tabela['AREA_CNPQ'] == area,
+                                     'AREA_CAPES']]
+    return list(dict.fromkeys(capes))
+
+def test_areasCAPESIgualFiltro(L):
+    equivalencia = L.equivalenciaCAPES(TABELA)
+    for area in pd.read_csv(TABELA, dtype=str)['AREA_CNPQ'].dropna().unique():
+        assert L.areasCAPES([area], equivalencia) == _filtro([area])
+    AREAS = ['Matemática', '  CIÊNCIA DA COMPUTAÇÃO ',
+             'probabilidade e estatística', 'Área inexistente']
+    assert L.areasCAPES(AREAS, equivalencia) == _filtro(AREAS)
+    assert L.areasCAPES([],
+                        equivalencia) == L.areasCAPES(None, equivalencia) == []
+
+def test_equivalenciaUmaVezPorVersao(L, tmp_path):
+    PATH = str(tmp_path / 'equivalencia.csv')
+    pd.DataFrame({'AREA_CNPQ': ['FÍSICA', 'FÍSICA', 'QUÍMICA', None],
+                  'AREA_CAPES': ['ASTRONOMIA / FÍSICA', 'ENSINO', 'QUÍMICA',
+                                 'ENSINO']}).to_csv(PATH, index=False)
+    equivalencia = L.equivalenciaCAPES(PATH)
+    assert equivalencia == {'FISICA': ('ASTRONOMIA / FISICA', 'ENSINO'),
+                            'QUIMICA': ('QUIMICA',)}
+    assert L.equivalenciaCAPES(PATH) is equivalencia
+    pd.DataFrame({'AREA_CNPQ': ['FÍSICA'],
+                  'AREA_CAPES': ['ENSINO']}).to_csv(PATH, index=False)
+    os.utime(PATH, (os.path.getmtime(PATH) + 10,) * 2)
+    assert L.equivalenciaCAPES(PATH) == {'FISICA': ('ENSINO',)}
+
+def test_areasCAPESCorpus(L):
+    AREAS = {'A': ['Matemática', 'Ciência da Computação'],
+             'B': ['Astronomia', 'Matemática'], 'C': ['Área inexistente'],
+             'D': []}
+    df = L.areasCAPESCorpus(AREAS, TABELA)
+    assert list(df.columns) == ['ID', 'AREA']
+    for ID, areas in AREAS.items():
+        assert df.loc[df['ID'] == ID, 'AREA'].tolist() == _filtro(areas)
+    #----Dataframe com uma linha por área dá o mesmo resultado
+    dfAreas = pd.DataFrame([(ID, area) for ID, areas in AREAS.items()
+                            for area in areas], columns=['ARQUIVO', 'AREA'])
+    pd.testing.assert_frame_equal(
+        L.areasCAPESCorpus(dfAreas, TABELA, chave='ARQUIVO'),
+        df.rename(columns={'ID': 'ARQUIVO'}))
+
+def test_getAreaCAPES(L, arquivos):
+    pesquisador = L.Pesquisador(file=arquivos[0])
+    assert pesquisador.getDadosBasicos()
+    assert pesquisador.areas
+    assert pesquisador.getAreaCAPES() == _filtro(pesquisador.areas)
+    assert pesquisador.getAreaCAPES(['Matemática']) == _filtro(['Matemática'])
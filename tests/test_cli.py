@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Linha de comando: intervaloAnos, arquivosEntrada e main com o ano de
+# referência do bônus de doutorado.
+#----------------------------------------------------------------------------
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import geraCorpus
+
+def test_intervaloAnos(L):
+    assert L.intervaloAnos('2016-2020') == ['2016', '2017', '2018', '2019',
+                                            '2020']
+    assert L.intervaloAnos('2016:2018') == ['2016', '2017', '2018']
+    assert L.intervaloAnos('2016') == ['2016']
+    for texto in ('2020-2016', '2016-2018-2020', 'dois mil'):
+        with pytest.raises(ValueError):
+            L.intervaloAnos(texto)
+
+def test_anoReferencia(L):
+    assert L.anoReferencia(['2016', '2020', '2018']) == 2020
+    assert L.anoReferencia(['2016', '2020'], ano='2010') == 2010
+    assert L.anoReferencia() == L.ANO_REFERENCIA
+
+def test_arquivosEntrada(L, arquivos):
+    pasta = os.path.dirname(arquivos[0])
+    assert sorted(L.arquivosEntrada(pasta)) == sorted(arquivos)
+    padrao = os.path.join(os.path.dirname(pasta), 'EDITAL*')
+    assert sorted(L.arquivosEntrada(padrao)) == sorted(arquivos)
+    assert L.arquivosEntrada(arquivos[0]) == [arquivos[0]]
+
+def test_arquivosEntradaZip(L, arquivos, tmp_path):
+    lote = str(tmp_path / 'lote.zip')
+    with zipfile.ZipFile(lote, 'w') as z:
+        for file in arquivos[:3]:
+            z.write(file, os.path.join('EDITAL', os.path.basename(file)))
+        z.writestr('LEIAME.txt', 'não é currículo')
+    esperado = sorted(lote + L.SEPARADOR_ZIP + 'EDITAL/'
+                      + os.path.basename(file) for file in arquivos[:3])
+    assert L.arquivosEntrada(lote) == esperado
+
+@pytest.fixture(scope='module')
+def doutores(tmp_path_factory):
+    """Corpus sintético com doutorado, para o bônus de doutorado recente."""
+    PATH = str(tmp_path_factory.mktemp('doutores'))
+    geraCorpus(PATH, 8, titulacoes=4, semente=3)
+    return PATH
+
+def _ranking(L, PATH, saida, *opcoes):
+    argv = [os.path.join(PATH, 'EDITAL01-2020'),
+            '--workers', '1', '--formato', 'csv', '--saida', saida,
+            '--ufcg', os.path.join(PATH, 'SERVIDORES_UFCG.xlsx'),
+            '--saap', os.path.join(PATH, 'SAAP_UFCG.xlsx')]
+    assert L.main(argv + list(opcoes)) == 0
+    for sufixo in ('', '_pontos', '_soma', '_falhas'):
+        assert os.path.exists(os.path.join(saida, 'ranking' + sufixo + '.csv'))
+    return pd.read_csv(os.path.join(saida, 'ranking.csv'))
+
+def _bonus(dfRanking, ano):
+    return np.where(ano - dfRanking['DOUTOR'] <= 5, 12,
+                    np.where(dfRanking['DOUTOR'] != 0, 8, 0))
+
+def test_mainAnoDoPeriodo(L, doutores, tmp_path):
+    dfRanking = _ranking(L, doutores, str(tmp_path / 'periodo'), '--periodo',
+                         '2012-2016')
+    assert len(dfRanking) == 8
+    assert (dfRanking['DOUTOR'] != 0).any()
+    bonus = dfRanking['NOTA'] - dfRanking['SAAP'] - dfRanking['PRODUCAO']
+    np.testing.assert_allclose(bonus, _bonus(dfRanking, 2016))
+    #----O bônus muda com o fim do período, não fica preso a 2020
+    assert not np.array_equal(_bonus(dfRanking, 2016), _bonus(dfRanking, 2030))
+
+def test_mainAnoExplicito(L, doutores, tmp_path):
+    dfRanking = _ranking(L, doutores, str(tmp_path / 'ano'), '--periodo',
+                         '2012-2016', '--ano', '2030')
+    bonus = dfRanking['NOTA'] - dfRanking['SAAP'] - dfRanking['PRODUCAO']
+    np.testing.assert_allclose(bonus, _bonus(dfRanking, 2030))
+
+def test_mainSemEntrada(L, tmp_path):
+    with pytest.raises(SystemExit):
+        L.main([str(tmp_path / 'nada'), '--formato', 'csv'])
+    with pytest.raises(SystemExit):
+        L.main([str(tmp_path), '--periodo', '2020-2016'])
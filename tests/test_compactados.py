@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# abreXML e parseXML com currículos em .zip, .xml.gz e .xml.zst, contra o XML
+# simples.
+#----------------------------------------------------------------------------
+import gzip
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+from conftest import PERIODOS
+
+def _pasta(origem, PATH):
+    """Mesma pasta do edital do original, de onde vem a coluna EDITAL."""
+    pasta = os.path.join(PATH, os.path.basename(os.path.dirname(origem)))
+    os.makedirs(pasta, exist_ok=True)
+    return pasta
+
+def _gz(origem, PATH):
+    PATH = _pasta(origem, PATH)
+    destino = os.path.join(PATH, os.path.basename(origem) + '.gz')
+    with open(origem, 'rb') as entrada, gzip.open(destino, 'wb') as saida:
+        saida.write(entrada.read())
+    return destino
+
+def _zst(origem, PATH):
+    zstandard = pytest.importorskip('zstandard')
+    PATH = _pasta(origem, PATH)
+    destino = os.path.join(PATH, os.path.basename(origem) + '.zst')
+    with open(origem, 'rb') as entrada, open(destino, 'wb') as saida:
+        saida.write(zstandard.ZstdCompressor().compress(entrada.read()))
+    return destino
+
+def _zip(origem, PATH):
+    membro = '/'.join(origem.split(os.sep)[-2:])
+    destino = os.path.join(PATH, 'lote.zip')
+    with zipfile.ZipFile(destino, 'w', zipfile.ZIP_DEFLATED) as arquivo:
+        arquivo.write(origem, membro)
+    return destino + '::' + membro
+
+FORMAS = {'gz': _gz, 'zst': _zst, 'zip': _zip}
+
+@pytest.mark.parametrize('forma', list(FORMAS))
+def test_abreXMLIgualAoSimples(L, arquivos, tmp_path, forma):
+    file = FORMAS[forma](arquivos[0], str(tmp_path))
+    assert L.compactado(file)
+    with open(arquivos[0], 'rb') as simples, L.abreXML(file) as arquivo:
+        assert arquivo.read() == simples.read()
+    raiz = L.parseXML(file).getroot()
+    esperado = L.parseXML(arquivos[0]).getroot()
+    assert raiz.attrib == esperado.attrib
+    assert len(list(raiz.iter())) == len(list(esperado.iter()))
+    assert L.leCabecalho(file) == L.leCabecalho(arquivos[0])
+
+@pytest.mark.parametrize('forma', list(FORMAS))
+def test_sumarioIgualAoSimples(L, arquivos, planilhas, tmp_path, forma):
+    file = FORMAS[forma](arquivos[1], str(tmp_path))
+    obtido = L.Pesquisador(file=file, periodo=PERIODOS['recente'],
+                           **planilhas).doSumarioUFCG()
+    esperado = L.Pesquisador(file=arquivos[1], periodo=PERIODOS['recente'],
+                             **planilhas).doSumarioUFCG()
+    for df, referencia in zip(obtido, esperado):
+        colunas = [coluna for coluna in df.columns if coluna != 'FILE']
+        pd.testing.assert_frame_equal(df[colunas], referencia[colunas])
+
+def test_readFolderEncontraCompactados(L, arquivos, tmp_path):
+    PATH = str(tmp_path)
+    esperados = {_gz(arquivos[0], PATH), _zip(arquivos[1], PATH)}
+    assert set(L.readFolder(PATH)) == esperados
+    #----Membros de .zip usam tamanho e mtime do .zip
+    membro = [file for file in esperados if L.SEPARADOR_ZIP in file][0]
+    stat = os.stat(membro.split(L.SEPARADOR_ZIP)[0])
+    assert L.assinaturaXML(membro) == (stat.st_size, stat.st_mtime_ns)
+
+def test_zstSemZstandard(L, arquivos, tmp_path, monkeypatch):
+    file = str(tmp_path / 'cv.xml.zst')
+    with open(file, 'wb') as arquivo:
+        arquivo.write(b'\x28\xb5\x2f\xfd')
+    monkeypatch.setattr(L, 'zstandard', None)
+    with pytest.raises(ImportError, match='zstandard'):
+        L.abreXML(file)
+    assert not L.Pesquisador(file=file).getDadosBasicos()
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Medidas do CRONOMETRO trazidas dos processos do pool.
+#----------------------------------------------------------------------------
+import pytest
+
+from conftest import PERIODOS
+
+@pytest.fixture
+def cronometro(L):
+    ativo = L.CRONOMETRO.ativo
+    L.CRONOMETRO.limpa().ativa()
+    yield L.CRONOMETRO
+    L.CRONOMETRO.limpa()
+    if not ativo:
+        L.CRONOMETRO.desativa()
+
+def _contagens(cronometro):
+    return dict(zip(cronometro.tabela()['ETAPA'], cronometro.tabela()['N']))
+
+def test_poolNaoRepeteAmostras(L, arquivos, planilhas, cronometro):
+    for _ in range(2):
+        L.scoreCorpus(arquivos, PERIODOS['recente'], workers=2, **planilhas)
+    N = _contagens(cronometro)
+    assert N['pontuaCorpus'] == 2
+    assert N['getProducaoBibliografica'] == 2 * len(arquivos)
+
+def test_poolIgualUmProcesso(L, arquivos, planilhas, cronometro):
+    L.scoreCorpus(arquivos, PERIODOS['recente'], workers=1, **planilhas)
+    sequencial = _contagens(cronometro)
+    cronometro.limpa()
+    L.scoreCorpus(arquivos, PERIODOS['recente'], workers=3, **planilhas)
+    paralelo = _contagens(cronometro)
+    #----Cada processo do pool lê as planilhas que ainda não tem no seu
+    #    registro
+    for contagens in (sequencial, paralelo):
+        contagens.pop('carregaTabela', None)
+    assert paralelo == sequencial
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# ResolvedorDOI contra um servidor HTTP local no lugar do Crossref.
+#----------------------------------------------------------------------------
+import json
+import sqlite3
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+class Crossref(BaseHTTPRequestHandler):
+    """Resposta pelo sufixo do DOI: ok -> 200, vazio -> 200 sem ISSN, falta ->
+    404, proibido -> 403, lento -> 429 na primeira vez, instavel -> 503
+    sempre."""
+    contagem = {}
+
+    def log_message(self, *args):
+        pass
+
+    def responde(self, status, corpo=None, cabecalhos=()):
+        self.send_response(status)
+        for chave, valor in cabecalhos:
+            self.send_header(chave, valor)
+        self.end_headers()
+        if corpo is not None:
+            self.wfile.write(json.dumps(corpo).encode('utf-8'))
+
+    def do_GET(self):
+        sufixo = self.path.rsplit('/', 1)[-1]
+        self.contagem[sufixo] = self.contagem.get(sufixo, 0) + 1
+        if sufixo == 'ok':
+            self.responde(200, {'message': {'ISSN': ['0031-9007']}})
+        elif sufixo == 'vazio':
+            self.responde(200, {'message': {}})
+        elif sufixo == 'falta':
+            self.responde(404)
+        elif sufixo == 'proibido':
+            self.responde(403)
+        elif sufixo == 'lento' and self.contagem[sufixo] == 1:
+            #----Retry-After muito maior que esperaMaxima
+            self.responde(429, cabecalhos=[('Retry-After', '3600')])
+        elif sufixo == 'lento':
+            self.responde(200, {'message': {'ISSN': ['0370-2693']}})
+        else:
+            self.responde(503)
+
+@pytest.fixture
+def servidor():
+    Crossref.contagem = {}
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Crossref)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}/works/'.format(servidor.server_port)
+    servidor.shutdown()
+    servidor.server_close()
+
+@pytest.fixture
+def resolvedor(L, servidor, tmp_path):
+    return L.ResolvedorDOI(PATH=str(tmp_path / 'doi.sqlite'),
+                           endpoint=servidor, concorrencia=2,
+                           tentativas=3, espera=0.01, esperaMaxima=0.2,
+                           timeout=5)
+
+def _cache(resolvedor):
+    with sqlite3.connect(resolvedor.PATH) as conexao:
+        consulta = conexao.execute('SELECT doi, resultado FROM doi')
+        return {doi: json.loads(resultado) for doi, resultado in consulta}
+
+def test_resultados(resolvedor):
+    inicio = time.perf_counter()
+    resultados = resolvedor.resolve(['10.1/ok', 'https://doi.org/10.1/OK',
+                                     '10.1/vazio', '10.1/falta',
+                                     '10.1/proibido', '10.1/lento',
+                                     '10.1/instavel', None])
+    assert resultados == [['0031-9007'], ['0031-9007'], 'NAO_ENCONTRADO',
+                          'INVALIDO', 'ERRO', ['0370-2693'], 'ERRO',
+                          'INVALIDO']
+    #----Retry-After de uma hora limitado por esperaMaxima
+    assert time.perf_counter() - inicio < 5
+    assert Crossref.contagem == {'ok': 1, 'vazio': 1, 'falta': 1,
+                                 'proibido': 1, 'lento': 2, 'instavel': 3}
+
+def test_cacheSoDefinitivos(resolvedor):
+    resolvedor.resolve(['10.1/ok', '10.1/falta', '10.1/proibido',
+                        '10.1/instavel'])
+    assert _cache(resolvedor) == {'10.1/ok': ['0031-9007'],
+                                  '10.1/falta': 'INVALIDO'}
+    #----Na segunda vez só os erros transitórios são consultados de novo
+    Crossref.contagem.clear()
+    resultados = resolvedor.resolve(['10.1/ok', '10.1/falta', '10.1/proibido'])
+    assert resultados == [['0031-9007'], 'INVALIDO', 'ERRO']
+    assert Crossref.contagem == {'proibido': 1}
+
+def test_intervaloLimitado(resolvedor):
+    assert resolvedor.intervalo(0, '3600') == resolvedor.esperaMaxima
+    assert resolvedor.intervalo(0, '0.05') == 0.05
+    assert resolvedor.intervalo(10) == resolvedor.esperaMaxima
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# iteraSumarios: processamento em lote, um currículo por vez, sem guardar
+# árvores XML.
+#----------------------------------------------------------------------------
+import gc
+import weakref
+
+import pandas as pd
+
+from conftest import PERIODOS
+
+def test_iteraSumariosIgualDoSumario(L, arquivos, planilhas):
+    resultados = list(L.iteraSumarios(arquivos, PERIODOS['recente'],
+                                      **planilhas))
+    assert [file for file, resultado, erro in resultados] == arquivos
+    for file, resultado, erro in resultados:
+        assert erro is None
+        assert isinstance(resultado, L.ResultadoPesquisador)
+        assert resultado.file == file
+        esperado = L.Pesquisador(file=file, periodo=PERIODOS['recente'],
+                                 **planilhas).doSumarioUFCG()
+        assert resultado.ID == esperado[0]['ID'].values[0]
+        for obtido, df in zip(resultado.lista(), esperado):
+            pd.testing.assert_frame_equal(obtido, df)
+
+def test_iteraSumariosLiberaArvores(L, arquivos, planilhas, monkeypatch):
+    vistos = []
+    original = L.Pesquisador.doSumarioUFCG
+    def registrado(self):
+        vistos.append(weakref.ref(self))
+        resultado = original(self)
+        #----A árvore e as seções brutas são descartadas antes de o resultado
+        #    sair do gerador
+        assert self.root is None and self.secoes is None
+        return resultado
+    monkeypatch.setattr(L.Pesquisador, 'doSumarioUFCG', registrado)
+    gerador = L.iteraSumarios(arquivos, PERIODOS['recente'], **planilhas)
+    for k, (file, resultado, erro) in enumerate(gerador):
+        #----Preguiçoso: só o currículo atual foi lido, e o anterior já pode
+        #    ser coletado
+        assert len(vistos) == k + 1
+        gc.collect()
+        assert all(ref() is None for ref in vistos)
+        assert not hasattr(resultado, '__dict__')
+
+def test_iteraSumariosFalhas(L, arquivos, planilhas, tmp_path):
+    ruim = str(tmp_path / 'ruim.xml')
+    with open(ruim, 'w') as arquivo:
+        arquivo.write('não é XML')
+    inexistente = str(tmp_path / 'inexistente.xml')
+    resultados = list(L.iteraSumarios([ruim, arquivos[0], inexistente],
+                                      PERIODOS['recente'], **planilhas))
+    esperado = [(ruim, True), (arquivos[0], False), (inexistente, True)]
+    assert [(file, resultado is None)
+            for file, resultado, erro in resultados] == esperado
+    assert resultados[0][2] == 'BAD XML'
+    assert resultados[1][2] is None
+    assert resultados[2][2]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Motor 'eventos' (AlvoSecoes, sem árvore) contra o motor padrão pelo DOM.
+#----------------------------------------------------------------------------
+import pandas as pd
+import pytest
+
+from lxml import etree
+
+from conftest import PERIODOS
+from referencia import comparaTidy
+
+GETTERS = ['getDadosPessoais', 'getDadosTitulacao', 'getArea',
+           'getProducaoBibliografica', 'getProducaoTecnica',
+           'getApresentacoes', 'getProducaoOutra', 'getDadosComplementares']
+
+def _compara(obtido, esperado):
+    if isinstance(esperado, pd.DataFrame) or esperado is None:
+        comparaTidy(obtido, esperado)
+    else:
+        assert obtido == esperado
+
+def test_secoesIguais(L, arquivos):
+    for file in arquivos:
+        dom = L.extraiSecoes(etree.parse(file).getroot(), PERIODOS['recente'])
+        eventos = L.extraiSecoesEventos(file, PERIODOS['recente']).secoes
+        assert list(eventos) == list(dom)
+        for tag, secao in dom.items():
+            primeiro = secao[0] if isinstance(secao, list) and secao else None
+            if isinstance(secao, list) and not isinstance(
+                    primeiro, L.AcumuladorColunas):
+                assert eventos[tag] == secao, tag
+            else:
+                acumuladores = secao if isinstance(secao, list) else [secao]
+                outros = eventos[tag]
+                if not isinstance(outros, list):
+                    outros = [outros]
+                for a, b in zip(outros, acumuladores):
+                    pd.testing.assert_frame_equal(a.dataframe(), b.dataframe())
+                    assert a.descartadas == b.descartadas
+
+@pytest.mark.parametrize('periodo', PERIODOS.values(), ids=list(PERIODOS))
+def test_gettersIguais(L, arquivos, planilhas, periodo):
+    for file in arquivos:
+        dom = L.Pesquisador(file=file, periodo=periodo, **planilhas)
+        eventos = L.Pesquisador(file=file, periodo=periodo, motor='eventos',
+                                **planilhas)
+        assert dom.getDadosBasicos() and eventos.getDadosBasicos()
+        assert (eventos.ID, eventos.NOME, eventos.Atualiza,
+                eventos.CPF) == (dom.ID, dom.NOME, dom.Atualiza, dom.CPF)
+        for getter in GETTERS:
+            _compara(getattr(eventos, getter)(), getattr(dom, getter)())
+
+@pytest.mark.parametrize('periodo', [PERIODOS['recente'], PERIODOS['fora']],
+                         ids=['recente', 'fora'])
+def test_sumarioIgual(L, arquivos, planilhas, periodo):
+    for file in arquivos:
+        dom = L.Pesquisador(file=file, periodo=periodo,
+                            **planilhas).doSumarioUFCG()
+        eventos = L.Pesquisador(file=file, periodo=periodo, motor='eventos',
+                                **planilhas).doSumarioUFCG()
+        assert len(eventos) == len(dom)
+        for obtido, esperado in zip(eventos, dom):
+            pd.testing.assert_frame_equal(obtido, esperado)
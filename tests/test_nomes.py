@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# IndiceNomes e a busca do arquivo pelo nome do pesquisador.
+#----------------------------------------------------------------------------
+import os
+from difflib import SequenceMatcher
+
+import pandas as pd
+import pytest
+
+from conftest import geraCV, geraCorpus, nomeArquivo
+
+NOMES = ['MARIA DA SILVA', 'MARIA DA SILVA SOUZA', 'JOSE PEREIRA LIMA',
+         'JOAO COSTA', 'ANA MARIA ALVES']
+
+@pytest.fixture
+def indice(L, monkeypatch):
+    df = pd.DataFrame({'FILE': ['/cvs/{}.xml'.format(k)
+                                for k in range(len(NOMES))],
+                       'ID': [7000000000000000 + k for k in range(len(NOMES))],
+                       'CPF': ['' for _ in NOMES],
+                       'NOME': NOMES})
+    indice = L.IndiceNomes(df)
+    monkeypatch.setattr(L.IndiceNomes, 'carrega',
+                        classmethod(lambda cls, PATH=None: indice))
+    return indice
+
+def test_arquivoPeloNome(L, indice):
+    pesquisador = L.Pesquisador(nome='José Pereira Lima')
+    assert pesquisador.getFileFromNome() == '/cvs/2.xml'
+    assert indice.arquivoID(7000000000000003) == '/cvs/3.xml'
+
+def test_nomeDesconhecidoLevantaKeyError(L, indice):
+    with pytest.raises(KeyError, match='NINGUEM'):
+        L.Pesquisador(nome='Ninguem').getFileFromNome()
+
+def test_nomeAproximado(L, indice):
+    pesquisador = L.Pesquisador(nome='Jose Pereira Lma', nomeAproximado=True)
+    assert pesquisador.getFileFromNome() == '/cvs/2.xml'
+
+@pytest.mark.parametrize('busca',
+                         ['MARIA SILVA', 'MARIA DA SILVA SOUSA', 'ANA ALVES',
+                          'JOAO DA COSTA'])
+@pytest.mark.parametrize('limite', [0.5, 0.85])
+def test_aproximadoIgualForcaBruta(L, indice, busca, limite):
+    #----Candidatos são os nomes com algum trigrama em comum com a busca
+    candidatos = [nome for nome in NOMES
+                  if indice.trigramas(nome) & indice.trigramas(busca)]
+    esperado = sorted(((nome, SequenceMatcher(None, busca, nome).ratio(),
+                        indice.porNome[nome]) for nome in candidatos),
+                      key=lambda val: (-val[1], val[0]))
+    esperado = [val for val in esperado if val[1] >= limite][:3]
+    assert indice.aproximado(busca, limite, n=3) == esperado
+
+def _ordena(df):
+    return df.astype(str).sort_values(list(df.columns)).reset_index(drop=True)
+
+def _comparaCompleto(L, PATH, manifesto):
+    df, dfRuim = L.makeDBnomes(PATH, incremental=True, manifesto=manifesto)
+    esperado, esperadoRuim = L.makeDBnomes(PATH)
+    pd.testing.assert_frame_equal(_ordena(df), _ordena(esperado))
+    pd.testing.assert_frame_equal(_ordena(dfRuim), _ordena(esperadoRuim))
+    return df
+
+def test_makeDBnomesIncrementalIgualCompleto(L, tmp_path):
+    PATH = str(tmp_path / 'cvs')
+    files = geraCorpus(PATH, 5)
+    pasta = os.path.dirname(files[0])
+    manifesto = str(tmp_path / 'manifesto.csv')
+    assert len(_comparaCompleto(L, PATH, manifesto)) == 5
+    #----Novo, alterado (outro pesquisador no mesmo arquivo) e removido
+    geraCV(5).write(os.path.join(pasta, nomeArquivo(5)), encoding='ISO-8859-1',
+                    xml_declaration=True)
+    geraCV(9).write(files[1], encoding='ISO-8859-1', xml_declaration=True)
+    os.utime(files[1], (1, 1))
+    os.remove(files[2])
+    df = _comparaCompleto(L, PATH, manifesto)
+    assert 'PESQUISADOR SINTETICO 9' in set(df['NOME'])
+    assert 'PESQUISADOR SINTETICO 2' not in set(df['NOME'])
+    assert len(df) == 5
+
+def test_makeDBnomesManifestoDeOutroCaminho(L, tmp_path):
+    PATH, OUTRO = str(tmp_path / 'cvs'), str(tmp_path / 'outros')
+    geraCorpus(PATH, 3)
+    geraCorpus(OUTRO, 4, semente=1)
+    assert L.manifestoNomes(PATH) != L.manifestoNomes(OUTRO)
+    manifesto = str(tmp_path / 'manifesto.csv')
+    _comparaCompleto(L, PATH, manifesto)
+    #----O mesmo manifesto em outra pasta não reaproveita as entradas da
+    #    primeira
+    assert len(_comparaCompleto(L, OUTRO, manifesto)) == 4
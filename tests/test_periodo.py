@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Filtro de período durante a extração (AcumuladorColunas) contra o filtro
+# aplicado depois do dfTidy, nos currículos sintéticos.
+#----------------------------------------------------------------------------
+import pytest
+
+from lxml import etree
+
+from conftest import PERIODOS
+from referencia import tidyReferencia, comparaTidy
+
+SECOES = ['PRODUCAO-BIBLIOGRAFICA', 'TIPOS-PRODUCAO-TECNICA',
+          'PRODUCAO-TECNICA', 'OUTRA-PRODUCAO', 'DADOS-COMPLEMENTARES']
+GETTERS = ['getProducaoBibliografica', 'getProducaoTecnica',
+           'getApresentacoes', 'getProducaoOutra', 'getDadosComplementares']
+
+def _tidyExtraido(L, secoes, tag, periodo):
+    lista = secoes[tag]
+    if not isinstance(lista, list):
+        lista = [lista]
+    df, descartadas = L.juntaAcumuladores(*lista)
+    if df.empty and not descartadas:
+        return None
+    df = L.Pesquisador().dfTidy(df, naoNulas=descartadas, **L.ESQUEMAS[tag])
+    return df[df['ANO'].isin(periodo)]
+
+@pytest.mark.parametrize('periodo', PERIODOS.values(), ids=list(PERIODOS))
+@pytest.mark.parametrize('tag', SECOES)
+def test_secaoFiltradaNaExtracao(L, arquivos, tag, periodo):
+    for file in arquivos:
+        root = etree.parse(file).getroot()
+        esperado = tidyReferencia(root, tag, L.ESQUEMAS[tag], periodo,
+                                  L.TIPOS_PRODUCAO_TECNICA)
+        comparaTidy(_tidyExtraido(L, L.extraiSecoes(root, periodo), tag,
+                                  periodo), esperado)
+
+def test_descartadasForaDoPeriodo(L, arquivos):
+    root = etree.parse(arquivos[0]).getroot()
+    dados, detalhe = L.extraiSecoes(root,
+                                    PERIODOS['fora'])['PRODUCAO-BIBLIOGRAFICA']
+    assert dados.dataframe().empty and detalhe.dataframe().empty
+    assert 'ANO-DO-ARTIGO' in dados.descartadas
+
+@pytest.mark.parametrize('motor', [None, 'eventos'])
+@pytest.mark.parametrize('periodo', PERIODOS.values(), ids=list(PERIODOS))
+def test_gettersFiltradosNaExtracao(L, arquivos, motor, periodo):
+    for file in arquivos:
+        filtrado = L.Pesquisador(file=file, periodo=periodo, motor=motor)
+        completo = L.Pesquisador(file=file, periodo=periodo)
+        assert filtrado.getDadosBasicos() and completo.getDadosBasicos()
+        completo.secoes = L.extraiSecoes(completo.getRaiz(), None)
+        for getter in GETTERS:
+            comparaTidy(getattr(filtrado, getter)(),
+                        getattr(completo, getter)())
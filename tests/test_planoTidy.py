@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# PlanoTidy contra o dfTidy original nas seções de currículos sintéticos.
+#----------------------------------------------------------------------------
+import pytest
+
+from lxml import etree
+
+from referencia import secaoReferencia, dfTidyReferencia, comparaTidy
+
+SECOES = ['FORMACAO-ACADEMICA-TITULACAO', 'PRODUCAO-BIBLIOGRAFICA',
+          'TIPOS-PRODUCAO-TECNICA', 'PRODUCAO-TECNICA', 'OUTRA-PRODUCAO',
+          'DADOS-COMPLEMENTARES']
+
+@pytest.mark.parametrize('tag', SECOES)
+def test_planoIgualDfTidy(L, arquivos, tag):
+    esquema = L.ESQUEMAS[tag]
+    pesquisador = L.Pesquisador()
+    for file in arquivos:
+        root = etree.parse(file).getroot()
+        secao = secaoReferencia(root, tag, L.TIPOS_PRODUCAO_TECNICA)
+        esperado = dfTidyReferencia(secao, **esquema)
+        secao = secaoReferencia(root, tag, L.TIPOS_PRODUCAO_TECNICA)
+        obtido = pesquisador.dfTidy(secao, **esquema)
+        comparaTidy(obtido, esperado)
+
+def test_planoReaproveitado(L, arquivos):
+    esquema = L.ESQUEMAS['PRODUCAO-BIBLIOGRAFICA']
+    assert L.PlanoTidy.compila(**esquema) is L.PlanoTidy.compila(**esquema)
+    root = etree.parse(arquivos[0]).getroot()
+    df = secaoReferencia(root, 'PRODUCAO-BIBLIOGRAFICA')
+    plano = L.PlanoTidy.compila(**esquema)
+    comparaTidy(plano.aplica(df), plano.aplica(df.copy()))
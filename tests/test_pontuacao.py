@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Pontuação SAAP com CPFs em formatos diferentes e scoreCorpus em vários
+# processos contra doSumarioUFCG.
+#----------------------------------------------------------------------------
+import os
+
+import numpy as np
+import pandas as pd
+
+from conftest import PERIODOS, comparaComSumario, geraCorpus
+
+def test_pontuaSAAPNormalizaCPF(L):
+    SAAP = pd.DataFrame({'CPF_NUMERO': [12345678909, '012.345.678-90',
+                                        98765432100.0, '98765432100', np.nan],
+                         'AVALIACOES': [12, 4, 1, 9, 20]})
+    CPFs = pd.Series(['123.456.789-09', '01234567890', '98765432100', '',
+                      None])
+    #----Zeros à esquerda e pontuação não importam; CPF repetido fica com a
+    #    maior pontuação; sem CPF não pontua
+    assert L.pontuaSAAP(CPFs, SAAP).tolist() == [3.0, 2.0, 2.25, 0.0, 0.0]
+    assert L.pontuaSAAP(CPFs).tolist() == [0, 0, 0, 0, 0]
+
+def test_scoreCorpusCPFsNumericos(L, tmp_path):
+    PATH = str(tmp_path / 'cvs')
+    files = geraCorpus(PATH, 6)
+    #----Planilha SAAP com CPFs como número e com pontuação, como vêm dos
+    #    sistemas da universidade
+    SAAP = pd.read_excel(os.path.join(PATH, 'SAAP_UFCG.xlsx'),
+                         dtype={'CPF_NUMERO': str})
+    formata = lambda CPF: '{}.{}.{}-{}'.format(CPF[:3], CPF[3:6], CPF[6:9],
+                                               CPF[9:])
+    SAAP['CPF_NUMERO'] = [int(CPF) if k % 2 else formata(CPF)
+                          for k, CPF in enumerate(SAAP['CPF_NUMERO'])]
+    SAAP.to_excel(os.path.join(PATH, 'SAAP_UFCG.xlsx'), index=False)
+    kwargs = {'pathUFCG': os.path.join(PATH, 'SERVIDORES_UFCG.xlsx'),
+              'pathSAAP': os.path.join(PATH, 'SAAP_UFCG.xlsx')}
+    dfRanking = comparaComSumario(L, files, PERIODOS['recente'], 2, kwargs)
+    assert (dfRanking['SAAP'] > 0).sum() == len(SAAP)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Seções preguiçosas do Pesquisador: calculadas na primeira leitura e
+# descartadas quando file ou periodo mudam.
+#----------------------------------------------------------------------------
+import pandas as pd
+import pytest
+
+from conftest import PERIODOS
+
+SECOES = {'areas': 'getArea', 'pessoais': 'getDadosPessoais',
+          'titulacao': 'getDadosTitulacao',
+          'bibliografica': 'getProducaoBibliografica',
+          'tecnica': 'getProducaoTecnica', 'apresentacoes': 'getApresentacoes',
+          'outra': 'getProducaoOutra',
+          'complementares': 'getDadosComplementares'}
+
+@pytest.fixture
+def chamadas(L, monkeypatch):
+    """Conta as chamadas de cada getter das seções preguiçosas."""
+    contagem = {getter: 0 for getter in SECOES.values()}
+    for getter in SECOES.values():
+        original = getattr(L.Pesquisador, getter)
+        def contado(self, original=original, getter=getter):
+            contagem[getter] += 1
+            return original(self)
+        monkeypatch.setattr(L.Pesquisador, getter, contado)
+    return contagem
+
+def _igual(obtido, esperado):
+    if isinstance(esperado, pd.DataFrame):
+        pd.testing.assert_frame_equal(obtido, esperado)
+    else:
+        assert obtido == esperado
+
+def _esperado(L, file, periodo, getter, planilhas):
+    pesquisador = L.Pesquisador(file=file, periodo=periodo, **planilhas)
+    assert pesquisador.getDadosBasicos()
+    return getattr(pesquisador, getter)()
+
+def test_calculadaUmaVez(L, arquivos, planilhas, chamadas):
+    pesquisador = L.Pesquisador(file=arquivos[0], periodo=PERIODOS['recente'],
+                                **planilhas)
+    #----Sem chamar getDadosBasicos: a primeira leitura lê o XML
+    for atributo, getter in SECOES.items():
+        valor = getattr(pesquisador, atributo)
+        assert getattr(pesquisador, atributo) is valor
+        assert chamadas[getter] == 1
+    for atributo, getter in SECOES.items():
+        _igual(getattr(pesquisador, atributo),
+               _esperado(L, arquivos[0], PERIODOS['recente'], getter,
+                         planilhas))
+
+def test_periodoDescartaSoAsDoPeriodo(L, arquivos, planilhas, chamadas):
+    pesquisador = L.Pesquisador(file=arquivos[0], periodo=PERIODOS['recente'],
+                                **planilhas)
+    antes = {atributo: getattr(pesquisador, atributo) for atributo in SECOES}
+    pesquisador.periodo = PERIODOS['isolado']
+    for atributo, getter in SECOES.items():
+        porPeriodo = getattr(L.Pesquisador, atributo).porPeriodo
+        valor = getattr(pesquisador, atributo)
+        assert (valor is antes[atributo]) != porPeriodo
+        assert chamadas[getter] == (2 if porPeriodo else 1)
+        _igual(valor,
+               _esperado(L, arquivos[0], PERIODOS['isolado'], getter,
+                         planilhas))
+    assert len(pesquisador.bibliografica) != len(antes['bibliografica'])
+
+def test_fileDescartaTudo(L, arquivos, planilhas, chamadas):
+    pesquisador = L.Pesquisador(file=arquivos[0], periodo=PERIODOS['recente'],
+                                **planilhas)
+    anterior = pesquisador.pessoais
+    pesquisador.file = arquivos[1]
+    assert pesquisador.valido
+    assert pesquisador.pessoais['ID'].tolist() != anterior['ID'].tolist()
+    for atributo, getter in SECOES.items():
+        _igual(getattr(pesquisador, atributo),
+               _esperado(L, arquivos[1], PERIODOS['recente'], getter,
+                         planilhas))
+
+def test_xmlInvalido(L, tmp_path, chamadas):
+    file = str(tmp_path / 'invalido.xml')
+    with open(file, 'w') as arquivo:
+        arquivo.write('não é XML')
+    pesquisador = L.Pesquisador(file=file, periodo=PERIODOS['recente'])
+    assert not pesquisador.valido
+    for atributo in SECOES:
+        assert getattr(pesquisador, atributo) is None
+    assert not any(chamadas.values())
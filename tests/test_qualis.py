@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# IndiceQualis contra a busca linha a linha na planilha QUALIS, como em
+# setQualis.
+#----------------------------------------------------------------------------
+import os
+
+import pandas as pd
+import pytest
+
+#----Áreas com espaços e acentos, ISSN com e sem traço, par repetido e estrato
+#    vazio
+QUALIS = pd.DataFrame({'issn': ['0031-9007', '00319007', '0370-2693',
+                                '0370-2693', '1234-5678', '0022-4596',
+                                '0022-4596'],
+                       'titulo': ['PRL', 'PRL', 'PLB', 'PLB', 'Revista',
+                                  'JSSC', 'JSSC'],
+                       'area': [' ASTRONOMIA / FÍSICA ', 'ASTRONOMIA / FISICA',
+                                'ASTRONOMIA / FÍSICA', 'ENGENHARIAS IV',
+                                'MATEMÁTICA', 'ENGENHARIAS IV', 'MATEMÁTICA'],
+                       'ranking': ['A2', 'A1', 'B1', 'A2', ' ', 'B2', 'A1']})
+
+@pytest.fixture
+def planilha(tmp_path):
+    PATH = str(tmp_path / 'qualis.csv')
+    QUALIS.to_csv(PATH, encoding='ISO-8859-1')
+    return PATH
+
+def _bruto(areas, codigo):
+    """Melhor estrato pela busca na tabela inteira."""
+    norma = lambda area: (area.strip().upper().replace('Í', 'I')
+                          .replace('Á', 'A'))
+    issn = str(codigo).replace('-', '')
+    linhas = QUALIS[QUALIS['area'].map(norma).isin([norma(area)
+                                                    for area in areas])
+                    & (QUALIS['issn'].str.replace('-', '') == issn)
+                    & (QUALIS['ranking'].str.strip() != '')]
+    return linhas['ranking'].min() if len(linhas) else ''
+
+def test_constroi(L, planilha):
+    tabela = L.IndiceQualis.constroi(planilha)
+    assert not tabela.duplicated(['AREA', 'ISSN']).any()
+    assert set(tabela['AREA'].astype(str)) == {'ASTRONOMIA / FISICA',
+                                               'ENGENHARIAS IV', 'MATEMATICA'}
+    melhor = tabela.set_index(['AREA', 'ISSN'])['RANKING']
+    assert melhor[('ASTRONOMIA / FISICA', '00319007')] == 'A1'
+    assert ('MATEMATICA', '12345678') not in melhor.index
+
+@pytest.mark.parametrize('areas',
+                         [['ASTRONOMIA / FÍSICA'],
+                          ['ENGENHARIAS IV', 'MATEMÁTICA'],
+                          ['astronomia / física', 'ENGENHARIAS IV'],
+                          ['QUIMICA']])
+def test_rankingEAtribuiIguaisBuscaNaTabela(L, planilha, areas):
+    indice = L.IndiceQualis(L.IndiceQualis.constroi(planilha))
+    codigos = ['0031-9007', '03702693', '0022-4596', '1234-5678', 'INVALIDO',
+               None]
+    esperado = [_bruto(areas,
+                       codigo) if codigo not in ('INVALIDO', None) else ''
+                for codigo in codigos]
+    assert [indice.ranking(areas, codigo) for codigo in codigos] == esperado
+    df = pd.DataFrame({'ISSN-ISBN': codigos},
+                      index=range(10, 10 + len(codigos)))
+    pd.testing.assert_series_equal(indice.atribui(df, areas),
+                                   pd.Series(esperado, index=df.index,
+                                             name='QUALIS'))
+
+def test_atribuiPorPesquisador(L, planilha):
+    indice = L.IndiceQualis(L.IndiceQualis.constroi(planilha))
+    areas = {'A': ['ASTRONOMIA / FÍSICA'],
+             'B': ['ENGENHARIAS IV', 'MATEMÁTICA'], 'C': []}
+    dfAreas = pd.DataFrame([(chave, area) for chave, lista in areas.items()
+                            for area in lista], columns=['ID', 'AREA'])
+    df = pd.DataFrame({'ID': ['A', 'A', 'B', 'B', 'C'],
+                       'ISSN-ISBN': ['0370-2693', '0022-4596', '0370-2693',
+                                     '0022-4596', '0031-9007']})
+    esperado = [_bruto(areas[chave], codigo)
+                for chave, codigo in zip(df['ID'], df['ISSN-ISBN'])]
+    assert indice.atribui(df, dfAreas).tolist() == esperado
+    assert esperado == ['B1', '', 'A2', 'A1', '']
+
+def test_carregaUmaVezERefazQuandoPlanilhaMuda(L, planilha, tmp_path):
+    destino = str(tmp_path / 'qualis.parquet')
+    indice = L.IndiceQualis.carrega(planilha, destino)
+    assert L.IndiceQualis.carrega(planilha, destino) is indice
+    gravado = destino
+    if L.pyarrow is None:
+        gravado = os.path.splitext(destino)[0] + '.pkl'
+    assert os.path.isfile(gravado)
+    #----Planilha nova: o índice gravado é refeito
+    QUALIS.assign(ranking=['C'] * len(QUALIS)).to_csv(planilha,
+                                                      encoding='ISO-8859-1')
+    os.utime(planilha, (os.path.getmtime(gravado) + 10,) * 2)
+    novo = L.IndiceQualis.carrega(planilha, destino)
+    assert novo is not indice
+    assert set(novo.tabela['RANKING']) == {'C'}
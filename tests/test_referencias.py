@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Registro de planilhas de referência do processo e índice de CPF da planilha
+# de servidores.
+#----------------------------------------------------------------------------
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+#----CPF como número (sem zeros à esquerda), com pontuação, repetido e vazio
+SERVIDORES = pd.DataFrame({'CPF': [1234567890, '012.345.678-90', '98765432100',
+                                   np.nan, 98765432100, '111.222.333-44'],
+                           'Matrícula': [1, 2, 3, 4, 5, 6],
+                           'Lotação': ['UAF', 'UAME', 'UAEE', 'UAEQ', 'UAF',
+                                       'UAME'],
+                           'Nome': ['A', 'A', 'B', 'C', 'B', 'D']})
+
+@pytest.fixture
+def planilha(tmp_path):
+    PATH = str(tmp_path / 'servidores.xlsx')
+    SERVIDORES.to_excel(PATH, index=False)
+    return PATH
+
+def test_indiceCPFIgualBusca(L, planilha):
+    indice = L.indiceCPF(planilha, 'CPF')
+    tabela = L.carregaTabela(planilha)
+    normalizados = [L.normalizaCPF(valor) for valor in tabela['CPF']]
+    esperado = {}
+    for posicao, CPF in enumerate(normalizados):
+        if CPF:
+            esperado.setdefault(CPF, []).append(posicao)
+    assert indice == esperado
+    assert indice['01234567890'] == [0, 1]
+    assert indice['98765432100'] == [2, 4]
+    assert '' not in indice
+
+def test_registroCompartilhado(L, planilha, tmp_path):
+    assert L.carregaTabela(planilha) is L.carregaTabela(planilha)
+    assert L.indiceCPF(planilha) is L.indiceCPF(planilha)
+    #----Dois pesquisadores recebem a mesma tabela
+    kwargs = {'pathPontos': os.path.join(L.pathHandler('../data'),
+                                         'pontuacao.xlsx')}
+    um, outro = L.Pesquisador(**kwargs), L.Pesquisador(**kwargs)
+    um.carregaDadosGlobais()
+    outro.carregaDadosGlobais()
+    assert um.Pontos is outro.Pontos
+    #----Planilha alterada é relida
+    anterior = L.indiceCPF(planilha)
+    SERVIDORES.iloc[:2].to_excel(planilha, index=False)
+    os.utime(planilha, (os.path.getmtime(planilha) + 10,) * 2)
+    assert L.indiceCPF(planilha) is not anterior
+    assert L.indiceCPF(planilha) == {'01234567890': [0, 1]}
+    L.limpaReferencias()
+    assert L._REFERENCIAS == {}
+
+@pytest.mark.parametrize('CPF',
+                         ['01234567890', '012.345.678-90', '98765432100',
+                          '00000000000', None])
+def test_getDadosUFCG(L, planilha, CPF):
+    pesquisador = L.Pesquisador(pathUFCG=planilha)
+    obtido = pesquisador.getDadosUFCG(CPF)
+    tabela = L.carregaTabela(planilha)
+    linhas = [L.normalizaCPF(valor) == L.normalizaCPF(CPF)
+              and L.normalizaCPF(CPF) != '' for valor in tabela['CPF']]
+    esperado = tabela[linhas][['Matrícula', 'Lotação']]
+    esperado.insert(0, 'CPF', CPF)
+    pd.testing.assert_frame_equal(obtido, esperado)
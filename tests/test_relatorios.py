@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Relatórios a partir de scoreCorpus contra doSumarioUFCG currículo a
+# currículo.
+#----------------------------------------------------------------------------
+import os
+
+import pytest
+
+from conftest import PERIODOS, comparaComSumario
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sumariosPontuadosIguaisDoSumario(L, arquivos, planilhas, workers):
+    comparaComSumario(L, arquivos, PERIODOS['recente'], workers, planilhas)
+
+def test_geraRelatorios(L, arquivos, planilhas, tmp_path):
+    if L.jinja2 is None:
+        pytest.skip('relatórios em HTML precisam do jinja2')
+    #----O template vem da pasta templates do pacote, declarada em package_data
+    ambiente = L.ambienteRelatorios()
+    assert ambiente.get_template(L.TEMPLATE_RELATORIO) is not None
+    PATH = str(tmp_path / 'relatorios')
+    dfRelatorios, falhas = L.geraRelatorios(arquivos[:3], PERIODOS['recente'],
+                                            PATH, workers=1, **planilhas)
+    assert not falhas
+    assert sorted(dfRelatorios['FILE']) == sorted(arquivos[:3])
+    for path in dfRelatorios['RELATORIO']:
+        assert os.path.dirname(path) == PATH
+        with open(path, encoding='utf-8') as arquivo:
+            html = arquivo.read()
+        assert html.startswith('<!DOCTYPE html>')
+        assert 'Pesquisador Sintético' in html
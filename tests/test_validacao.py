@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Validação de ISSN e ISBN: validaCodigo em cache, por valores distintos e no
+# getter.
+#----------------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+
+from conftest import PERIODOS
+
+CODIGOS = ['03702693', '00224596', '9788576051565', '12345678', '', None,
+           np.nan, 3702693]
+
+def test_validaCodigo(L):
+    assert L.validaCodigo('03702693') == '0370-2693'
+    assert L.validaCodigo('9788576051565') == '9788-576051565'
+    for codigo in ('12345678', '', None, np.nan, 3702693):
+        assert L.validaCodigo(codigo) == 'INVALIDO'
+    assert L.Pesquisador.validaISSN_ISBN(*CODIGOS[:4]) == [
+        '0370-2693', '0022-4596', '9788-576051565', 'INVALIDO']
+
+def test_validaCodigoEmCache(L):
+    L.validaCodigo.cache_clear()
+    for _ in range(5):
+        L.validaCodigo('03702693')
+    informacao = L.validaCodigo.cache_info()
+    assert (informacao.misses, informacao.hits) == (1, 4)
+    assert informacao.maxsize == L.MAX_CODIGOS
+
+def test_validaSerieIgualElementoAElemento(L):
+    serie = pd.Series(CODIGOS * 3, index=range(100, 100 + 3 * len(CODIGOS)),
+                      name='ISSN-ISBN', dtype=object)
+    L.validaCodigo.cache_clear()
+    obtido = L.validaSerieISSN_ISBN(serie)
+    #----Cada valor distinto validado uma vez; NaN e None não passam por
+    #    validaCodigo
+    assert L.validaCodigo.cache_info().misses == len(CODIGOS) - 2
+    pd.testing.assert_series_equal(obtido,
+                                   pd.Series([L.validaCodigo(codigo)
+                                              for codigo in serie],
+                                             index=serie.index,
+                                             name=serie.name, dtype=object))
+
+def test_getterValidaISSN(L, arquivos):
+    def producao(**kwargs):
+        pesquisador = L.Pesquisador(file=arquivos[0],
+                                    periodo=PERIODOS['todos'], **kwargs)
+        assert pesquisador.getDadosBasicos()
+        return pesquisador.getProducaoBibliografica()
+    bruto, validado = producao(), producao(validaISSN=True)
+    assert len(bruto) == len(validado)
+    esperado = [L.validaCodigo(codigo) for codigo in bruto['ISSN-ISBN']]
+    assert validado['ISSN-ISBN'].tolist() == esperado
+    assert 'INVALIDO' in esperado and any(codigo != 'INVALIDO'
+                                          for codigo in esperado)